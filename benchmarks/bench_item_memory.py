@@ -0,0 +1,107 @@
+"""
+Memory benchmark: bytes per tagged Item.
+
+Creates N tagged units (1,000,000 by default) of a small catalog and
+reports the memory they take, next to the old dict-based Item layout.
+Tag id strings and the list holding the units are allocated before
+measuring, so only the per-unit objects are counted.
+
+A second pass moves every unit into a basket once (the location update
+Person.add_item makes, which logs a scan record) and reports the memory
+per unit after that, since that is what units cost once picked up.
+
+Usage:
+    python benchmarks/bench_item_memory.py [--units N]
+"""
+import argparse
+import gc
+import os
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+
+# Add the parent directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models import Item, ItemType
+
+
+class LegacyItem:
+    """The pre-flyweight Item layout: a full __dict__ per unit."""
+
+    def __init__(self, name, tag_id, price=0.0, category="General", is_deactivated=False):
+        self.name = name
+        self.tag_id = tag_id
+        self.is_deactivated = is_deactivated
+        self.price = price
+        self.category = category
+        self.timestamp = datetime.now()
+        self.scan_history = []
+        self.location = "shelf"
+
+    def update_location(self, new_location):
+        self.location = new_location
+        self.scan_history.append({
+            'timestamp': datetime.now(),
+            'type': 'location_update',
+            'location': new_location
+        })
+
+
+CATALOG = [
+    ("Milk", 3.99, "Dairy"),
+    ("Bread", 2.49, "Bakery"),
+    ("Cheese", 4.99, "Dairy"),
+    ("Coffee", 7.99, "Beverages"),
+    ("Chocolate", 1.99, "Snacks")
+]
+
+
+def measure(factory, units, tag_ids, location=None):
+    """
+    Return (bytes per unit, seconds) for creating ``units`` items.
+
+    With a ``location``, every unit is also moved there once, as adding
+    it to a basket does.
+    """
+    items = [None] * units
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    for i in range(units):
+        item = items[i] = factory(i, tag_ids[i])
+        if location is not None:
+            item.update_location(location)
+    elapsed = time.perf_counter() - start
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return current / units, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure memory per tagged Item")
+    parser.add_argument("--units", type=int, default=1000000)
+    args = parser.parse_args()
+
+    tag_ids = [f"RFID{i:08d}" for i in range(args.units)]
+    skus = [ItemType.get(*product) for product in CATALOG]
+
+    def legacy(i, tag_id):
+        name, price, category = CATALOG[i % len(CATALOG)]
+        return LegacyItem(name, tag_id, price=price, category=category)
+
+    def flyweight(i, tag_id):
+        return Item.from_sku(skus[i % len(skus)], tag_id)
+
+    print(f"Tagged units: {args.units:,}")
+    for location, heading in ((None, "Fresh units"), ("with_Customer", "After one add_item")):
+        print(f"{heading}:")
+        for label, factory in (("legacy dict Item", legacy), ("slotted flyweight Item", flyweight)):
+            per_unit, elapsed = measure(factory, args.units, tag_ids, location)
+            print(f"{label:>24}: {per_unit:7.1f} bytes/item, "
+                  f"{per_unit * args.units / 2 ** 20:8.1f} MiB total, {elapsed:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
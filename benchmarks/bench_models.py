@@ -0,0 +1,373 @@
+"""
+Microbenchmarks for the hot paths of models.py and the logger.
+
+Times Person.add_item, Cashier.scan_and_deactivate, Gate.scan and
+SystemLogger.log_gate_scan for baskets of 1 to 10,000 items. Cashier and
+gate cases also vary how much history the model already holds. Each case
+reports operations and items per second, plus the memory one operation
+allocates. That is the transient peak and the net growth, measured with
+tracemalloc in a separate pass.
+
+The simulation cases run StoreSimulation end to end, with and without the
+gate's traffic and sketch analytics, and report customers per minute. An
+operation there is one customer, so --compare flags them like any other
+case.
+
+Results are written as JSON. Pass an earlier results file with --compare
+to flag cases whose throughput dropped by more than --threshold. The
+script exits with status 1 when any case regressed.
+
+Usage:
+    python benchmarks/bench_models.py [--quick] [--output FILE] [--compare FILE]
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+# Add the parent directory to the Python path
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+
+from models import Person, Cashier, Gate, TagRegistry
+from logger import SystemLogger
+from simulation import StoreSimulation, default_catalog
+
+BASKET_SIZES = [1, 10, 100, 1000, 10000]
+HISTORY_LENGTHS = [0, 100000]
+QUICK_BASKET_SIZES = [1, 100, 10000]
+QUICK_HISTORY_LENGTHS = [0, 10000]
+
+# Items timed per round; fewer repeats for bigger baskets
+ITEMS_PER_CASE = 50000
+MIN_REPEATS = 5
+MAX_REPEATS = 2000
+# Each case is timed this many times on fresh fixtures; the best round counts
+ROUNDS = 3
+# Customers per end-to-end simulation round
+SIMULATION_CUSTOMERS = 50000
+QUICK_SIMULATION_CUSTOMERS = 10000
+
+
+class Fixture:
+    """Models shared by one benchmark case."""
+
+    def __init__(self, history=0):
+        self.catalog = default_catalog()
+        self.registry = TagRegistry()
+        self.cashier = Cashier("Bench", registry=self.registry)
+        self.gate = Gate(registry=self.registry)
+        start = datetime(2024, 1, 1, 8, 0)
+        for i in range(history):
+            self.cashier.transaction_history.append({
+                'timestamp': start, 'customer': f"Customer {i}", 'items': 1,
+                'total': 1.0, 'duration': 0.0
+            })
+            self.gate.scan_history.append(start, f"Customer {i}", 1, False, [], 0.0, 1.0)
+
+    def units(self, count):
+        """Tag ``count`` new units of the catalog."""
+        catalog = self.catalog
+        return [self.registry.create_unit(catalog[i % len(catalog)]) for i in range(count)]
+
+    def customer(self, basket, name="Customer"):
+        """Create a customer carrying ``basket`` new units."""
+        person = Person(name, retention={'max_items': basket + 1})
+        for item in self.units(basket):
+            person.add_item(item)
+        return person
+
+
+def bench_add_item(fixture, basket, repeats):
+    """Fill empty baskets item by item."""
+    batches = [(Person(f"Customer {i}", retention={'max_items': basket + 1}), fixture.units(basket))
+               for i in range(repeats)]
+
+    def run(index):
+        person, items = batches[index]
+        add_item = person.add_item
+        for item in items:
+            add_item(item)
+    return run
+
+
+def bench_scan_and_deactivate(fixture, basket, repeats):
+    """Check out full baskets at the cashier."""
+    people = [fixture.customer(basket, f"Customer {i}") for i in range(repeats)]
+    scan = fixture.cashier.scan_and_deactivate
+    return lambda index: scan(people[index])
+
+
+def bench_gate_scan_paid(fixture, basket, repeats):
+    """Scan customers whose items were all paid for."""
+    people = [fixture.customer(basket, f"Customer {i}") for i in range(repeats)]
+    for person in people:
+        for item in person.items:
+            item.deactivate()
+    scan = fixture.gate.scan
+    return lambda index: scan(people[index])
+
+
+def bench_gate_scan_virtual_time(fixture, basket, repeats):
+    """Scan paid customers a few virtual seconds apart, as simulations do.
+
+    Every scan lands in a new second of the gate's traffic series, so this
+    times the bucket advance that scans at wall-clock speed mostly skip.
+    """
+    people = [fixture.customer(basket, f"Customer {i}") for i in range(repeats)]
+    for person in people:
+        for item in person.items:
+            item.deactivate()
+    start = datetime(2024, 1, 2, 8, 0)
+    times = [start + timedelta(seconds=3 * i) for i in range(repeats)]
+    scan = fixture.gate.scan
+    return lambda index: scan(people[index], times[index])
+
+
+def bench_gate_scan_alert(fixture, basket, repeats):
+    """Scan customers carrying unpaid items."""
+    people = [fixture.customer(basket, f"Customer {i}") for i in range(repeats)]
+    scan = fixture.gate.scan
+    return lambda index: scan(people[index])
+
+
+def bench_log_gate_scan(fixture, basket, repeats):
+    """Log gate scans with synchronous writes."""
+    # The log directory lives as long as the fixture the closure holds on to
+    fixture.directory = tempfile.TemporaryDirectory(prefix="bench_logger_")
+    fixture.logger = SystemLogger(
+        log_file=os.path.join(fixture.directory.name, "alerts.csv"),
+        json_log_file=os.path.join(fixture.directory.name, "alerts.jsonl"))
+    person = fixture.customer(basket)
+    return lambda index: fixture.logger.log_gate_scan(person, index % 2 == 0)
+
+
+# name -> (setup, whether the case varies the history length)
+BENCHMARKS = {
+    'add_item': (bench_add_item, False),
+    'scan_and_deactivate': (bench_scan_and_deactivate, True),
+    'gate_scan_paid': (bench_gate_scan_paid, True),
+    'gate_scan_virtual_time': (bench_gate_scan_virtual_time, True),
+    'gate_scan_alert': (bench_gate_scan_alert, True),
+    'log_gate_scan': (bench_log_gate_scan, False)
+}
+
+
+# End-to-end simulation cases: name -> StoreSimulation options
+SIMULATIONS = {
+    'simulation': {},
+    'simulation_lean': {'gate_analytics': False}
+}
+
+
+def measure_allocations(setup, basket, history):
+    """Get (peak bytes, net bytes) allocated by one operation."""
+    run = setup(Fixture(history), basket, 2)
+    run(0)
+    gc.collect()
+    tracemalloc.start()
+    baseline, _ = tracemalloc.get_traced_memory()
+    tracemalloc.reset_peak()
+    run(1)
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak - baseline, current - baseline
+
+
+def time_round(setup, basket, history, repeats):
+    """Time ``repeats`` operations on a fresh fixture."""
+    run = setup(Fixture(history), basket, repeats)
+    gc.collect()
+    gc.disable()
+    try:
+        start = time.perf_counter()
+        for index in range(repeats):
+            run(index)
+        return time.perf_counter() - start
+    finally:
+        gc.enable()
+
+
+def run_case(name, basket, history, rounds=ROUNDS):
+    """Time one benchmark case and measure its allocations."""
+    setup, _ = BENCHMARKS[name]
+    repeats = max(MIN_REPEATS, min(MAX_REPEATS, ITEMS_PER_CASE // basket))
+    elapsed = min(time_round(setup, basket, history, repeats) for _ in range(rounds))
+
+    peak, net = measure_allocations(setup, basket, history)
+    return {
+        'benchmark': name,
+        'basket': basket,
+        'history': history,
+        'repeats': repeats,
+        'rounds': rounds,
+        'mean_us': elapsed / repeats * 1e6,
+        'ops_per_sec': repeats / elapsed,
+        'items_per_sec': repeats * basket / elapsed,
+        'alloc_peak_bytes': peak,
+        'alloc_net_bytes': net
+    }
+
+
+def time_simulation(options, customers):
+    """Time one seeded simulation of ``customers`` customers; returns (seconds, items)."""
+    simulation = StoreSimulation(seed=1, **options)
+    gc.collect()
+    start = time.perf_counter()
+    stats = simulation.run(num_customers=customers)
+    return time.perf_counter() - start, stats['items']
+
+
+def run_simulation(name, customers=SIMULATION_CUSTOMERS, rounds=ROUNDS):
+    """Time an end-to-end simulation case and measure its allocations per customer."""
+    options = SIMULATIONS[name]
+    elapsed, items = min(time_simulation(options, customers) for _ in range(rounds))
+
+    simulation = StoreSimulation(seed=1, **options)
+    tracemalloc.start()
+    simulation.run(num_customers=min(customers, 1000))
+    net, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    measured = simulation.stats['customers']
+    return {
+        'benchmark': name,
+        'basket': None,
+        'history': None,
+        'repeats': customers,
+        'rounds': rounds,
+        'mean_us': elapsed / customers * 1e6,
+        'ops_per_sec': customers / elapsed,
+        'items_per_sec': items / elapsed,
+        'customers_per_min': customers / elapsed * 60,
+        'alloc_peak_bytes': peak / measured,
+        'alloc_net_bytes': net / measured
+    }
+
+
+def run_suite(basket_sizes=BASKET_SIZES, history_lengths=HISTORY_LENGTHS, names=None,
+              rounds=ROUNDS, report=print, customers=SIMULATION_CUSTOMERS):
+    """Run every benchmark case and return the results."""
+    results = []
+    for name in names or list(BENCHMARKS) + list(SIMULATIONS):
+        if name in SIMULATIONS:
+            result = run_simulation(name, customers, rounds)
+            results.append(result)
+            if report:
+                report(format_result(result))
+            continue
+        histories = history_lengths if BENCHMARKS[name][1] else [0]
+        for history in histories:
+            for basket in basket_sizes:
+                result = run_case(name, basket, history, rounds)
+                results.append(result)
+                if report:
+                    report(format_result(result))
+    return results
+
+
+def format_result(result):
+    """Format one result as a table row."""
+    if result['benchmark'] in SIMULATIONS:
+        return (f"{result['benchmark']:<20} {result['customers_per_min']:>12,.0f} customers/min "
+                f"{result['items_per_sec']:>14,.0f} items/s "
+                f"{result['alloc_peak_bytes'] / 1024:>10.1f} KiB peak/customer "
+                f"{result['alloc_net_bytes'] / 1024:>10.1f} KiB net/customer")
+    return (f"{result['benchmark']:<20} basket={result['basket']:<6} "
+            f"history={result['history']:<7} {result['ops_per_sec']:>12,.0f} ops/s "
+            f"{result['items_per_sec']:>14,.0f} items/s "
+            f"{result['alloc_peak_bytes'] / 1024:>10.1f} KiB peak "
+            f"{result['alloc_net_bytes'] / 1024:>10.1f} KiB net")
+
+
+def result_key(result):
+    return (result['benchmark'], result['basket'], result['history'])
+
+
+def compare(results, baseline, threshold=0.2):
+    """
+    Compare results against a baseline run.
+
+    Returns:
+        list: (result, baseline ops/sec, ratio) for cases whose throughput
+        fell by more than ``threshold``
+    """
+    previous = {result_key(result): result for result in baseline['results']}
+    regressions = []
+    for result in results:
+        old = previous.get(result_key(result))
+        if old is None:
+            continue
+        ratio = result['ops_per_sec'] / old['ops_per_sec']
+        if ratio < 1 - threshold:
+            regressions.append((result, old['ops_per_sec'], ratio))
+    return regressions
+
+
+def metadata():
+    """Describe the environment the results were measured in."""
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                                capture_output=True, text=True).stdout.strip() or None
+    except OSError:
+        commit = None
+    return {
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'commit': commit,
+        'python': platform.python_version(),
+        'platform': platform.platform()
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the models' hot paths")
+    parser.add_argument("--quick", action="store_true", help="fewer basket sizes and histories")
+    parser.add_argument("--benchmark", action="append",
+                        choices=sorted(list(BENCHMARKS) + list(SIMULATIONS)),
+                        help="run only this benchmark (repeatable)")
+    parser.add_argument("--rounds", type=int, default=ROUNDS,
+                        help="timed rounds per case; the best one counts")
+    parser.add_argument("--output", default=None,
+                        help="JSON results file (default: bench_models_<commit>.json)")
+    parser.add_argument("--compare", default=None, help="earlier JSON results to compare against")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="throughput drop that counts as a regression")
+    args = parser.parse_args(argv)
+
+    meta = metadata()
+    if args.quick:
+        results = run_suite(QUICK_BASKET_SIZES, QUICK_HISTORY_LENGTHS, args.benchmark, args.rounds,
+                            customers=QUICK_SIMULATION_CUSTOMERS)
+    else:
+        results = run_suite(names=args.benchmark, rounds=args.rounds)
+
+    output = args.output or f"bench_models_{meta['commit'] or 'local'}.json"
+    with open(output, 'w') as file:
+        json.dump({'meta': meta, 'results': results}, file, indent=2)
+    print(f"Results written to {output}")
+
+    if args.compare:
+        with open(args.compare) as file:
+            baseline = json.load(file)
+        regressions = compare(results, baseline, args.threshold)
+        for result, old_ops, ratio in regressions:
+            case = result['benchmark']
+            if result['basket'] is not None:
+                case += f" basket={result['basket']} history={result['history']}"
+            print(f"REGRESSION {case}: {old_ops:,.0f} -> "
+                  f"{result['ops_per_sec']:,.0f} ops/s ({ratio:.0%})")
+        if regressions:
+            return 1
+        print(f"No regressions against {args.compare} "
+              f"(commit {baseline['meta'].get('commit')})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
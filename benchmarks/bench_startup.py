@@ -0,0 +1,123 @@
+"""
+Startup benchmark: import cost and wall-clock time to the first frame.
+
+Imports gui.py in a fresh interpreter with ``-X importtime`` and reports
+the slowest modules by cumulative import time. It then launches the
+application in a subprocess and measures the time from spawning the
+process until the main window has drawn its first frame. That step is
+skipped when no display is available.
+
+Exits with status 1 when either figure is over its budget.
+
+Usage:
+    python benchmarks/bench_startup.py [--top N] [--import-budget MS] [--frame-budget MS]
+"""
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Budgets in milliseconds. Importing numpy accounts for roughly 100 ms of the
+# import budget; matplotlib must not be imported at startup at all.
+IMPORT_BUDGET_MS = 400
+FRAME_BUDGET_MS = 1500
+
+FIRST_FRAME_SCRIPT = """
+import tkinter as tk
+try:
+    root = tk.Tk()
+except tk.TclError:
+    print("no-display", flush=True)
+    raise SystemExit(0)
+from gui import AntiTheftGUI
+app = AntiTheftGUI(root)
+root.update()
+print("first-frame", flush=True)
+app.on_close()
+"""
+
+
+def measure_imports(module="gui"):
+    """
+    Import ``module`` in a fresh interpreter with ``-X importtime``.
+
+    Returns:
+        dict: 'total_ms' for the module and 'modules', a list of
+        (cumulative ms, self ms, module name) tuples, slowest first
+    """
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                            cwd=ROOT, capture_output=True, text=True, check=True)
+    modules = []
+    total_ms = 0.0
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        own, cumulative, name = line[len("import time:"):].split("|")
+        entry = (int(cumulative) / 1000, int(own) / 1000, name.strip())
+        modules.append(entry)
+        if entry[2] == module:
+            total_ms = entry[0]
+    modules.sort(reverse=True)
+    return {'total_ms': total_ms, 'modules': modules}
+
+
+def measure_first_frame(timeout=30):
+    """
+    Launch the application and time it until the first frame is drawn.
+
+    Returns:
+        float: Milliseconds from spawning the process to the first frame,
+        or None if no display is available
+    """
+    start = time.perf_counter()
+    process = subprocess.Popen([sys.executable, "-c", FIRST_FRAME_SCRIPT], cwd=ROOT,
+                               stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+    line = process.stdout.readline().strip()
+    elapsed = (time.perf_counter() - start) * 1000
+    process.communicate(timeout=timeout)
+    if line == "first-frame":
+        return elapsed
+    if line == "no-display":
+        return None
+    raise RuntimeError(f"Application failed to start: {line}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure application startup time")
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--import-budget", type=float, default=IMPORT_BUDGET_MS)
+    parser.add_argument("--frame-budget", type=float, default=FRAME_BUDGET_MS)
+    args = parser.parse_args()
+
+    imports = measure_imports("gui")
+    print("Slowest imports (cumulative ms / self ms):")
+    for cumulative, own, name in imports['modules'][:args.top]:
+        print(f"  {cumulative:8.1f} {own:8.1f}  {name}")
+    heavy = [name for _, _, name in imports['modules'] if name.split(".")[0] == "matplotlib"]
+    print(f"matplotlib modules imported at startup: {len(heavy)}")
+
+    failures = []
+    print(f"import gui: {imports['total_ms']:.1f} ms (budget {args.import_budget:.0f} ms)")
+    if imports['total_ms'] > args.import_budget:
+        failures.append("import time")
+    if heavy:
+        failures.append("matplotlib imported at startup")
+
+    first_frame = measure_first_frame()
+    if first_frame is None:
+        print("first frame: skipped (no display)")
+    else:
+        print(f"first frame: {first_frame:.1f} ms (budget {args.frame_budget:.0f} ms)")
+        if first_frame > args.frame_budget:
+            failures.append("time to first frame")
+
+    if failures:
+        print(f"Startup budget exceeded: {', '.join(failures)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,296 @@
+import asyncio
+import random
+from datetime import datetime
+from instrumentation import now_ns
+from models import Person, Cashier, Gate, TagRegistry
+from simulation import default_catalog
+
+
+def shortest_queue(lanes, person):
+    """Lane policy: join the lane with the fewest customers waiting or being served."""
+    return min(range(len(lanes)), key=lambda i: lanes[i].load)
+
+
+def fewest_items(lanes, person):
+    """Lane policy: join the lane with the fewest items left to scan."""
+    return min(range(len(lanes)), key=lambda i: lanes[i].pending_items)
+
+
+class RoundRobin:
+    """Lane policy: send customers to the lanes in turn."""
+
+    def __init__(self):
+        self.next_lane = 0
+
+    def __call__(self, lanes, person):
+        lane = self.next_lane % len(lanes)
+        self.next_lane = lane + 1
+        return lane
+
+
+class CheckoutLane:
+    """
+    One cashier lane of the checkout pipeline.
+
+    Attributes:
+        cashier (Cashier): The cashier serving the lane
+        queue (asyncio.Queue): Customers waiting, with their queueing time
+        busy_time (float): Seconds spent serving customers
+        served (int): Customers served
+        pending_items (int): Items queued or being scanned at the lane
+        serving (bool): Whether a customer is being served
+    """
+
+    def __init__(self, cashier):
+        self.cashier = cashier
+        self.queue = asyncio.Queue()
+        self.busy_time = 0.0
+        self.served = 0
+        self.pending_items = 0
+        self.serving = False
+
+    @property
+    def load(self):
+        """Customers waiting or being served."""
+        return self.queue.qsize() + self.serving
+
+
+class CheckoutPipeline:
+    """
+    Checkout area served by several cashier lanes on one asyncio event loop.
+
+    Every customer is its own task: it arrives, is assigned a lane by the
+    lane policy, waits in that lane's queue, is scanned item by item and
+    then walks through the gate. Each lane runs a worker coroutine that
+    awaits the per-item delay between scans, so thousands of customers can
+    be in the store at once without blocking the loop. Customers who skip
+    the cashier go straight to the gate.
+
+    A lane policy is any callable ``policy(lanes, person)`` returning the
+    index of the lane to join; see shortest_queue, fewest_items and
+    RoundRobin.
+
+    Attributes:
+        lanes (list): The CheckoutLane of each cashier
+        gate (Gate): The exit gate
+        registry (TagRegistry): Index of the tags of units in the store
+        policy (function): Lane assignment policy
+        item_delay (float): Seconds awaited per scanned item
+        checkout_overhead (float): Seconds awaited per transaction
+        listener (function): Optional callback(event, person, detail)
+    """
+
+    def __init__(self, cashiers=None, gate=None, registry=None, num_lanes=4, policy=None,
+                 item_delay=0.0, checkout_overhead=0.0, listener=None):
+        self.registry = registry if registry is not None else TagRegistry()
+        cashiers = cashiers or [Cashier(f"Lane {i + 1}", registry=self.registry)
+                                for i in range(num_lanes)]
+        self.lanes = [CheckoutLane(cashier) for cashier in cashiers]
+        self.gate = gate or Gate(registry=self.registry)
+        self.policy = policy or shortest_queue
+        self.item_delay = item_delay
+        self.checkout_overhead = checkout_overhead
+        self.listener = listener
+        self.stats = {
+            'customers': 0,
+            'checkouts': 0,
+            'skipped_checkout': 0,
+            'alerts': 0,
+            'total_queue_wait': 0.0,
+            'max_queue_wait': 0.0,
+            'max_queue_length': 0
+        }
+        self.started = None
+        self.finished = None
+
+    def notify(self, event, person, detail=None):
+        """Forward an event to the listener, if any."""
+        if self.listener:
+            self.listener(event, person, detail)
+
+    async def serve_lane(self, lane):
+        """Worker coroutine: serve a lane's queue until cancelled."""
+        loop = asyncio.get_running_loop()
+        cashier = lane.cashier
+        while True:
+            queued_at, person, done = await lane.queue.get()
+            lane.serving = True
+            started = loop.time()
+            wait = started - queued_at
+            self.stats['total_queue_wait'] += wait
+            self.stats['max_queue_wait'] = max(self.stats['max_queue_wait'], wait)
+
+            transaction_start = datetime.now()
+            transaction_clock = now_ns()
+            items = tuple(person.items)
+            scan_times = []
+            for item in items:
+                await asyncio.sleep(self.item_delay)
+                scan_times.append(cashier.scan_item(item))
+                lane.pending_items -= 1
+            await asyncio.sleep(self.checkout_overhead)
+            result = cashier.complete_transaction(person, items, scan_times, transaction_start,
+                                                  (now_ns() - transaction_clock) / 1e9)
+
+            lane.busy_time += loop.time() - started
+            lane.served += 1
+            lane.serving = False
+            self.stats['checkouts'] += 1
+            self.notify('checkout', person, result)
+            lane.queue.task_done()
+            done.set_result(result)
+
+    async def customer(self, person, arrival_delay=0.0, skip_checkout=False):
+        """
+        Walk one customer through checkout and the gate.
+
+        Args:
+            person (Person): The customer, with a filled basket
+            arrival_delay (float): Seconds until the customer arrives
+            skip_checkout (bool): Walk straight to the gate without paying
+
+        Returns:
+            GateScanResult: The customer's gate scan
+        """
+        if arrival_delay:
+            await asyncio.sleep(arrival_delay)
+        self.stats['customers'] += 1
+        self.notify('arrival', person)
+
+        if skip_checkout:
+            self.stats['skipped_checkout'] += 1
+            self.notify('skip', person)
+        else:
+            lane = self.lanes[self.policy(self.lanes, person)]
+            done = asyncio.get_running_loop().create_future()
+            lane.pending_items += len(person.items)
+            lane.queue.put_nowait((asyncio.get_running_loop().time(), person, done))
+            self.stats['max_queue_length'] = max(self.stats['max_queue_length'],
+                                                 lane.queue.qsize())
+            await done
+
+        result = self.gate.scan(person)
+        if result.alert_triggered:
+            self.stats['alerts'] += 1
+            self.registry.retire_items(person.items)
+        self.notify('exit', person, result)
+        return result
+
+    async def run(self, customers):
+        """
+        Run customers through the pipeline until all of them have left.
+
+        Args:
+            customers (iterable): (person, arrival_delay, skip_checkout) tuples
+
+        Returns:
+            dict: Queue, lane and throughput statistics
+            
+        Raises:
+            Exception: Whatever a lane worker or customer raised; the rest of
+            the run is cancelled rather than left waiting on a dead lane
+        """
+        loop = asyncio.get_running_loop()
+        self.started = loop.time()
+        workers = [asyncio.create_task(self.serve_lane(lane)) for lane in self.lanes]
+        arrivals = asyncio.ensure_future(asyncio.gather(
+            *(self.customer(person, delay, skip) for person, delay, skip in customers)))
+        try:
+            # Lane workers only ever finish by raising; stop the run if one does
+            await asyncio.wait([arrivals, *workers], return_when=asyncio.FIRST_COMPLETED)
+            for worker in workers:
+                if worker.done():
+                    arrivals.cancel()
+                    worker.result()
+            arrivals.result()
+        finally:
+            for task in (arrivals, *workers):
+                task.cancel()
+            await asyncio.gather(arrivals, *workers, return_exceptions=True)
+        self.finished = loop.time()
+        return self.get_stats()
+
+    def get_stats(self):
+        """Get queue wait, lane utilization and throughput of the last run."""
+        stats = self.stats
+        elapsed = (self.finished - self.started) if self.finished is not None else 0.0
+        return {
+            'customers': stats['customers'],
+            'checkouts': stats['checkouts'],
+            'skipped_checkout': stats['skipped_checkout'],
+            'alerts': stats['alerts'],
+            'avg_queue_wait': (stats['total_queue_wait'] / stats['checkouts'])
+                              if stats['checkouts'] > 0 else 0,
+            'max_queue_wait': stats['max_queue_wait'],
+            'max_queue_length': stats['max_queue_length'],
+            'lane_utilization': [lane.busy_time / elapsed if elapsed > 0 else 0
+                                 for lane in self.lanes],
+            'lane_customers': [lane.served for lane in self.lanes],
+            'elapsed': elapsed,
+            'throughput': (stats['customers'] / elapsed) if elapsed > 0 else 0
+        }
+
+
+def make_customers(count, registry, catalog=None, min_items=1, max_items=5, arrival_rate=None,
+                   theft_probability=0.0, seed=None):
+    """
+    Create customers with filled baskets for a pipeline run.
+
+    Args:
+        count (int): Number of customers
+        registry (TagRegistry): Registry that tags the units
+        catalog (list): Items customers pick from
+        min_items (int): Minimum items per basket
+        max_items (int): Maximum items per basket
+        arrival_rate (float): Mean arrivals per second (None for all at once)
+        theft_probability (float): Chance that a customer skips the cashier
+        seed (int): Random seed
+
+    Returns:
+        list: (person, arrival_delay, skip_checkout) tuples
+    """
+    rng = random.Random(seed)
+    catalog = catalog or default_catalog()
+    customers = []
+    arrival = 0.0
+    for number in range(1, count + 1):
+        person = Person(f"Customer {number}")
+        for _ in range(rng.randint(min_items, max_items)):
+            person.add_item(registry.create_unit(rng.choice(catalog)))
+        if arrival_rate:
+            arrival += rng.expovariate(arrival_rate)
+        customers.append((person, arrival, rng.random() < theft_probability))
+    return customers
+
+
+def run_pipeline(num_customers=1000, num_lanes=4, policy=None, item_delay=0.0,
+                 checkout_overhead=0.0, arrival_rate=None, theft_probability=0.0, seed=None):
+    """Build a pipeline, run ``num_customers`` customers through it and return its stats."""
+    pipeline = CheckoutPipeline(num_lanes=num_lanes, policy=policy, item_delay=item_delay,
+                                checkout_overhead=checkout_overhead)
+    customers = make_customers(num_customers, pipeline.registry, arrival_rate=arrival_rate,
+                               theft_probability=theft_probability, seed=seed)
+    return asyncio.run(pipeline.run(customers))
+
+
+if __name__ == "__main__":
+    import argparse
+
+    policies = {'shortest': shortest_queue, 'items': fewest_items, 'round-robin': RoundRobin}
+    parser = argparse.ArgumentParser(description="Run customers through an asyncio checkout pipeline")
+    parser.add_argument("--customers", type=int, default=5000)
+    parser.add_argument("--lanes", type=int, default=4)
+    parser.add_argument("--policy", choices=sorted(policies), default="shortest")
+    parser.add_argument("--item-delay", type=float, default=0.0005)
+    parser.add_argument("--arrival-rate", type=float, default=None)
+    parser.add_argument("--theft-probability", type=float, default=0.1)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    policy = policies[args.policy]
+    stats = run_pipeline(args.customers, args.lanes,
+                         policy=policy() if policy is RoundRobin else policy,
+                         item_delay=args.item_delay, arrival_rate=args.arrival_rate,
+                         theft_probability=args.theft_probability, seed=args.seed)
+    for key, value in stats.items():
+        print(f"{key}: {value}")
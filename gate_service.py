@@ -0,0 +1,147 @@
+import numpy as np
+from instrumentation import merge_histograms
+from sketches import SpaceSaving, WindowedHyperLogLog
+from models import Gate
+from scan_store import merge_summaries
+
+
+class MultiLaneGate:
+    """
+    Security gate service with several exit lanes read in parallel.
+
+    Each lane is its own Gate and owns its shard of the statistics
+    (counters, scan store, hourly histogram and tag counts), so lanes
+    never wait on each other's statistics. They are not lock-free: every
+    lane updates the shared tag registry under its lock, and takes its own
+    Gate's lock around its traffic series. A lane must only be scanned
+    from one thread at a time. Shards are merged when get_stats() is
+    called; once the lanes are idle the merged totals are exact.
+
+    Attributes:
+        lanes (list): One Gate per exit lane
+        registry (TagRegistry): Tag index shared by all lanes, if any
+    """
+
+    def __init__(self, num_lanes=2, registry=None, retention=None):
+        if num_lanes < 1:
+            raise ValueError("A gate needs at least one lane")
+        self.registry = registry
+        self.lanes = [Gate(registry=registry, retention=retention) for _ in range(num_lanes)]
+
+    def __len__(self):
+        return len(self.lanes)
+
+    def lane(self, index):
+        """Get the Gate for one lane."""
+        return self.lanes[index]
+
+    def scan(self, lane, person, timestamp=None):
+        """
+        Scan a person at one lane.
+
+        Args:
+            lane (int): Index of the lane the person walks through
+            person (Person): The person to scan
+            timestamp (datetime): Time of the scan (defaults to now)
+
+        Returns:
+            GateScanResult: Result of the lane's scan
+        """
+        return self.lanes[lane].scan(person, timestamp=timestamp)
+
+    @property
+    def total_scans(self):
+        return sum(lane.total_scans for lane in self.lanes)
+
+    @property
+    def alerts_triggered(self):
+        return sum(lane.alerts_triggered for lane in self.lanes)
+
+    def get_hourly_counts(self):
+        """Get merged scans per hour of day as a 24-element array."""
+        hourly = np.zeros(24, dtype=np.int64)
+        for lane in self.lanes:
+            hourly += lane.get_hourly_counts()
+        return hourly
+
+    def get_recent_traffic(self, minutes=5):
+        """Get the scans and alerts of the last ``minutes`` minutes over all lanes."""
+        latest = [lane.traffic.latest for lane in self.lanes if lane.traffic.latest is not None]
+        totals = {'scans': 0, 'alerts': 0}
+        for lane in self.lanes:
+            if lane.traffic.latest is None:
+                continue
+            # Count every lane back from the newest scan at any lane
+            for key, count in lane.get_recent_traffic(minutes, now=max(latest)).items():
+                totals[key] += count
+        return totals
+
+    def get_alert_tags(self):
+        """Merge the lanes' top alerting tag summaries into one SpaceSaving."""
+        merged = SpaceSaving(self.lanes[0].alert_tags.capacity)
+        for lane in self.lanes:
+            merged.merge(lane.alert_tags)
+        return merged
+
+    def get_unique_counts(self):
+        """Get estimated distinct customers and alerting tags over all lanes."""
+        customers = WindowedHyperLogLog()
+        alert_tags = WindowedHyperLogLog()
+        for lane in self.lanes:
+            customers.merge(lane.unique_customers)
+            alert_tags.merge(lane.unique_alert_tags)
+        return {'customers': customers.estimate(), 'alert_tags': alert_tags.estimate()}
+
+    def get_tag_counts(self):
+        """Get merged estimated alert counts per tracked tag id."""
+        return self.get_alert_tags().counts()
+
+    def get_stats(self):
+        """
+        Get gate statistics merged across all lanes.
+
+        The figures have the same keys as Gate.get_stats(), plus the
+        counts of each lane under 'lanes'.
+        """
+        total_scans = self.total_scans
+        alerts_triggered = self.alerts_triggered
+        alert_rate = (alerts_triggered / total_scans * 100) if total_scans > 0 else 0
+        items_scanned = sum(lane.items_scanned for lane in self.lanes)
+        scan_latency = merge_histograms(lane.scan_latency for lane in self.lanes)
+
+        hourly = self.get_hourly_counts()
+        peak_hours = None
+        if hourly.any():
+            peak_hours = {
+                'busiest_hour': int(hourly.argmax()),
+                'hourly_traffic': {hour: int(count) for hour, count in enumerate(hourly) if count > 0}
+            }
+
+        alert_tags = self.get_alert_tags()
+
+        return {
+            "total_scans": total_scans,
+            "alerts_triggered": alerts_triggered,
+            "alert_rate": alert_rate,
+            "avg_items_per_scan": (items_scanned / total_scans) if total_scans > 0 else 0,
+            "avg_scan_duration": scan_latency.mean / 1e9,
+            "alerted_value": sum(lane.alerted_value for lane in self.lanes),
+            "window": merge_summaries(lane.scan_history.summary() for lane in self.lanes),
+            "peak_hours": peak_hours,
+            "last_hour": self.get_recent_traffic(60),
+            "alert_patterns": {
+                'most_triggered_tags': {tag: count for tag, count, _ in alert_tags.top(5)},
+                'error_bound': alert_tags.error_bound,
+                'alert_rate': alert_rate
+            },
+            "unique": self.get_unique_counts(),
+            "scan_latency": scan_latency.get_stats(),
+            "lanes": [
+                {
+                    'lane': index,
+                    'total_scans': lane.total_scans,
+                    'alerts_triggered': lane.alerts_triggered
+                }
+                for index, lane in enumerate(self.lanes)
+            ]
+        }
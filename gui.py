@@ -1,42 +1,274 @@
 import tkinter as tk
 from tkinter import ttk, messagebox, font
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-import random
 import time
-from models import Item, Person, Cashier, Gate
+from datetime import datetime
+from models import Person, Cashier, Gate, TagRegistry, CheckoutResult
+from history import close_all as close_histories
 from logger import SystemLogger
-
-class StatisticsWindow:
-    def __init__(self, parent, safe_scans, alert_scans):
-        self.window = tk.Toplevel(parent)
-        self.window.title("Scan Statistics")
-        self.window.geometry("600x400")
-        
-        # Create figure and plot
-        fig, ax = plt.subplots(figsize=(6, 4))
-        labels = ['Safe Scans', 'Alert Scans']
-        sizes = [safe_scans, alert_scans]
-        colors = ['#2ecc71', '#e74c3c']
-        
-        if sum(sizes) > 0:  # Only create pie chart if there's data
-            ax.pie(sizes, labels=labels, colors=colors, autopct='%1.1f%%', startangle=90)
-            ax.axis('equal')
+from simulation import StoreSimulation, default_catalog
+from ui_scheduler import FrameScheduler, diff_lines, run_in_background
+
+def apply_line_edits(text, edits):
+    """Apply diff_lines() edits to a read-only Text widget."""
+    text.config(state=tk.NORMAL)
+    for edit, index, line in edits:
+        row = index + 1
+        if edit == 'replace':
+            text.delete(f"{row}.0", f"{row}.end")
+            text.insert(f"{row}.0", line)
+        elif edit == 'insert':
+            text.insert("end-1c", f"\n{line}" if index else line)
         else:
-            ax.text(0.5, 0.5, 'No scan data available', 
-                   horizontalalignment='center',
-                   verticalalignment='center')
-            ax.axis('off')
+            text.delete(f"{row - 1}.end" if index else "1.0", f"{row}.end")
+    text.config(state=tk.DISABLED)
+
+
+class SeqRing:
+    """
+    Sequence numbers of a filtered log view, oldest first.
+    
+    A list with a head offset: dropping the oldest number only moves the
+    head, and the list is compacted once half of it is dropped, so append
+    and popleft are amortized O(1). Unlike a deque, a window of rows from
+    any position is one list slice, O(rows returned).
+    """
+    
+    __slots__ = ('seqs', 'head')
+    
+    def __init__(self):
+        self.seqs = []
+        self.head = 0
+
+    def __len__(self):
+        return len(self.seqs) - self.head
+
+    def append(self, seq):
+        self.seqs.append(seq)
+
+    def popleft(self):
+        seq = self.seqs[self.head]
+        self.head += 1
+        if self.head * 2 >= len(self.seqs):
+            del self.seqs[:self.head]
+            self.head = 0
+        return seq
+
+    def slice(self, start, count):
+        """Get ``count`` sequence numbers from position ``start``."""
+        first = self.head + start
+        return self.seqs[first:first + count]
+
+
+class LogBuffer:
+    """
+    Ring buffer of log lines.
+    
+    Holds at most ``max_lines`` lines; the oldest are dropped first. Lines
+    get increasing sequence numbers and live in a fixed-size list at slot
+    ``seq % max_lines``, so any line is read in O(1). The sequence numbers
+    of alert lines, of each customer's lines and of each customer's alert
+    lines are indexed in SeqRings as lines come and go, so every window,
+    filtered or not, costs O(lines shown).
+    
+    Attributes:
+        max_lines (int): Most lines kept
+        slots (list): (text, is_alert, customer) per slot, None until first used
+        first_seq (int): Sequence number of the oldest line
+        size (int): Number of lines held
+        alert_seqs (SeqRing): Sequence numbers of alert lines
+        customer_seqs (dict): Customer name to the SeqRing of their lines
+        customer_alert_seqs (dict): Customer name to the SeqRing of their alert lines
+    """
+    
+    def __init__(self, max_lines=5000):
+        self.max_lines = max_lines
+        self.slots = [None] * max_lines
+        self.first_seq = 0
+        self.size = 0
+        self.alert_seqs = SeqRing()
+        self.customer_seqs = {}
+        self.customer_alert_seqs = {}
+
+    def __len__(self):
+        return self.size
+
+    def line(self, seq):
+        """Get the (text, is_alert, customer) of the line with sequence number ``seq``."""
+        return self.slots[seq % self.max_lines]
+
+    def append(self, text, alert=False, customer=None):
+        """Add a (possibly multi-line) message."""
+        if text.endswith("\n"):
+            text = text[:-1]
+        for line in text.split("\n"):
+            if self.size == self.max_lines:
+                self.evict()
+            seq = self.first_seq + self.size
+            self.slots[seq % self.max_lines] = (line, alert, customer)
+            self.size += 1
+            if alert:
+                self.alert_seqs.append(seq)
+            if customer is not None:
+                self.customer_seqs.setdefault(customer, SeqRing()).append(seq)
+                if alert:
+                    self.customer_alert_seqs.setdefault(customer, SeqRing()).append(seq)
+
+    def evict(self):
+        """Drop the oldest line."""
+        _, alert, customer = self.line(self.first_seq)
+        self.first_seq += 1
+        self.size -= 1
+        if alert:
+            self.alert_seqs.popleft()
+        if customer is not None:
+            self.drop_oldest(self.customer_seqs, customer)
+            if alert:
+                self.drop_oldest(self.customer_alert_seqs, customer)
+
+    @staticmethod
+    def drop_oldest(index, customer):
+        """Drop a customer's oldest indexed line, and the customer once none are left."""
+        seqs = index[customer]
+        seqs.popleft()
+        if not seqs:
+            del index[customer]
+
+    def rows(self, alerts_only=False, customer=None):
+        """Get the sequence numbers of the lines a filter shows (None for all lines)."""
+        if customer is not None:
+            index = self.customer_alert_seqs if alerts_only else self.customer_seqs
+            return index.get(customer) or SeqRing()
+        if alerts_only:
+            return self.alert_seqs
+        return None
+
+    def window(self, rows, start, count):
+        """
+        Get the text of ``count`` filtered lines from position ``start``.
+        
+        Both unfiltered windows and filtered ones (a SeqRing from rows())
+        cost O(count), however far into the view ``start`` is.
+        """
+        line = self.line
+        if rows is None:
+            first = self.first_seq + start
+            stop = self.first_seq + min(start + count, self.size)
+            return [line(seq)[0] for seq in range(first, stop)]
+        return [line(seq)[0] for seq in rows.slice(start, count)]
+
+
+class LogView:
+    """
+    Virtualized log panel.
+    
+    The Text widget only ever holds the visible window of ``height``
+    lines; scrolling and filtering pick a different window out of the
+    LogBuffer, and only lines that change are edited. The view follows new
+    lines while scrolled to the bottom.
+    
+    Attributes:
+        text (tk.Text): The widget showing the visible window
+        scrollbar (ttk.Scrollbar): Scrollbar driven by the view
+        buffer (LogBuffer): All retained log lines
+        height (int): Visible lines
+        top (int): Position of the first visible line in the filtered view
+        follow (bool): Whether the view sticks to the newest line
+        alerts_only (bool): Show alert lines only
+        customer (str): Show this customer's lines only (None for everyone)
+    """
+    
+    def __init__(self, text, scrollbar, buffer, height=15):
+        self.text = text
+        self.scrollbar = scrollbar
+        self.buffer = buffer
+        self.height = height
+        self.top = 0
+        self.follow = True
+        self.alerts_only = False
+        self.customer = None
+        self.shown = []
+
+    def set_filter(self, alerts_only=False, customer=None):
+        """Change the filter and jump to the newest matching line."""
+        self.alerts_only = alerts_only
+        self.customer = customer or None
+        self.follow = True
+        self.render()
+
+    def yview(self, *args):
+        """Scrollbar and mouse wheel command: 'moveto' fraction or 'scroll' n units/pages."""
+        rows = self.buffer.rows(self.alerts_only, self.customer)
+        size = len(self.buffer) if rows is None else len(rows)
+        if args[0] == 'moveto':
+            self.top = int(float(args[1]) * size)
+        elif args[0] == 'scroll':
+            step = self.height if args[2] == 'pages' else 1
+            self.top += int(args[1]) * step
+        self.top = max(0, min(self.top, size - self.height))
+        self.follow = self.top >= size - self.height
+        self.render()
+
+    def render(self):
+        """Show the current window of the filtered log."""
+        buffer = self.buffer
+        rows = buffer.rows(self.alerts_only, self.customer)
+        size = len(buffer) if rows is None else len(rows)
+        if self.follow:
+            self.top = size - self.height
+        self.top = max(0, min(self.top, size - self.height))
         
-        # Embed plot in Tkinter window
-        canvas = FigureCanvasTkAgg(fig, master=self.window)
-        canvas.draw()
-        canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True, padx=20, pady=20)
+        lines = buffer.window(rows, self.top, self.height)
+        edits = diff_lines(self.shown, lines)
+        if edits:
+            apply_line_edits(self.text, edits)
+            self.shown = lines
+        if size > 0:
+            self.scrollbar.set(self.top / size, (self.top + len(lines)) / size)
+        else:
+            self.scrollbar.set(0.0, 1.0)
+
+
+class BasketView:
+    """
+    Basket panel that only redraws the lines that changed.
+    
+    Attributes:
+        text (tk.Text): The widget showing the basket
+        lines (list): Lines currently shown
+    """
+    
+    def __init__(self, text):
+        self.text = text
+        self.lines = []
+
+    @staticmethod
+    def format_lines(items):
+        """Get the display lines of a basket."""
+        if not items:
+            return ["Basket is empty"]
+        lines = [f"• {item.name} (${item.price:.2f}) - "
+                 f"{'✅ Deactivated' if item.is_deactivated else '🔴 Active'}"
+                 for item in items]
+        lines.append("")
+        lines.append(f"Total: ${sum(item.price for item in items):.2f}")
+        return lines
+
+    def render(self, items):
+        """Bring the widget up to date with ``items``, editing only changed lines."""
+        lines = self.format_lines(items)
+        edits = diff_lines(self.lines, lines)
+        if edits:
+            apply_line_edits(self.text, edits)
+            self.lines = lines
 
 
 class AntiTheftGUI:
-    def __init__(self, root):
+    # Pause between scanned items at the cashier, for visual effect
+    ITEM_SCAN_DELAY_MS = 500
+    
+    def __init__(self, root, log_max_lines=5000):
         self.root = root
+        self.log_max_lines = log_max_lines
         self.root.title("Supermarket Anti-Theft System")
         self.root.geometry("1000x1000")
         self.root.configure(bg='#f0f0f0')
@@ -55,34 +287,66 @@ class AntiTheftGUI:
         self.total_revenue = 0.0
         self.total_prevented_theft = 0.0
         
-        # Initialize logger
-        self.logger = SystemLogger()
+        # Initialize logger (scans are written by a background thread,
+        # and each day's log is closed and compressed when the next starts)
+        self.logger = SystemLogger(async_writes=True, rotate_daily=True)
 
         # Available items in the store with prices
-        self.available_items = [
-            Item("Milk", "RFID001", price=3.99, category="Dairy"),
-            Item("Bread", "RFID002", price=2.49, category="Bakery"),
-            Item("Cheese", "RFID003", price=4.99, category="Dairy"),
-            Item("Coffee", "RFID004", price=7.99, category="Beverages"),
-            Item("Chocolate", "RFID005", price=1.99, category="Snacks"),
-            # Add more items
-            Item("Apple", "RFID006", price=0.99, category="Produce"),
-            Item("Cereal", "RFID007", price=5.99, category="Breakfast"),
-            Item("Chips", "RFID008", price=3.49, category="Snacks"),
-            Item("Soda", "RFID009", price=2.99, category="Beverages"),
-            Item("Eggs", "RFID010", price=4.49, category="Dairy")
-        ]
+        self.available_items = default_catalog()
+        self.catalog_index = {item.name: item for item in self.available_items}
+        self.registry = TagRegistry()
 
         # Create first person and system components
         self.new_person()
-        self.cashier = Cashier("Sarah")
-        self.gate = Gate()
-
+        self.cashier = Cashier("Sarah", registry=self.registry)
+        self.gate = Gate(registry=self.registry)
+
+        # Model work runs off the Tk loop; its results are drained once per frame,
+        # and widgets are redrawn at most once per frame by the renderers below
+        self.scheduler = FrameScheduler(self.root)
+        self.scheduler.start()
+        self.simulation = None
+        self.simulation_thread = None
+        self.checkout_in_progress = False
+        self.stats_window = None
+        self.status = ("Ready to scan items", False)
+        
         self.create_widgets()
+        self.basket_view = BasketView(self.basket_display)
+        self.scheduler.add_renderer('person', self.update_person_display)
+        self.scheduler.add_renderer('basket', self.update_basket_display)
+        self.scheduler.add_renderer('buttons', self.update_button_states)
+        self.scheduler.add_renderer('revenue', self.update_revenue_display)
+        self.scheduler.add_renderer('alerts', self.update_alert_display)
+        self.scheduler.add_renderer('status', self.show_status)
+        self.scheduler.add_renderer('log', self.log_view.render)
         self.update_button_states()
+        self.scheduler.invalidate('basket')
         
         # Set up keyboard shortcuts
         self.setup_shortcuts()
+        
+        # Flush pending log writes before the window goes away
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+
+    @property
+    def busy(self):
+        """Whether a checkout or simulation is using the cashier and gate."""
+        return self.checkout_in_progress or self.simulation is not None
+
+    def on_close(self):
+        """Stop background work, flush the logger and close the application."""
+        if self.simulation is not None:
+            self.simulation.stop()
+        if self.simulation_thread is not None:
+            self.simulation_thread.join()
+        if self.stats_window is not None:
+            self.stats_window.destroy()
+        self.scheduler.stop()
+        # Nothing changes the models any more; write out buffered history spills
+        close_histories()
+        self.logger.close()
+        self.root.destroy()
 
     def setup_shortcuts(self):
         """Set up keyboard shortcuts for common actions."""
@@ -162,13 +426,23 @@ class AntiTheftGUI:
         ttk.Button(
             analysis_frame,
             text="Show Statistics",
-            command=lambda: StatisticsWindow(self.root, self.safe_scan_counter, self.alert_counter)
+            command=self.show_statistics
         ).pack(side="left", padx=5)
 
-        ttk.Button(
+        self.simulate_button = ttk.Button(
             analysis_frame,
             text="Simulate Random Customers",
             command=self.simulate_random_customers
+        )
+        self.simulate_button.pack(side="left", padx=5)
+        
+        self.simulation_size_var = tk.IntVar(value=10)
+        ttk.Spinbox(
+            analysis_frame,
+            from_=1,
+            to=10000,
+            width=6,
+            textvariable=self.simulation_size_var
         ).pack(side="left", padx=5)
 
         ttk.Button(
@@ -363,31 +637,81 @@ class AntiTheftGUI:
         self.log_frame.columnconfigure(0, weight=1)
         self.log_frame.rowconfigure(0, weight=1)
 
-        # Log display with custom font and colors
+        # Log display with custom font and colors; it only holds the visible lines
         self.log_text = tk.Text(
             self.log_frame,
             height=15,
             width=70,
             font=self.log_font,
-            wrap=tk.WORD,
+            wrap=tk.NONE,
             bg='#ffffff',
-            fg='#000000'
+            fg='#000000',
+            state=tk.DISABLED
         )
         self.log_text.grid(row=0, column=0, sticky="nsew")
 
         # Add scrollbar to log
         scrollbar = ttk.Scrollbar(
             self.log_frame,
-            orient="vertical",
-            command=self.log_text.yview
+            orient="vertical"
         )
         scrollbar.grid(row=0, column=1, sticky="ns")
-        self.log_text.configure(yscrollcommand=scrollbar.set)
+        self.log_view = LogView(self.log_text, scrollbar, LogBuffer(self.log_max_lines), height=15)
+        scrollbar.configure(command=self.log_view.yview)
+        self.log_text.bind('<MouseWheel>',
+                           lambda e: self.log_view.yview('scroll', -1 if e.delta > 0 else 1, 'units'))
+        self.log_text.bind('<Button-4>', lambda e: self.log_view.yview('scroll', -1, 'units'))
+        self.log_text.bind('<Button-5>', lambda e: self.log_view.yview('scroll', 1, 'units'))
+
+        # Log filters
+        filter_bar = ttk.Frame(self.log_frame)
+        filter_bar.grid(row=1, column=0, columnspan=2, sticky="ew", pady=(5, 0))
+        
+        self.log_alerts_only_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(
+            filter_bar,
+            text="Alerts only",
+            variable=self.log_alerts_only_var,
+            command=self.update_log_filter
+        ).pack(side="left")
+        
+        ttk.Label(
+            filter_bar,
+            text="Customer:",
+            font=self.text_font
+        ).pack(side="left", padx=(10, 5))
+        
+        self.log_customer_var = tk.StringVar()
+        self.log_customer_var.trace('w', lambda *args: self.update_log_filter())
+        ttk.Entry(
+            filter_bar,
+            textvariable=self.log_customer_var,
+            width=20
+        ).pack(side="left")
 
         # Configure grid weights
         self.root.grid_rowconfigure(7, weight=1)
         self.root.grid_columnconfigure(0, weight=1)
 
+    def show_statistics(self):
+        """Open the statistics window, or bring the existing one back."""
+        if self.stats_window is None:
+            # matplotlib is only loaded the first time statistics are opened
+            from stats_window import StatisticsWindow
+            self.stats_window = StatisticsWindow(self.root, self.gate, self.cashier)
+        else:
+            self.stats_window.show()
+
+    def log(self, message, alert=False, customer=None):
+        """Add a message to the system log (shown at the end of the frame)."""
+        self.log_view.buffer.append(message, alert, customer)
+        self.scheduler.invalidate('log')
+
+    def update_log_filter(self):
+        """Apply the log filter controls."""
+        self.log_view.set_filter(self.log_alerts_only_var.get(),
+                                 self.log_customer_var.get().strip())
+
     def show_shortcuts(self):
         """Display keyboard shortcuts help window."""
         shortcuts = """
@@ -423,30 +747,35 @@ class AntiTheftGUI:
 
     def update_button_states(self):
         """Update the state of all buttons based on current conditions."""
-        state = tk.NORMAL if self.current_person.items else tk.DISABLED
+        busy = self.busy
+        state = tk.NORMAL if self.current_person.items and not busy else tk.DISABLED
         self.cashier_button.configure(state=state)
         self.gate_button.configure(state=state)
         self.clear_button.configure(state=state)
         self.skip_cashier_button.configure(state=state)
+        self.add_button.configure(state=tk.DISABLED if busy else tk.NORMAL)
+        self.simulate_button.configure(state=tk.DISABLED if busy else tk.NORMAL)
+
+    def update_alert_display(self):
+        """Update the alert counter display."""
+        self.alert_label.configure(text=f"Total Alerts: {self.alert_counter}")
+
+    def update_person_display(self):
+        """Update the current customer display."""
+        self.person_label.configure(text=f"Current Customer: {self.current_person.name}")
 
     def update_basket_display(self):
         """Update the basket display with current items."""
-        self.basket_display.config(state=tk.NORMAL)
-        self.basket_display.delete(1.0, tk.END)
-        if self.current_person.items:
-            total = 0.0
-            for item in self.current_person.items:
-                status = "✅ Deactivated" if item.is_deactivated else "🔴 Active"
-                self.basket_display.insert(tk.END, 
-                    f"• {item.name} (${item.price:.2f}) - {status}\n")
-                total += item.price
-            self.basket_display.insert(tk.END, f"\nTotal: ${total:.2f}")
-        else:
-            self.basket_display.insert(tk.END, "Basket is empty")
-        self.basket_display.config(state=tk.DISABLED)
+        self.basket_view.render(self.current_person.items)
 
     def update_status(self, message, is_alert=False):
-        """Update the status message."""
+        """Update the status message (shown at the end of the frame)."""
+        self.status = (message, is_alert)
+        self.scheduler.invalidate('status')
+
+    def show_status(self):
+        """Show the latest status message."""
+        message, is_alert = self.status
         color = '#ff0000' if is_alert else '#008000'
         self.status_label.configure(text=message, foreground=color)
 
@@ -455,51 +784,64 @@ class AntiTheftGUI:
         self.person_counter += 1
         self.current_person = Person(f"Person {self.person_counter}")
         if hasattr(self, 'person_label'):
-            self.person_label.configure(text=f"Current Customer: {self.current_person.name}")
+            self.scheduler.invalidate('person')
             self.clear_basket()
             self.update_status(f"New customer: {self.current_person.name}")
 
     def add_item(self):
         """Add an item to the current person's basket."""
-        selected_item_name = self.item_var.get()
-        if selected_item_name:
-            for item in self.available_items:
-                if item.name == selected_item_name:
-                    new_item = Item(item.name, item.tag_id, 
-                                  price=item.price, category=item.category)
-                    self.current_person.add_item(new_item)
-                    self.log_text.insert("end", 
-                        f"➕ Added {new_item.name} (${new_item.price:.2f}) to basket\n")
-                    self.log_text.see("end")
-                    self.update_basket_display()
-                    self.update_button_states()
-                    self.update_status(f"Added {new_item.name} to basket")
-                    break
+        item = self.catalog_index.get(self.item_var.get())
+        if item:
+            new_item = self.registry.create_unit(item)
+            self.current_person.add_item(new_item)
+            self.log(f"➕ Added {new_item.name} (${new_item.price:.2f}) to basket\n",
+                     customer=self.current_person.name)
+            self.scheduler.invalidate('basket', 'buttons')
+            self.update_status(f"Added {new_item.name} to basket")
 
     def clear_basket(self):
         """Clear all items from the current basket."""
-        self.current_person.items = []
-        self.log_text.insert("end", "🗑️ Basket cleared\n")
-        self.log_text.see("end")
-        self.update_basket_display()
-        self.update_button_states()
+        self.registry.retire_items(self.current_person.items)
+        self.current_person.clear_items()
+        self.log("🗑️ Basket cleared\n", customer=self.current_person.name)
+        self.scheduler.invalidate('basket', 'buttons')
         self.update_status("Basket has been cleared")
 
     def go_to_cashier(self):
-        """Process items through the cashier."""
+        """Process items through the cashier, one item per timer tick."""
         if not self.current_person.items:
             messagebox.showwarning("Empty Basket", "No items in the basket!")
             return
+        if self.busy:
+            return
         
+        self.checkout_in_progress = True
+        self.scheduler.invalidate('buttons')
+        self.update_status("Scanning items...")
+        items = tuple(self.current_person.items)
+        self.scan_next_item(self.current_person, items, 0, [], datetime.now(), time.perf_counter())
+
+    def scan_next_item(self, person, items, index, scan_times, started, clock):
+        """Scan one item of a checkout and schedule the next one."""
         try:
-            result = self.cashier.scan_and_deactivate(self.current_person, 
-                lambda msg: self.update_log_with_delay(msg))
-            self.total_revenue += self.current_person.calculate_total()
-            self.update_revenue_display()
-            self.update_basket_display()
+            if index < len(items):
+                item = items[index]
+                scan_times.append(self.cashier.scan_item(item))
+                self.log(CheckoutResult.format_item(item), customer=person.name)
+                self.scheduler.invalidate('basket')
+                self.root.after(self.ITEM_SCAN_DELAY_MS, self.scan_next_item,
+                                person, items, index + 1, scan_times, started, clock)
+                return
+            
+            self.cashier.complete_transaction(person, items, scan_times, started,
+                                              time.perf_counter() - clock)
+            self.total_revenue += person.calculate_total()
+            self.scheduler.invalidate('revenue', 'basket')
             self.update_status("All items have been scanned and deactivated")
         except Exception as e:
             messagebox.showerror("Cashier Error", f"Error during checkout: {str(e)}")
+        self.checkout_in_progress = False
+        self.scheduler.invalidate('buttons')
 
     def skip_cashier(self):
         """Skip the cashier (simulating potential theft)."""
@@ -507,8 +849,8 @@ class AntiTheftGUI:
             messagebox.showwarning("Empty Basket", "No items in the basket!")
             return
         
-        self.log_text.insert("end", f"\n⚠️ {self.current_person.name} is skipping the cashier!\n")
-        self.log_text.see("end")
+        self.log(f"\n⚠️ {self.current_person.name} is skipping the cashier!\n",
+                 customer=self.current_person.name)
         self.update_status("⚠️ Skipping cashier!", True)
         self.pass_through_gate()
 
@@ -519,57 +861,103 @@ class AntiTheftGUI:
             return
         
         try:
-            result, alert_triggered = self.gate.scan(self.current_person)
-            self.log_text.insert("end", result)
-            self.log_text.see("end")
+            result = self.gate.scan(self.current_person)
+            alert_triggered = result.alert_triggered
+            self.log(result.text, alert_triggered, self.current_person.name)
             
             if alert_triggered:
                 self.alert_counter += 1
                 self.alert_history.append(self.current_person.name)
-                self.alert_label.configure(text=f"Total Alerts: {self.alert_counter}")
                 self.total_prevented_theft += self.current_person.calculate_total()
-                self.update_revenue_display()
+                self.scheduler.invalidate('alerts', 'revenue')
                 self.update_status("🚨 ALERT: Active tag detected!", True)
             else:
                 self.safe_scan_counter += 1
                 self.update_status("✅ All items are safe. No alert.")
             
             self.logger.log_gate_scan(self.current_person, alert_triggered)
+            self.logger.report_errors()
             
         except Exception as e:
             messagebox.showerror("Gate Error", f"Error during gate scan: {str(e)}")
 
-    def update_log_with_delay(self, message):
-        """Update the log with a delay for visual effect."""
-        self.log_text.insert("end", message)
-        self.log_text.see("end")
-        self.root.update_idletasks()
-        time.sleep(0.5)
-
     def simulate_random_customers(self):
-        """Simulate multiple customers with random behaviors."""
+        """Simulate multiple customers with random behaviors on a worker thread."""
+        if self.busy:
+            return
         try:
-            for _ in range(10):
-                self.new_person()
-                # Add 1-5 random items
-                num_items = random.randint(1, 5)
-                for _ in range(num_items):
-                    item = random.choice(self.available_items)
-                    new_item = Item(item.name, item.tag_id, 
-                                  price=item.price, category=item.category)
-                    self.current_person.add_item(new_item)
-                    self.update_basket_display()
-                    self.update_button_states()
-                    self.root.update_idletasks()
-                    time.sleep(0.2)
-                
-                # 30% chance to skip cashier
-                if random.random() < 0.3:
-                    self.skip_cashier()
-                else:
-                    self.go_to_cashier()
-                
-                self.pass_through_gate()
-                time.sleep(0.5)
+            num_customers = self.simulation_size_var.get()
+        except tk.TclError:
+            messagebox.showerror("Simulation Error", "Enter the number of customers to simulate")
+            return
+        
+        self.simulation = StoreSimulation(
+            self.available_items,
+            cashiers=[self.cashier],
+            gate=self.gate,
+            registry=self.registry,
+            start_time=datetime.now(),
+            listener=self.queue_simulation_event
+        )
+        self.simulation_thread = run_in_background(self.run_simulation, self.simulation,
+                                                   num_customers, name="simulation")
+        self.scheduler.invalidate('buttons')
+        self.update_status(f"Simulating {num_customers} customers...")
+
+    def run_simulation(self, simulation, num_customers):
+        """Worker thread: run the simulation and post its outcome to the UI."""
+        try:
+            stats = simulation.run(num_customers=num_customers)
         except Exception as e:
-            messagebox.showerror("Simulation Error", f"Error during simulation: {str(e)}")
\ No newline at end of file
+            self.scheduler.post(self.finish_simulation, None, e)
+        else:
+            self.scheduler.post(self.finish_simulation, stats, None)
+
+    def queue_simulation_event(self, event, person, now, detail):
+        """Worker thread: log gate scans and hand the event to the UI thread."""
+        if event == 'exit':
+            self.logger.log_gate_scan(person, detail.alert_triggered)
+        self.scheduler.post(self.show_simulation_event, event, person, now, detail)
+
+    def finish_simulation(self, stats, error):
+        """Report the end of a background simulation."""
+        self.simulation = None
+        self.simulation_thread = None
+        self.scheduler.invalidate('buttons')
+        # Scans logged on the worker thread keep their errors for this thread
+        self.logger.report_errors()
+        if error is not None:
+            messagebox.showerror("Simulation Error", f"Error during simulation: {str(error)}")
+            return
+        self.log(f"\n📈 Simulated {stats['customers']} customers: "
+                 f"{stats['alerts']} alert(s), ${stats['revenue']:.2f} revenue\n")
+
+    def show_simulation_event(self, event, person, now, detail):
+        """Visualize a single event of a running simulation."""
+        if event == 'arrival':
+            self.person_counter += 1
+            self.current_person = person
+            self.scheduler.invalidate('person', 'basket', 'buttons')
+            self.update_status(f"New customer: {person.name}")
+        elif event == 'item':
+            self.scheduler.invalidate('basket')
+        elif event == 'skip':
+            self.log(f"\n⚠️ {person.name} is skipping the cashier!\n", customer=person.name)
+            self.update_status("⚠️ Skipping cashier!", True)
+        elif event == 'checkout':
+            self.log(detail.text, customer=person.name)
+            self.total_revenue += person.total_spent
+            self.scheduler.invalidate('revenue', 'basket')
+        elif event == 'exit':
+            alert_triggered = detail.alert_triggered
+            self.current_person = person
+            self.log(detail.text, alert_triggered, person.name)
+            if alert_triggered:
+                self.alert_counter += 1
+                self.alert_history.append(person.name)
+                self.total_prevented_theft += person.total_spent
+                self.scheduler.invalidate('alerts', 'revenue')
+                self.update_status("🚨 ALERT: Active tag detected!", True)
+            else:
+                self.safe_scan_counter += 1
+                self.update_status("✅ All items are safe. No alert.")
@@ -0,0 +1,112 @@
+from collections import deque
+from datetime import timedelta
+import json
+import weakref
+
+# Histories (and scan stores) holding evicted records not yet written to their spill file
+_unflushed = weakref.WeakSet()
+
+
+def close_all():
+    """Write out the buffered evicted records of every history (call on shutdown)."""
+    for history in list(_unflushed):
+        history.close()
+
+
+def mark_unflushed(holder):
+    """Have close_all() write out a holder of evicted records (anything with close())."""
+    _unflushed.add(holder)
+
+
+def mark_flushed(holder):
+    """Drop a holder whose evicted records have all been written from close_all()."""
+    _unflushed.discard(holder)
+
+
+class History:
+    """
+    Bounded, append-only history of records.
+
+    Records are dicts with a ``timestamp``. The oldest records are evicted
+    once the history holds ``max_items`` records or once they are more than
+    ``max_age`` seconds older than the newest record. Appending is O(1)
+    (amortized when several records expire at once). Evicted records can
+    optionally be spilled to a JSON Lines file; they are buffered and
+    written in batches, and whatever is still buffered is written by
+    close() (or close_all() for every history at shutdown).
+
+    Attributes:
+        max_items (int): Most records kept in memory (None for no limit)
+        max_age (float): Oldest record age in seconds (None for no limit)
+        spill_file (str): JSON Lines file for evicted records (None to drop them)
+        appended (int): Records appended over the history's lifetime
+        evicted (int): Records evicted so far
+    """
+
+    __slots__ = ('records', 'max_items', 'max_age', 'spill_file', 'appended', 'evicted',
+                 '_max_age_delta', '_spill_buffer', '__weakref__')
+
+    SPILL_BATCH = 256
+
+    def __init__(self, max_items=None, max_age=None, spill_file=None):
+        self.records = deque()
+        self.max_items = max_items
+        self.max_age = max_age
+        self.spill_file = spill_file
+        self.appended = 0
+        self.evicted = 0
+        self._max_age_delta = timedelta(seconds=max_age) if max_age is not None else None
+        self._spill_buffer = []
+
+    def __len__(self):
+        return len(self.records)
+
+    def __iter__(self):
+        return iter(self.records)
+
+    def __getitem__(self, index):
+        return self.records[index]
+
+    def __bool__(self):
+        return bool(self.records)
+
+    def append(self, record):
+        """Append a record, evicting whatever falls outside the retention window."""
+        records = self.records
+        records.append(record)
+        self.appended += 1
+
+        if self.max_items is not None and len(records) > self.max_items:
+            self._evict()
+        if self._max_age_delta is not None:
+            cutoff = record['timestamp'] - self._max_age_delta
+            while records[0]['timestamp'] < cutoff:
+                self._evict()
+
+    def _evict(self):
+        """Evict the oldest record."""
+        record = self.records.popleft()
+        self.evicted += 1
+        if self.spill_file is not None:
+            if not self._spill_buffer:
+                _unflushed.add(self)
+            self._spill_buffer.append(record)
+            if len(self._spill_buffer) >= self.SPILL_BATCH:
+                self.flush()
+
+    def flush(self):
+        """Write buffered evicted records to the spill file."""
+        if self._spill_buffer:
+            with open(self.spill_file, 'a') as file:
+                file.write("".join(json.dumps(record, default=str) + "\n"
+                                   for record in self._spill_buffer))
+            self._spill_buffer = []
+        _unflushed.discard(self)
+
+    def close(self):
+        """Write any buffered evicted records so none are lost at shutdown."""
+        self.flush()
+
+    def get_records(self):
+        """Get the retained records, oldest first."""
+        return list(self.records)
@@ -0,0 +1,204 @@
+import math
+import time
+
+# Monotonic nanosecond clock used for every latency measurement
+now_ns = time.perf_counter_ns
+
+
+class LatencyHistogram:
+    """
+    Log-bucketed latency histogram in the style of HdrHistogram.
+
+    Latencies are recorded as integer nanoseconds. Values below
+    ``2 ** significant_bits`` get a bucket each; above that, every power of
+    two is split into ``2 ** (significant_bits - 1)`` equal buckets, so a
+    bucket is never wider than ``2 ** (1 - significant_bits)`` of the
+    values it holds (1.6% with the default 7 bits). Recording is O(1) and
+    the histogram takes a few KB however many values it has seen.
+    Percentiles are reported as the upper bound of their bucket, clamped
+    to the exact minimum and maximum, so they never understate the tail.
+
+    Histograms with the same precision merge exactly, so per-lane or
+    per-shard histograms can be combined into one.
+
+    Attributes:
+        significant_bits (int): Precision of the buckets
+        counts (list): Values recorded per bucket
+        count (int): Values recorded
+        total (int): Sum of the values in nanoseconds
+        minimum (int): Smallest value (None until the first record)
+        maximum (int): Largest value (0 until the first record)
+    """
+
+    __slots__ = ('significant_bits', 'counts', 'count', 'total', 'minimum', 'maximum',
+                 '_linear', '_half')
+
+    def __init__(self, significant_bits=7):
+        if significant_bits < 1:
+            raise ValueError("A histogram needs at least one significant bit")
+        self.significant_bits = significant_bits
+        self.counts = []
+        self.count = 0
+        self.total = 0
+        self.minimum = None
+        self.maximum = 0
+        self._linear = 1 << significant_bits
+        self._half = 1 << (significant_bits - 1)
+
+    def __len__(self):
+        return self.count
+
+    def bucket_index(self, value):
+        """Get the bucket a value in nanoseconds falls into."""
+        if value < self._linear:
+            return value
+        shift = value.bit_length() - self.significant_bits
+        return shift * self._half + (value >> shift)
+
+    def bucket_bounds(self, index):
+        """Get the (lowest, highest) value of a bucket in nanoseconds."""
+        if index < self._linear:
+            return index, index
+        shift = index // self._half - 1
+        mantissa = index - shift * self._half
+        return mantissa << shift, ((mantissa + 1) << shift) - 1
+
+    def record(self, value):
+        """Record a latency in nanoseconds (negative values count as 0)."""
+        if value < 0:
+            value = 0
+        if value < self._linear:
+            index = value
+        else:
+            shift = value.bit_length() - self.significant_bits
+            index = shift * self._half + (value >> shift)
+        counts = self.counts
+        if index >= len(counts):
+            counts.extend([0] * (index + 1 - len(counts)))
+        counts[index] += 1
+        self.count += 1
+        self.total += value
+        if value > self.maximum:
+            self.maximum = value
+        if self.minimum is None or value < self.minimum:
+            self.minimum = value
+
+    def time(self):
+        """Get a context manager that records the time spent in its block."""
+        return Timer(self)
+
+    def percentiles(self, *percents):
+        """
+        Get several percentiles in one pass over the buckets.
+
+        Args:
+            *percents (float): Percentiles between 0 and 100
+
+        Returns:
+            list: The percentiles in nanoseconds, in the order asked (0 if empty)
+        """
+        if not self.count:
+            return [0] * len(percents)
+        targets = sorted((max(1, math.ceil(self.count * percent / 100)), position)
+                         for position, percent in enumerate(percents))
+        results = [self.maximum] * len(percents)
+        pending = 0
+        seen = 0
+        for index, count in enumerate(self.counts):
+            if not count:
+                continue
+            seen += count
+            while pending < len(targets) and seen >= targets[pending][0]:
+                value = min(self.bucket_bounds(index)[1], self.maximum)
+                results[targets[pending][1]] = max(value, self.minimum)
+                pending += 1
+            if pending == len(targets):
+                break
+        return results
+
+    def percentile(self, percent):
+        """Get one percentile in nanoseconds."""
+        return self.percentiles(percent)[0]
+
+    @property
+    def mean(self):
+        """Exact mean of the values in nanoseconds."""
+        return self.total / self.count if self.count else 0.0
+
+    def merge(self, other):
+        """Add the values recorded by another histogram of the same precision."""
+        if other.significant_bits != self.significant_bits:
+            raise ValueError("Cannot merge histograms of different precision")
+        counts = self.counts
+        if len(other.counts) > len(counts):
+            counts.extend([0] * (len(other.counts) - len(counts)))
+        for index, count in enumerate(other.counts):
+            if count:
+                counts[index] += count
+        self.count += other.count
+        self.total += other.total
+        self.maximum = max(self.maximum, other.maximum)
+        if other.minimum is not None and (self.minimum is None or other.minimum < self.minimum):
+            self.minimum = other.minimum
+        return self
+
+    def reset(self):
+        """Forget every recorded value."""
+        self.counts = []
+        self.count = 0
+        self.total = 0
+        self.minimum = None
+        self.maximum = 0
+
+    def get_stats(self):
+        """
+        Get the count, mean and tail latencies.
+
+        Returns:
+            dict: 'count' plus 'mean', 'min', 'p50', 'p95', 'p99' and 'max'
+            in seconds
+        """
+        p50, p95, p99 = self.percentiles(50, 95, 99)
+        return {
+            'count': self.count,
+            'mean': self.mean / 1e9,
+            'min': (self.minimum or 0) / 1e9,
+            'p50': p50 / 1e9,
+            'p95': p95 / 1e9,
+            'p99': p99 / 1e9,
+            'max': self.maximum / 1e9
+        }
+
+
+class Timer:
+    """
+    Context manager that records the nanoseconds spent in its block.
+
+    Attributes:
+        histogram (LatencyHistogram): Histogram the elapsed time is recorded in
+        elapsed (int): Nanoseconds the block took (None while running)
+    """
+
+    __slots__ = ('histogram', 'start', 'elapsed')
+
+    def __init__(self, histogram):
+        self.histogram = histogram
+        self.start = None
+        self.elapsed = None
+
+    def __enter__(self):
+        self.start = now_ns()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.elapsed = now_ns() - self.start
+        self.histogram.record(self.elapsed)
+        return False
+
+
+def merge_histograms(histograms, significant_bits=7):
+    """Merge histograms into a new one."""
+    merged = LatencyHistogram(significant_bits)
+    for histogram in histograms:
+        merged.merge(histogram)
+    return merged
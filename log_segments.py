@@ -0,0 +1,116 @@
+import gzip
+import json
+import os
+import shutil
+import threading
+
+
+def compress_file(path):
+    """
+    Gzip a file next to itself and remove the original.
+
+    The compressed copy is written under a temporary name and renamed into
+    place, so ``path + '.gz'`` only ever exists complete.
+
+    Returns:
+        str: Path of the compressed file
+    """
+    target = path + ".gz"
+    with open(path, 'rb') as source, gzip.open(target + ".tmp", 'wb') as out:
+        shutil.copyfileobj(source, out)
+    os.replace(target + ".tmp", target)
+    os.remove(path)
+    return target
+
+
+def open_segment(path):
+    """
+    Open a log segment for reading in binary mode, compressed or not.
+
+    A segment whose compression finishes after the caller looked it up is
+    found under its ``.gz`` name instead.
+    """
+    if path.endswith(".gz"):
+        return gzip.open(path, 'rb')
+    try:
+        return open(path, 'rb')
+    except FileNotFoundError:
+        return gzip.open(path + ".gz", 'rb')
+
+
+class SegmentManifest:
+    """
+    Manifest of the closed segments of a rotated log.
+
+    Each segment records its sequence number, the file names of its CSV
+    and JSON Lines parts (relative to the manifest's directory), the
+    timestamps of its first and last entries, its entry count and whether
+    it has been compressed. The manifest is rewritten atomically on every
+    change, so readers can pick the segments overlapping a time window
+    without opening any of the others.
+
+    Attributes:
+        path (str): Path of the JSON manifest file
+        directory (str): Directory segment file names are relative to
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.directory = os.path.dirname(os.path.abspath(path))
+        self._lock = threading.Lock()
+        self._segments = []
+        if os.path.exists(path):
+            with open(path) as f:
+                self._segments = json.load(f)['segments']
+
+    def __len__(self):
+        return len(self._segments)
+
+    def segments(self):
+        """Get a snapshot of the segments, oldest first."""
+        with self._lock:
+            return [dict(segment) for segment in self._segments]
+
+    def next_sequence(self):
+        """Get the sequence number for the next segment."""
+        with self._lock:
+            return self._segments[-1]['sequence'] + 1 if self._segments else 1
+
+    def add(self, segment):
+        """Record a newly closed segment."""
+        with self._lock:
+            self._segments.append(dict(segment))
+            self._save()
+
+    def update(self, sequence, **fields):
+        """Change the fields of the segment with the given sequence number."""
+        with self._lock:
+            for segment in self._segments:
+                if segment['sequence'] == sequence:
+                    segment.update(fields)
+            self._save()
+
+    def overlapping(self, start=None, end=None):
+        """
+        Get the segments holding entries in ``[start, end)``.
+
+        Args:
+            start (str): Earliest timestamp, as written in log entries
+            end (str): Timestamp the window ends before
+
+        Returns:
+            list: The overlapping segments, oldest first
+        """
+        return [segment for segment in self.segments()
+                if (end is None or segment['start'] < end)
+                and (start is None or segment['end'] >= start)]
+
+    def resolve(self, name):
+        """Get the path of a segment file from its manifest name."""
+        return os.path.join(self.directory, name)
+
+    def _save(self):
+        temporary = self.path + ".tmp"
+        with open(temporary, 'w') as f:
+            json.dump({'segments': self._segments}, f, indent=2)
+        os.replace(temporary, self.path)
@@ -0,0 +1,183 @@
+from datetime import datetime
+import json
+import sqlite3
+import threading
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS scans (
+    id INTEGER PRIMARY KEY,
+    timestamp REAL NOT NULL,
+    person TEXT NOT NULL,
+    alert INTEGER NOT NULL,
+    item_count INTEGER NOT NULL,
+    total_value REAL NOT NULL,
+    duration REAL NOT NULL,
+    items TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS scans_timestamp ON scans (timestamp);
+CREATE INDEX IF NOT EXISTS scans_person ON scans (person, timestamp);
+CREATE INDEX IF NOT EXISTS scans_alert ON scans (timestamp) WHERE alert = 1;
+"""
+
+INSERT = ("INSERT INTO scans (timestamp, person, alert, item_count, total_value, duration, items) "
+          "VALUES (?, ?, ?, ?, ?, ?, ?)")
+
+COLUMNS = "timestamp, person, alert, total_value, duration, items"
+
+
+def to_epoch(value):
+    """Convert a datetime (or epoch seconds) to epoch seconds."""
+    if isinstance(value, datetime):
+        return value.timestamp()
+    return value
+
+
+class SQLiteLogStore:
+    """
+    SQLite storage backend for SystemLogger.
+
+    Scans are stored one row each with typed columns: the time as epoch
+    seconds, the person, the alert flag, item count, basket value and
+    visit duration, plus the items as JSON. Indexes on the timestamp, on
+    (person, timestamp) and a partial index on the timestamp of alerts
+    let time-range, per-person and alert-only queries read only the rows
+    they return, however large the table grows.
+
+    The database runs in WAL mode, so readers never block the writer and
+    the other way round. Each thread gets its own connection, and every
+    batch of records is written in one transaction.
+
+    Attributes:
+        path (str): Path of the database file
+        rows_written (int): Rows inserted by this store
+    """
+
+    def __init__(self, path="alerts.db"):
+        self.path = path
+        self.rows_written = 0
+        self._local = threading.local()
+        self._connections = []
+        self._lock = threading.Lock()
+        self.connection().executescript(SCHEMA)
+
+    def connection(self):
+        """Get the calling thread's connection, opening it on first use."""
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            # Connections stay on their thread; close() may run on another one
+            connection = sqlite3.connect(self.path, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+            with self._lock:
+                self._connections.append(connection)
+        return connection
+
+    def write(self, records):
+        """
+        Insert a batch of log records in one transaction.
+
+        Args:
+            records (list): (entry, epoch timestamp) pairs as written by SystemLogger
+        """
+        rows = [(epoch, entry['person'], int(entry['alert']), len(entry['items']),
+                 entry['total_value'], entry['duration'],
+                 json.dumps(entry['items'], separators=(',', ':')))
+                for entry, epoch in records]
+        connection = self.connection()
+        with connection:
+            connection.executemany(INSERT, rows)
+        self.rows_written += len(rows)
+
+    @staticmethod
+    def where(start=None, end=None, person=None, alerts_only=False):
+        """Build the WHERE clause and parameters of a query."""
+        clauses = []
+        params = []
+        if start is not None:
+            clauses.append("timestamp >= ?")
+            params.append(to_epoch(start))
+        if end is not None:
+            clauses.append("timestamp < ?")
+            params.append(to_epoch(end))
+        if person is not None:
+            clauses.append("person = ?")
+            params.append(person)
+        if alerts_only:
+            clauses.append("alert = 1")
+        return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+    @staticmethod
+    def to_entry(row):
+        """Rebuild a log entry dict, as kept by SystemLogger, from a row."""
+        timestamp, person, alert, total_value, duration, items = row
+        return {
+            'timestamp': datetime.fromtimestamp(timestamp).strftime("%Y-%m-%d %H:%M:%S"),
+            'person': person,
+            'items': json.loads(items),
+            'alert': bool(alert),
+            'total_value': total_value,
+            'duration': duration
+        }
+
+    def query(self, start=None, end=None, person=None, alerts_only=False, limit=None,
+              newest_first=False):
+        """
+        Get logged scans matching a filter.
+
+        Args:
+            start (datetime): Earliest scan time (inclusive)
+            end (datetime): Latest scan time (exclusive)
+            person (str): Only scans of this person
+            alerts_only (bool): Only scans that raised an alert
+            limit (int): Most scans to return
+            newest_first (bool): Return the newest scans first
+
+        Returns:
+            list: Log entry dicts in time order
+        """
+        where, params = self.where(start, end, person, alerts_only)
+        sql = f"SELECT {COLUMNS} FROM scans{where} ORDER BY timestamp"
+        if newest_first:
+            sql += " DESC"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        return [self.to_entry(row) for row in self.connection().execute(sql, params)]
+
+    def count(self, start=None, end=None, person=None, alerts_only=False):
+        """Get the number of logged scans matching a filter."""
+        where, params = self.where(start, end, person, alerts_only)
+        return self.connection().execute(f"SELECT COUNT(*) FROM scans{where}", params).fetchone()[0]
+
+    def summary(self, start=None, end=None, person=None):
+        """
+        Get aggregates over the logged scans matching a filter.
+
+        Returns:
+            dict: Scan and alert counts, value and duration aggregates and
+            the first and last scan times (None when nothing matches)
+        """
+        where, params = self.where(start, end, person)
+        row = self.connection().execute(
+            "SELECT COUNT(*), SUM(alert), SUM(total_value), AVG(total_value), MAX(total_value), "
+            f"AVG(duration), MIN(timestamp), MAX(timestamp) FROM scans{where}", params).fetchone()
+        scans, alerts, total_value, avg_value, max_value, avg_duration, first, last = row
+        return {
+            'scans': scans,
+            'alerts': alerts or 0,
+            'total_value': total_value or 0.0,
+            'avg_value': avg_value or 0.0,
+            'max_value': max_value or 0.0,
+            'avg_duration': avg_duration or 0.0,
+            'first': datetime.fromtimestamp(first) if first is not None else None,
+            'last': datetime.fromtimestamp(last) if last is not None else None
+        }
+
+    def close(self):
+        """Close every connection the store has opened."""
+        with self._lock:
+            connections, self._connections = self._connections, []
+        for connection in connections:
+            connection.close()
+        self._local = threading.local()
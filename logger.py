@@ -1,8 +1,72 @@
 import csv
 from datetime import datetime
 import os
+import queue
+import struct
+import threading
+import time
 from tkinter import messagebox
 import json
+from instrumentation import LatencyHistogram, now_ns
+from log_segments import SegmentManifest, compress_file, open_segment
+
+# Fixed-width index record: byte offset of the JSON line and its timestamp
+INDEX_RECORD = struct.Struct("<Qd")
+
+# Control markers for the background writer queue
+_FLUSH = object()
+_STOP = object()
+
+
+class RunningStats:
+    """
+    Running count, sum, min, max and variance of a stream of numbers.
+    
+    Uses Welford's algorithm, so each update and every query is O(1).
+    
+    Attributes:
+        count (int): Number of values seen
+        total (float): Sum of the values
+        mean (float): Mean of the values
+        minimum (float): Smallest value (None until the first update)
+        maximum (float): Largest value (None until the first update)
+    """
+    
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.mean = 0.0
+        self.minimum = None
+        self.maximum = None
+        self._m2 = 0.0
+
+    def update(self, value):
+        """Add a value to the stream."""
+        self.count += 1
+        self.total += value
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+        if self.minimum is None or value < self.minimum:
+            self.minimum = value
+        if self.maximum is None or value > self.maximum:
+            self.maximum = value
+
+    @property
+    def variance(self):
+        """Population variance of the values."""
+        return self._m2 / self.count if self.count > 0 else 0.0
+
+    def get_summary(self):
+        """Get the aggregates as a dict."""
+        return {
+            'count': self.count,
+            'total': self.total,
+            'mean': self.mean,
+            'min': self.minimum,
+            'max': self.maximum,
+            'variance': self.variance
+        }
 
 class SystemLogger:
     """
@@ -10,15 +74,73 @@ class SystemLogger:
     
     Attributes:
         log_file (str): Path to the CSV log file
-        json_log_file (str): Path to the JSON log file
-        log_entries (list): In-memory log entries
+        json_log_file (str): Path to the append-only JSON Lines log file
+        index_file (str): Optional path to a compact binary index of the JSON Lines log
+        log_entries (list): In-memory log entries (numeric fields, formatted on output)
+        alert_count (int): Number of logged scans that raised an alert
+        value_stats (RunningStats): Running aggregates of basket values
+        duration_stats (RunningStats): Running aggregates of visit durations
+        async_writes (bool): Whether scans are written by a background thread
+        batch_size (int): Records per batch before the writer flushes
+        flush_interval (float): Seconds the writer waits to fill a batch
+        max_queue_size (int): Bound on records waiting to be written; scans
+            logged while it is full stay in memory but are dropped from the
+            files and counted under 'dropped' in get_writer_stats()
+        write_latency (LatencyHistogram): Time taken by each batch written to disk
+        store (SQLiteLogStore): Optional queryable store every scan is also written to
+        max_bytes (int): Size at which the log files are rotated (None to never rotate on size)
+        rotate_daily (bool): Whether to rotate the log files when the day changes
+        compress_segments (bool): Whether closed segments are gzipped in the background
+        manifest (SegmentManifest): Time ranges and files of the closed segments
+        active_segment (dict): First and last timestamps and entry count of the open segment
     """
     
-    def __init__(self, log_file="alerts.csv", json_log_file="alerts.json"):
+    def __init__(self, log_file="alerts.csv", json_log_file="alerts.jsonl", index_file=None,
+                 async_writes=False, batch_size=100, flush_interval=0.5, max_queue_size=10000,
+                 store=None, max_bytes=None, rotate_daily=False, compress_segments=True,
+                 manifest_file=None):
         self.log_file = log_file
         self.json_log_file = json_log_file
+        self.index_file = index_file
         self.log_entries = []
+        self.alert_count = 0
+        self.value_stats = RunningStats()
+        self.duration_stats = RunningStats()
+        self.async_writes = async_writes
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.writer_stats = {
+            'batches_written': 0,
+            'records_written': 0,
+            'last_write_latency': 0.0,
+            'errors': 0,
+            'dropped': 0
+        }
+        self.write_latency = LatencyHistogram()
+        self.store = store
+        self.max_bytes = max_bytes
+        self.rotate_daily = rotate_daily
+        self.compress_segments = compress_segments
+        if manifest_file is None:
+            manifest_file = os.path.splitext(log_file)[0] + ".manifest.json"
+        self.manifest = SegmentManifest(manifest_file)
+        self._compressors = []
+        self._writer_error = None
+        self._queue = None
+        self._writer = None
+        self._closed = False
+        self._write_lock = threading.Lock()
         self.initialize_log_files()
+        self.active_segment = self.scan_active_segment()
+        
+        if async_writes:
+            self._queue = queue.Queue(maxsize=max_queue_size)
+            self._writer = threading.Thread(
+                target=self._writer_loop,
+                name="SystemLoggerWriter",
+                daemon=True
+            )
+            self._writer.start()
         
     def initialize_log_files(self):
         """Initialize log files with headers."""
@@ -37,10 +159,13 @@ class SystemLogger:
                         'Duration'
                     ])
             
-            # Initialize JSON log
+            # Initialize JSON Lines log
             if not os.path.exists(self.json_log_file):
-                with open(self.json_log_file, 'w') as file:
-                    json.dump([], file)
+                open(self.json_log_file, 'wb').close()
+            
+            # Initialize (or rebuild) the index
+            if self.index_file and not os.path.exists(self.index_file):
+                self.rebuild_index()
         except Exception as e:
             messagebox.showerror("Logging Error", f"Error initializing log files: {str(e)}")
 
@@ -48,13 +173,16 @@ class SystemLogger:
         """
         Log a gate scanning event.
         
+        Safe to call from worker threads: it never blocks on a full queue
+        and never opens a dialog. A failure is kept for report_errors(),
+        which flush() and close() call on the caller's (UI) thread.
+        
         Args:
             person (Person): The person being scanned
             alert_triggered (bool): Whether an alert was triggered
         """
         try:
             timestamp = datetime.now()
-            items_list = ', '.join([f"{item.name} (${item.price:.2f})" for item in person.items])
             total_value = person.calculate_total()
             duration = (timestamp - person.entry_time).total_seconds()
             
@@ -62,36 +190,509 @@ class SystemLogger:
             entry = {
                 'timestamp': timestamp.strftime("%Y-%m-%d %H:%M:%S"),
                 'person': person.name,
-                'items': items_list,
-                'alert': "Yes" if alert_triggered else "No",
-                'details': "Undeactivated tags detected" if alert_triggered else "All tags deactivated",
-                'total_value': f"${total_value:.2f}",
-                'duration': f"{duration:.1f}s"
+                'items': [[item.name, item.price] for item in person.items],
+                'alert': alert_triggered,
+                'total_value': total_value,
+                'duration': duration
             }
             
-            # Add to in-memory log
+            # Add to in-memory log and running aggregates
             self.log_entries.append(entry)
+            if alert_triggered:
+                self.alert_count += 1
+            self.value_stats.update(total_value)
+            self.duration_stats.update(duration)
+            
+            # Hand off to the writer thread, or write straight away (also
+            # once the logger is closed and the writer has stopped)
+            record = (entry, timestamp.timestamp())
+            if self._queue is not None and not self._closed:
+                try:
+                    self._queue.put_nowait(record)
+                except queue.Full:
+                    self.writer_stats['dropped'] += 1
+            else:
+                self.write_records([record])
+        except Exception as e:
+            self.writer_stats['errors'] += 1
+            self._writer_error = e
+
+    def write_records(self, records):
+        """
+        Write a batch of log records to the CSV and JSON Lines logs, and
+        to the store if there is one.
+        
+        Args:
+            records (list): (entry, epoch timestamp) pairs to write
+        """
+        # Scans logged after close() are written on the caller's thread and
+        # must not interleave with a batch the writer is still finishing
+        with self._write_lock:
+            write_start = now_ns()
+            
+            for part in self.split_by_day(records) if self.rotate_daily else (records,):
+                if self.should_rotate(part[0][0]):
+                    self.rotate()
+            
+                # Write to CSV
+                with open(self.log_file, 'a', newline='') as file:
+                    writer = csv.writer(file)
+                    writer.writerows(self.format_csv_row(entry) for entry, _ in part)
+            
+                # Append to JSON Lines log
+                self.append_json_entries(part)
+                self.track_active_segment(part)
+            
+            # Insert into the store in one transaction
+            if self.store is not None:
+                self.store.write(records)
+            
+            latency = now_ns() - write_start
+            self.write_latency.record(latency)
+            self.writer_stats['batches_written'] += 1
+            self.writer_stats['records_written'] += len(records)
+            self.writer_stats['last_write_latency'] = latency / 1e9
+
+    @staticmethod
+    def split_by_day(records):
+        """Split a batch of records into runs logged on the same day."""
+        parts = []
+        day = None
+        for record in records:
+            if record[0]['timestamp'][:10] != day:
+                day = record[0]['timestamp'][:10]
+                parts.append([])
+            parts[-1].append(record)
+        return parts
+
+    def scan_active_segment(self):
+        """Read the time range and entry count of the open JSON Lines log."""
+        segment = {'start': None, 'end': None, 'entries': 0}
+        first = last = None
+        with open(self.json_log_file, 'rb') as file:
+            for line in file:
+                if line.strip():
+                    if first is None:
+                        first = line
+                    last = line
+                    segment['entries'] += 1
+        if first is not None:
+            segment['start'] = json.loads(first)['timestamp']
+            segment['end'] = json.loads(last)['timestamp']
+        return segment
+
+    def track_active_segment(self, records):
+        """Widen the open segment's time range to cover newly written records."""
+        segment = self.active_segment
+        for entry, _ in records:
+            timestamp = entry['timestamp']
+            if segment['start'] is None or timestamp < segment['start']:
+                segment['start'] = timestamp
+            if segment['end'] is None or timestamp > segment['end']:
+                segment['end'] = timestamp
+        segment['entries'] += len(records)
+
+    def should_rotate(self, entry):
+        """Whether the open segment must be closed before ``entry`` is written."""
+        if self.active_segment['entries'] == 0:
+            return False
+        if self.rotate_daily and entry['timestamp'][:10] != self.active_segment['start'][:10]:
+            return True
+        if self.max_bytes is not None:
+            size = max(os.path.getsize(self.log_file), os.path.getsize(self.json_log_file))
+            return size >= self.max_bytes
+        return False
+
+    def rotate(self):
+        """
+        Close the open segment and start new log files.
+        
+        The CSV and JSON Lines logs are renamed with the segment's sequence
+        number, recorded in the manifest and, if enabled, gzipped by a
+        background thread. The index only covers the open segment, so it
+        starts again empty.
+        """
+        if self.active_segment['entries'] == 0:
+            return
+        sequence = self.manifest.next_sequence()
+        segment = dict(self.active_segment, sequence=sequence, compressed=False)
+        for key, path in (('csv', self.log_file), ('jsonl', self.json_log_file)):
+            root, extension = os.path.splitext(path)
+            segment_path = f"{root}.{sequence:06d}{extension}"
+            os.replace(path, segment_path)
+            segment[key] = os.path.relpath(segment_path, self.manifest.directory)
+        if self.index_file and os.path.exists(self.index_file):
+            os.remove(self.index_file)
+        self.manifest.add(segment)
+        self.active_segment = {'start': None, 'end': None, 'entries': 0}
+        self.initialize_log_files()
+        
+        if self.compress_segments:
+            compressor = threading.Thread(
+                target=self._compress_segment,
+                args=(segment,),
+                name="SystemLoggerCompressor",
+                daemon=True
+            )
+            self._compressors = [thread for thread in self._compressors if thread.is_alive()]
+            self._compressors.append(compressor)
+            compressor.start()
+
+    def _compress_segment(self, segment):
+        """Gzip a closed segment's files and record it in the manifest (compressor thread)."""
+        try:
+            names = {key: os.path.relpath(compress_file(self.manifest.resolve(segment[key])),
+                                          self.manifest.directory)
+                     for key in ('csv', 'jsonl')}
+            self.manifest.update(segment['sequence'], compressed=True, **names)
+        except Exception as e:
+            self.writer_stats['errors'] += 1
+            self._writer_error = e
+
+    def wait_for_compression(self):
+        """Block until every closed segment has been compressed."""
+        for compressor in self._compressors:
+            compressor.join()
+        self._compressors = []
+        self.report_errors()
+
+    @staticmethod
+    def format_csv_row(entry):
+        """Render a log entry as a CSV row of display strings."""
+        return [
+            entry['timestamp'],
+            entry['person'],
+            ', '.join(f"{name} (${price:.2f})" for name, price in entry['items']),
+            "Yes" if entry['alert'] else "No",
+            "Undeactivated tags detected" if entry['alert'] else "All tags deactivated",
+            f"${entry['total_value']:.2f}",
+            f"{entry['duration']:.1f}s"
+        ]
+
+    def _writer_loop(self):
+        """Drain the queue in batches until asked to stop (writer thread)."""
+        running = True
+        while running:
+            batch = []
+            markers = 0
+            record = self._queue.get()
+            deadline = time.monotonic() + self.flush_interval
+            
+            # Collect records until the batch is full, the interval
+            # expires, or a flush/stop marker arrives
+            while True:
+                if record is _STOP:
+                    running = False
+                    markers += 1
+                    break
+                if record is _FLUSH:
+                    markers += 1
+                    break
+                batch.append(record)
+                if len(batch) >= self.batch_size:
+                    break
+                try:
+                    record = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    break
+            
+            if batch:
+                try:
+                    self.write_records(batch)
+                except Exception as e:
+                    self.writer_stats['errors'] += 1
+                    self._writer_error = e
+            
+            for _ in range(len(batch) + markers):
+                self._queue.task_done()
+
+    def flush(self):
+        """Block until every queued scan has been written to disk."""
+        if self._queue is not None and self._writer.is_alive():
+            self._queue.put(_FLUSH)
+            self._queue.join()
+        self.report_errors()
+
+    def close(self):
+        """
+        Flush pending scans, stop the background writer and close the store.
+        
+        Scans logged after this are written synchronously. History spills
+        are not the logger's; the application writes them out once on
+        shutdown with history.close_all().
+        """
+        self._closed = True
+        if self._queue is not None and self._writer.is_alive():
+            self._queue.put(_STOP)
+            self._queue.join()
+            self._writer.join()
+        self.wait_for_compression()
+        if self.store is not None:
+            self.store.close()
+        self.report_errors()
+
+    def report_errors(self):
+        """Show the last error raised while logging or writing (UI thread only)."""
+        if self._writer_error is not None:
+            error, self._writer_error = self._writer_error, None
+            messagebox.showerror("Logging Error", f"Error writing logs: {str(error)}")
+
+    def get_writer_stats(self):
+        """
+        Get background writer statistics.
+        
+        Returns:
+            dict: Queue depth, batch counts, errors, scans dropped on a
+            full queue and write latencies in seconds, with the latency
+            percentiles under 'write_latency'
+        """
+        latency = self.write_latency.get_stats()
+        return {
+            'async_writes': self.async_writes,
+            'queue_depth': self._queue.qsize() if self._queue is not None else 0,
+            'batches_written': self.writer_stats['batches_written'],
+            'records_written': self.writer_stats['records_written'],
+            'last_write_latency': self.writer_stats['last_write_latency'],
+            'avg_write_latency': latency['mean'],
+            'max_write_latency': latency['max'],
+            'write_latency': latency,
+            'errors': self.writer_stats['errors'],
+            'dropped': self.writer_stats['dropped']
+        }
+
+    def append_json_entries(self, records):
+        """
+        Append entries to the JSON Lines log with a single write.
+        
+        Args:
+            records (list): (entry, epoch timestamp) pairs to append
+        """
+        lines = []
+        index = []
+        with open(self.json_log_file, 'ab') as file:
+            offset = file.tell()
+            for entry, epoch in records:
+                line = json.dumps(entry, separators=(',', ':')).encode('utf-8') + b'\n'
+                lines.append(line)
+                index.append(INDEX_RECORD.pack(offset, epoch))
+                offset += len(line)
+            file.write(b''.join(lines))
+        
+        if self.index_file:
+            with open(self.index_file, 'ab') as file:
+                file.write(b''.join(index))
+
+    def rebuild_index(self):
+        """Rebuild the index file from the JSON Lines log."""
+        with open(self.json_log_file, 'rb') as log, open(self.index_file, 'wb') as index:
+            offset = 0
+            for line in log:
+                if line.strip():
+                    entry = json.loads(line)
+                    epoch = datetime.strptime(entry['timestamp'], "%Y-%m-%d %H:%M:%S").timestamp()
+                    index.write(INDEX_RECORD.pack(offset, epoch))
+                offset += len(line)
+
+    def get_entry_count(self):
+        """
+        Get the number of entries in the JSON Lines log, closed segments included.
+        
+        Closed segments are counted from the manifest without opening them,
+        and the open segment in O(1) with an index.
+        """
+        self.flush()
+        closed = sum(segment['entries'] for segment in self.manifest.segments())
+        if self.index_file and os.path.exists(self.index_file):
+            return closed + os.path.getsize(self.index_file) // INDEX_RECORD.size
+        with open(self.json_log_file, 'rb') as file:
+            return closed + sum(1 for line in file if line.strip())
+
+    def read_json_entries(self, start=0, stop=None):
+        """
+        Read entries from the JSON Lines log, closed segments included.
+        
+        Closed segments wholly outside ``[start, stop)`` are skipped using
+        the entry counts in the manifest. With an index file the read seeks
+        straight to entry ``start`` of the open segment instead of scanning
+        it from the beginning.
+        
+        Args:
+            start (int): Index of the first entry to read
+            stop (int): Index one past the last entry to read (None for all)
             
-            # Write to CSV
-            with open(self.log_file, 'a', newline='') as file:
-                writer = csv.writer(file)
-                writer.writerow([
-                    entry['timestamp'],
-                    entry['person'],
-                    entry['items'],
-                    entry['alert'],
-                    entry['details'],
-                    entry['total_value'],
-                    entry['duration']
-                ])
-            
-            # Update JSON log
-            with open(self.json_log_file, 'w') as file:
-                json.dump(self.log_entries, file, indent=2)
+        Returns:
+            list: The decoded log entries
+        """
+        self.flush()
+        entries = []
+        position = 0
+        for segment in self.manifest.segments():
+            if stop is not None and position >= stop:
+                return entries
+            if position + segment['entries'] > start:
+                with open_segment(self.manifest.resolve(segment['jsonl'])) as file:
+                    entries.extend(self._read_lines(file, position, start, stop))
+            position += segment['entries']
+        
+        with open(self.json_log_file, 'rb') as file:
+            if self.index_file and os.path.exists(self.index_file) and start > position:
+                with open(self.index_file, 'rb') as index:
+                    index.seek((start - position) * INDEX_RECORD.size)
+                    record = index.read(INDEX_RECORD.size)
+                if len(record) < INDEX_RECORD.size:
+                    return entries
+                file.seek(INDEX_RECORD.unpack(record)[0])
+                position = start
+            entries.extend(self._read_lines(file, position, start, stop))
+        return entries
+
+    @staticmethod
+    def _read_lines(file, position, start, stop):
+        """Decode the entries numbered ``[start, stop)`` from a file whose next entry is ``position``."""
+        entries = []
+        for line in file:
+            if stop is not None and position >= stop:
+                break
+            if not line.strip():
+                continue
+            if position >= start:
+                entries.append(json.loads(line))
+            position += 1
+        return entries
+
+    def iter_entries(self, start=None, end=None):
+        """
+        Iterate over logged entries with timestamps in ``[start, end)``.
+        
+        Only the segments whose time range in the manifest overlaps the
+        window are opened, compressed or not.
+        
+        Args:
+            start (datetime): Earliest scan time (inclusive)
+            end (datetime): Latest scan time (exclusive)
+            
+        Yields:
+            dict: The decoded log entries, oldest segment first
+        """
+        self.flush()
+        start = start.strftime("%Y-%m-%d %H:%M:%S") if start is not None else None
+        end = end.strftime("%Y-%m-%d %H:%M:%S") if end is not None else None
+        paths = [self.manifest.resolve(segment['jsonl'])
+                 for segment in self.manifest.overlapping(start, end)]
+        active = self.active_segment
+        if active['entries'] and ((end is None or active['start'] < end)
+                                  and (start is None or active['end'] >= start)):
+            paths.append(self.json_log_file)
+        
+        for path in paths:
+            with open_segment(path) as file:
+                for line in file:
+                    if not line.strip():
+                        continue
+                    entry = json.loads(line)
+                    if ((start is None or entry['timestamp'] >= start)
+                            and (end is None or entry['timestamp'] < end)):
+                        yield entry
+
+    def query_scans(self, start=None, end=None, person=None, alerts_only=False, limit=None):
+        """
+        Get logged scans matching a filter, oldest first.
+        
+        Uses the store's indexes when there is one; otherwise the log
+        segments overlapping the time window are read.
+        
+        Args:
+            start (datetime): Earliest scan time (inclusive)
+            end (datetime): Latest scan time (exclusive)
+            person (str): Only scans of this person
+            alerts_only (bool): Only scans that raised an alert
+            limit (int): Most scans to return
+            
+        Returns:
+            list: The matching log entries
+        """
+        self.flush()
+        if self.store is not None:
+            return self.store.query(start, end, person, alerts_only, limit)
+        
+        entries = []
+        for entry in self.iter_entries(start, end):
+            if limit is not None and len(entries) >= limit:
+                break
+            if (person is None or entry['person'] == person) and (entry['alert'] or not alerts_only):
+                entries.append(entry)
+        return entries
+
+    def summarize_scans(self, start=None, end=None):
+        """
+        Get aggregates over the logged scans in ``[start, end)``.
+        
+        Aggregated by the store when there is one, otherwise from the log
+        segments overlapping the window.
+        
+        Returns:
+            dict: Scan and alert counts, value and duration aggregates and
+            the first and last scan times (None when nothing matches)
+        """
+        self.flush()
+        if self.store is not None:
+            return self.store.summary(start, end)
+        
+        values = RunningStats()
+        durations = RunningStats()
+        alerts = 0
+        first = last = None
+        for entry in self.iter_entries(start, end):
+            values.update(entry['total_value'])
+            durations.update(entry['duration'])
+            alerts += entry['alert']
+            if first is None or entry['timestamp'] < first:
+                first = entry['timestamp']
+            if last is None or entry['timestamp'] > last:
+                last = entry['timestamp']
+        return {
+            'scans': values.count,
+            'alerts': alerts,
+            'total_value': values.total,
+            'avg_value': values.mean,
+            'max_value': values.maximum or 0.0,
+            'avg_duration': durations.mean,
+            'first': datetime.strptime(first, "%Y-%m-%d %H:%M:%S") if first else None,
+            'last': datetime.strptime(last, "%Y-%m-%d %H:%M:%S") if last else None
+        }
+
+    def export_json_array(self, output_file="alerts.json"):
+        """
+        Export the JSON Lines log as a pretty-printed JSON array.
+        
+        Produces the same layout as the old ``alerts.json`` file for tools
+        that still expect it. Closed segments come first, and entries are
+        streamed, so the log is never loaded into memory as a whole.
+        
+        Args:
+            output_file (str): Path of the JSON array file to write
+        """
+        try:
+            self.flush()
+            paths = [self.manifest.resolve(segment['jsonl']) for segment in self.manifest.segments()]
+            paths.append(self.json_log_file)
+            with open(output_file, 'w') as out:
+                first = True
+                for path in paths:
+                    with open_segment(path) as log:
+                        for line in log:
+                            if not line.strip():
+                                continue
+                            entry = json.dumps(json.loads(line), indent=2)
+                            out.write("[\n" if first else ",\n")
+                            out.write("\n".join("  " + part for part in entry.split("\n")))
+                            first = False
+                out.write("[]" if first else "\n]")
         except Exception as e:
-            messagebox.showerror("Logging Error", f"Error logging gate scan: {str(e)}")
+            messagebox.showerror("Export Error", f"Error exporting JSON log: {str(e)}")
 
-    def generate_report(self, person_counter, alert_counter, safe_scan_counter, alert_history):
+    def generate_report(self, person_counter, alert_counter, safe_scan_counter, alert_history,
+                        start=None, end=None):
         """
         Generate a detailed summary report.
         
@@ -100,6 +701,8 @@ class SystemLogger:
             alert_counter (int): Total number of alerts
             safe_scan_counter (int): Total number of safe scans
             alert_history (list): List of people who triggered alerts
+            start (datetime): Start of a window of logged scans to summarize
+            end (datetime): End of that window (exclusive)
         """
         try:
             with open('summary_report.txt', 'w') as f:
@@ -125,15 +728,37 @@ class SystemLogger:
                     f.write("No alerts were triggered during this session.\n\n")
                 
                 # Value Analysis
-                if self.log_entries:
-                    total_value = sum(float(entry['total_value'].replace('$', '')) 
-                                    for entry in self.log_entries)
-                    avg_duration = sum(float(entry['duration'].replace('s', '')) 
-                                     for entry in self.log_entries) / len(self.log_entries)
-                    
+                if self.value_stats.count > 0:
                     f.write("\n=== Value Analysis ===\n")
-                    f.write(f"Total Value Processed: ${total_value:.2f}\n")
-                    f.write(f"Average Processing Time: {avg_duration:.1f}s\n")
+                    f.write(f"Total Value Processed: ${self.value_stats.total:.2f}\n")
+                    f.write(f"Average Basket Value: ${self.value_stats.mean:.2f}\n")
+                    f.write(f"Largest Basket: ${self.value_stats.maximum:.2f}\n")
+                    f.write(f"Average Processing Time: {self.duration_stats.mean:.1f}s\n")
+                
+                # Stored history across every session, aggregated by the store
+                if self.store is not None:
+                    self.flush()
+                    stored = self.store.summary()
+                    if stored['scans'] > 0:
+                        f.write("\n=== Stored Log ===\n")
+                        f.write(f"Scans Stored: {stored['scans']}\n")
+                        f.write(f"Alerts Stored: {stored['alerts']}\n")
+                        f.write(f"First Scan: {stored['first'].strftime('%Y-%m-%d %H:%M:%S')}\n")
+                        f.write(f"Last Scan: {stored['last'].strftime('%Y-%m-%d %H:%M:%S')}\n")
+                        f.write(f"Total Value Stored: ${stored['total_value']:.2f}\n")
+                        f.write(f"Average Basket Value: ${stored['avg_value']:.2f}\n")
+                
+                # Logged scans in the window, reading only the segments it overlaps
+                if start is not None or end is not None:
+                    window = self.summarize_scans(start, end)
+                    since = start.strftime('%Y-%m-%d %H:%M:%S') if start is not None else "the first scan"
+                    until = end.strftime('%Y-%m-%d %H:%M:%S') if end is not None else "now"
+                    f.write("\n=== Logged Scans ===\n")
+                    f.write(f"Window: {since} to {until}\n")
+                    f.write(f"Scans Logged: {window['scans']}\n")
+                    f.write(f"Alerts Logged: {window['alerts']}\n")
+                    f.write(f"Total Value Logged: ${window['total_value']:.2f}\n")
+                    f.write(f"Average Basket Value: ${window['avg_value']:.2f}\n")
             
             messagebox.showinfo(
                 "Report Generated", 
@@ -150,14 +775,22 @@ class SystemLogger:
             dict: Analytics data including trends and patterns
         """
         try:
-            if not self.log_entries:
+            count = self.value_stats.count
+            if count == 0:
                 return None
                 
             analytics = {
-                'total_entries': len(self.log_entries),
-                'alert_rate': sum(1 for entry in self.log_entries if entry['alert'] == 'Yes') / len(self.log_entries),
-                'avg_basket_value': sum(float(entry['total_value'].replace('$', '')) for entry in self.log_entries) / len(self.log_entries),
-                'avg_processing_time': sum(float(entry['duration'].replace('s', '')) for entry in self.log_entries) / len(self.log_entries)
+                'total_entries': count,
+                'alert_rate': self.alert_count / count,
+                'avg_basket_value': self.value_stats.mean,
+                'min_basket_value': self.value_stats.minimum,
+                'max_basket_value': self.value_stats.maximum,
+                'basket_value_variance': self.value_stats.variance,
+                'total_value': self.value_stats.total,
+                'avg_processing_time': self.duration_stats.mean,
+                'min_processing_time': self.duration_stats.minimum,
+                'max_processing_time': self.duration_stats.maximum,
+                'processing_time_variance': self.duration_stats.variance
             }
             
             return analytics
@@ -1,335 +1,939 @@
+import threading
 import time
-  from datetime import datetime
-  
-  class Item:
-      """
-      Represents an item with an RFID tag in the store.
-      
-      Attributes:
-          name (str): The name of the item
-          tag_id (str): Unique RFID tag identifier
-          is_deactivated (bool): Tag deactivation status
-          price (float): Item price
-          category (str): Item category
-          timestamp (datetime): When the item was created
-      """
-      
-      def __init__(self, name, tag_id, price=0.0, category="General", is_deactivated=False):
-          self.name = name
-          self.tag_id = tag_id
-          self.is_deactivated = is_deactivated
-          self.price = price
-          self.category = category
-          self.timestamp = datetime.now()
-          self.scan_history = []
-          self.location = "shelf"
-  
-      def __str__(self):
-          status = "Deactivated" if self.is_deactivated else "Active"
-          return f"{self.name} (Tag: {self.tag_id}, {status}, ${self.price:.2f})"
-  
-      def deactivate(self):
-          """Deactivate the item's RFID tag."""
-          self.is_deactivated = True
-          self.log_scan("deactivation")
-          return f"Tag {self.tag_id} deactivated"
-  
-      def log_scan(self, scan_type):
-          """Log when the item is scanned."""
-          self.scan_history.append({
-              'timestamp': datetime.now(),
-              'type': scan_type,
-              'location': self.location
-          })
-  
-      def update_location(self, new_location):
-          """Update item's location in the store."""
-          self.location = new_location
-          self.log_scan("location_update")
-  
-      def get_scan_history(self):
-          """Get the complete scan history of the item."""
-          return self.scan_history
-  
-      def get_details(self):
-          """Return detailed item information."""
-          return {
-              "name": self.name,
-              "tag_id": self.tag_id,
-              "status": "Deactivated" if self.is_deactivated else "Active",
-              "price": self.price,
-              "category": self.category,
-              "timestamp": self.timestamp,
-              "location": self.location,
-              "scan_count": len(self.scan_history)
-          }
-  
-  
-  class Person:
-      """
-      Represents a customer in the store.
-      
-      Attributes:
-          name (str): Customer name
-          items (list): Items in possession
-          entry_time (datetime): When the customer entered
-          total_spent (float): Total amount spent
-      """
-      
-      def __init__(self, name):
-          self.name = name
-          self.items = []
-          self.entry_time = datetime.now()
-          self.total_spent = 0.0
-          self.visit_history = []
-          self.shopping_path = []
-  
-      def add_item(self, item):
-          """Add an item to the person's possession."""
-          self.items.append(item)
-          item.update_location(f"with_{self.name}")
-          self.shopping_path.append({
-              'action': 'pick_up',
-              'item': item.name,
-              'timestamp': datetime.now()
-          })
-          self.calculate_total()
-          return f"Added {item.name} to {self.name}'s basket"
-  
-      def remove_item(self, item):
-          """Remove an item from the person's possession."""
-          if item in self.items:
-              self.items.remove(item)
-              item.update_location('shelf')
-              self.shopping_path.append({
-                  'action': 'return',
-                  'item': item.name,
-                  'timestamp': datetime.now()
-              })
-              self.calculate_total()
-              return f"Removed {item.name} from {self.name}'s basket"
-          return f"{item.name} not found in {self.name}'s basket"
-  
-      def get_total_items(self):
-          """Get the total number of items."""
-          return len(self.items)
-  
-      def calculate_total(self):
-          """Calculate total price of all items."""
-          self.total_spent = sum(item.price for item in self.items)
-          return self.total_spent
-  
-      def log_visit(self, action, location):
-          """Log customer's movement in the store."""
-          self.visit_history.append({
-              'timestamp': datetime.now(),
-              'action': action,
-              'location': location
-          })
-  
-      def get_shopping_summary(self):
-          """Get a summary of the shopping session."""
-          return {
-              'customer': self.name,
-              'entry_time': self.entry_time,
-              'duration': (datetime.now() - self.entry_time).total_seconds(),
-              'items_picked': len(self.shopping_path),
-              'final_items': len(self.items),
-              'total_spent': self.total_spent,
-              'shopping_path': self.shopping_path
-          }
-  
-      def __str__(self):
-          return f"{self.name} is carrying {len(self.items)} item(s) worth ${self.total_spent:.2f}"
-  
-  
-  class Cashier:
-      """
-      Represents a cashier who can scan and deactivate items.
-      
-      Attributes:
-          name (str): Cashier name
-          items_processed (int): Count of items processed
-          total_sales (float): Total sales amount
-      """
-      
-      def __init__(self, name):
-          self.name = name
-          self.items_processed = 0
-          self.total_sales = 0.0
-          self.transaction_history = []
-          self.shift_start = datetime.now()
-          self.performance_metrics = {
-              'avg_scan_time': 0,
-              'successful_deactivations': 0,
-              'failed_deactivations': 0
-          }
-  
-      def scan_and_deactivate(self, person, callback=None):
-          """
-          Scan and deactivate items one by one.
-          
-          Args:
-              person (Person): The customer being served
-              callback (function): Optional callback for GUI updates
-          """
-          transaction_start = datetime.now()
-          result = f"\n🧾 {self.name} is scanning {person.name}'s items at the checkout...\n"
-          
-          for item in person.items:
-              scan_start = time.time()
-              scan_msg = f" - Scanning {item.name} (${item.price:.2f})... ✅ Tag deactivated.\n"
-              result += scan_msg
-              item.deactivate()
-              scan_time = time.time() - scan_start
-              
-              self.items_processed += 1
-              self.total_sales += item.price
-              self.performance_metrics['avg_scan_time'] = (
-                  (self.performance_metrics['avg_scan_time'] * (self.items_processed - 1) + scan_time)
-                  / self.items_processed
-              )
-              self.performance_metrics['successful_deactivations'] += 1
-              
-              if callback:
-                  callback(scan_msg)
-                  time.sleep(0.5)
-          
-          # Log transaction
-          self.transaction_history.append({
-              'timestamp': transaction_start,
-              'customer': person.name,
-              'items': len(person.items),
-              'total': person.total_spent,
-              'duration': (datetime.now() - transaction_start).total_seconds()
-          })
-          
-          result += f"\nTotal: ${person.total_spent:.2f}\n"
-          return result
-  
-      def get_shift_summary(self):
-          """Get a summary of the cashier's current shift."""
-          return {
-              'cashier': self.name,
-              'shift_start': self.shift_start,
-              'duration': (datetime.now() - self.shift_start).total_seconds(),
-              'items_processed': self.items_processed,
-              'total_sales': self.total_sales,
-              'avg_scan_time': self.performance_metrics['avg_scan_time'],
-              'successful_deactivations': self.performance_metrics['successful_deactivations'],
-              'transaction_count': len(self.transaction_history)
-          }
-  
-      def get_transaction_history(self):
-          """Get the complete transaction history."""
-          return self.transaction_history
-  
-      def get_stats(self):
-          """Get cashier's performance statistics."""
-          return {
-              "name": self.name,
-              "items_processed": self.items_processed,
-              "total_sales": self.total_sales,
-              "performance_metrics": self.performance_metrics
-          }
-  
-  
-  class Gate:
-      """
-      Represents a security gate that can detect active RFID tags.
-      
-      Attributes:
-          total_scans (int): Total number of scans performed
-          alerts_triggered (int): Number of alerts triggered
-      """
-      
-      def __init__(self):
-          self.total_scans = 0
-          self.alerts_triggered = 0
-          self.scan_history = []
-          self.peak_times = {}
-          self.alert_patterns = {}
-  
-      def scan(self, person):
-          """
-          Scan a person for active RFID tags.
-          
-          Args:
-              person (Person): The person to scan
-              
-          Returns:
-              tuple: (scan result message, alert triggered flag)
-          """
-          scan_start = datetime.now()
-          self.total_scans += 1
-          result = f"\n🚪 Scanning {person.name} at the exit gate...\n"
-          alert_triggered = False
-          active_tags = []
-          
-          for item in person.items:
-              result += f" - Checking item: {item}\n"
-              if not item.is_deactivated:
-                  result += f"   🔴 ALERT: Active tag detected on {item.name} (${item.price:.2f})!\n"
-                  alert_triggered = True
-                  active_tags.append(item.tag_id)
-          
-          if alert_triggered:
-              self.alerts_triggered += 1
-              result += f"\n⚠️ Total value of items with active tags: ${person.total_spent:.2f}\n"
-          else:
-              result += "✅ All items are safe. No alert.\n"
-          
-          # Log scan details
-          hour = scan_start.hour
-          self.peak_times[hour] = self.peak_times.get(hour, 0) + 1
-          
-          scan_record = {
-              'timestamp': scan_start,
-              'person': person.name,
-              'items': len(person.items),
-              'alert_triggered': alert_triggered,
-              'active_tags': active_tags,
-              'duration': (datetime.now() - scan_start).total_seconds()
-          }
-          self.scan_history.append(scan_record)
-          
-          # Update alert patterns
-          if alert_triggered:
-              for tag in active_tags:
-                  self.alert_patterns[tag] = self.alert_patterns.get(tag, 0) + 1
-          
-          return result, alert_triggered
-  
-      def get_peak_hours(self):
-          """Get the busiest hours at the gate."""
-          if not self.peak_times:
-              return None
-          return {
-              'busiest_hour': max(self.peak_times.items(), key=lambda x: x[1])[0],
-              'hourly_traffic': dict(sorted(self.peak_times.items()))
-          }
-  
-      def get_alert_patterns(self):
-          """Get patterns in tag alerts."""
-          return {
-              'most_triggered_tags': dict(sorted(self.alert_patterns.items(), 
-                                               key=lambda x: x[1], 
-                                               reverse=True)[:5]),
-              'alert_rate': (self.alerts_triggered / self.total_scans * 100) 
-                           if self.total_scans > 0 else 0
-          }
-  
-      def get_scan_history(self):
-          """Get complete scan history."""
-          return self.scan_history
-  
-      def get_stats(self):
-          """Get gate statistics."""
-          return {
-              "total_scans": self.total_scans,
-              "alerts_triggered": self.alerts_triggered,
-              "alert_rate": (self.alerts_triggered / self.total_scans * 100) 
-                           if self.total_scans > 0 else 0,
-              "peak_hours": self.get_peak_hours(),
-              "alert_patterns": self.get_alert_patterns()
-          }
\ No newline at end of file
+from datetime import datetime
+from history import History
+from instrumentation import LatencyHistogram, now_ns
+from scan_store import ScanStore, EPOCH
+from sketches import SpaceSaving, HyperLogLog, WindowedHyperLogLog
+from timeseries import RollingTimeSeries
+
+class ItemType:
+    """
+    Immutable product data shared by every unit of that product (flyweight).
+    
+    Use ItemType.get() rather than the constructor so that all units of a
+    product point at one instance.
+    
+    Attributes:
+        name (str): The name of the product
+        price (float): Product price
+        category (str): Product category
+    """
+    
+    __slots__ = ('name', 'price', 'category')
+    _cache = {}
+    
+    def __init__(self, name, price=0.0, category="General"):
+        object.__setattr__(self, 'name', name)
+        object.__setattr__(self, 'price', price)
+        object.__setattr__(self, 'category', category)
+
+    def __setattr__(self, attr, value):
+        raise AttributeError("ItemType is immutable")
+
+    def __repr__(self):
+        return f"ItemType({self.name!r}, {self.price!r}, {self.category!r})"
+
+    @classmethod
+    def get(cls, name, price=0.0, category="General"):
+        """Get the shared instance for a product, creating it on first use."""
+        key = (name, price, category)
+        sku = cls._cache.get(key)
+        if sku is None:
+            sku = cls._cache[key] = cls(name, price, category)
+        return sku
+
+
+class Item:
+    """
+    Represents an item with an RFID tag in the store.
+    
+    Product data (name, price, category) lives in a shared ItemType; each
+    unit only stores its own tag state. Scan records are kept in a plain
+    list until the retention limit would evict one, and only then move
+    into a History, so a unit with a few records stays small.
+    
+    Attributes:
+        sku (ItemType): Shared product data
+        name (str): The name of the item
+        tag_id (str): Unique RFID tag identifier
+        is_deactivated (bool): Tag deactivation status
+        price (float): Item price
+        category (str): Item category
+        timestamp (datetime): When the item was created
+        registry (TagRegistry): Registry the tag is indexed in, if any
+        owner (Person): Person currently carrying the item, if any
+        retention (dict): History settings shared by all items (see History)
+    """
+    
+    retention = {'max_items': 20}
+    
+    __slots__ = ('sku', 'tag_id', '_deactivated', 'location', 'created', '_scan_history',
+                 'registry', 'owner')
+    
+    def __init__(self, name, tag_id, price=0.0, category="General", is_deactivated=False):
+        self.sku = ItemType.get(name, price, category)
+        self.tag_id = tag_id
+        self._deactivated = is_deactivated
+        self.location = "shelf"
+        self.created = time.time()
+        self._scan_history = None
+        self.registry = None
+        self.owner = None
+
+    @classmethod
+    def from_sku(cls, sku, tag_id):
+        """Create a new tagged unit of an existing product."""
+        item = cls.__new__(cls)
+        item.sku = sku
+        item.tag_id = tag_id
+        item._deactivated = False
+        item.location = "shelf"
+        item.created = time.time()
+        item._scan_history = None
+        item.registry = None
+        item.owner = None
+        return item
+
+    @property
+    def is_deactivated(self):
+        return self._deactivated
+
+    @is_deactivated.setter
+    def is_deactivated(self, deactivated):
+        deactivated = bool(deactivated)
+        if deactivated != self._deactivated:
+            self._deactivated = deactivated
+            if self.registry is not None:
+                self.registry.tag_state_changed(self)
+            if self.owner is not None:
+                self.owner.tag_state_changed(self)
+
+    @property
+    def name(self):
+        return self.sku.name
+
+    @property
+    def price(self):
+        return self.sku.price
+
+    @price.setter
+    def price(self, price):
+        self.sku = ItemType.get(self.sku.name, price, self.sku.category)
+
+    @property
+    def category(self):
+        return self.sku.category
+
+    @property
+    def timestamp(self):
+        return datetime.fromtimestamp(self.created)
+
+    @property
+    def scan_history(self):
+        if self._scan_history is None:
+            return History()
+        if self._scan_history.__class__ is list:
+            return self._upgrade_history()
+        return self._scan_history
+
+    def _upgrade_history(self):
+        """Move the unit's plain list of records into a History."""
+        history = History(**Item.retention)
+        for record in self._scan_history or ():
+            history.append(record)
+        self._scan_history = history
+        return history
+
+    def __str__(self):
+        status = "Deactivated" if self.is_deactivated else "Active"
+        return f"{self.name} (Tag: {self.tag_id}, {status}, ${self.price:.2f})"
+
+    def deactivate(self, timestamp=None):
+        """Deactivate the item's RFID tag (at ``timestamp``, by default now)."""
+        self.is_deactivated = True
+        self.log_scan("deactivation", timestamp)
+        return f"Tag {self.tag_id} deactivated"
+
+    def log_scan(self, scan_type, timestamp=None):
+        """Log when the item is scanned (simulations pass their virtual time)."""
+        record = {
+            'timestamp': timestamp or datetime.now(),
+            'type': scan_type,
+            'location': self.location
+        }
+        records = self._scan_history
+        if records is None or records.__class__ is list:
+            # A plain list holds the records until retention would evict one
+            retention = Item.retention
+            limit = retention.get('max_items')
+            if len(retention) == 1 and limit is not None and len(records or ()) < limit:
+                if records is None:
+                    self._scan_history = [record]
+                else:
+                    records.append(record)
+                return
+            records = self._upgrade_history()
+        records.append(record)
+
+    def update_location(self, new_location, timestamp=None):
+        """Update item's location in the store."""
+        self.location = new_location
+        self.log_scan("location_update", timestamp)
+
+    def get_scan_history(self):
+        """Get the complete scan history of the item."""
+        return self.scan_history
+
+    def get_details(self):
+        """Return detailed item information."""
+        return {
+            "name": self.name,
+            "tag_id": self.tag_id,
+            "status": "Deactivated" if self.is_deactivated else "Active",
+            "price": self.price,
+            "category": self.category,
+            "timestamp": self.timestamp,
+            "location": self.location,
+            "scan_count": self.scan_history.appended
+        }
+
+
+class TagRegistry:
+    """
+    Index of live RFID tags keyed by tag id.
+    
+    Every operation is a dict access, so lookups and state changes cost the
+    same with ten tags or hundreds of thousands. Items keep a reference to
+    their registry, so deactivating an item through any path keeps the
+    active count exact. Updates take a short lock so lanes and cashiers on
+    different threads can share one registry; lookups are lock-free.
+    
+    Attributes:
+        items (dict): Tag id to registered item
+        active_count (int): Number of registered tags that are still active
+        retired_count (int): Number of tags retired so far
+        prefix (str): Inserted before the serial of new unit tags, so
+            registries in different processes hand out distinct tag ids
+    """
+    
+    def __init__(self, prefix=""):
+        self.prefix = prefix
+        self.items = {}
+        self.active_count = 0
+        self.retired_count = 0
+        self.serial = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.items)
+
+    def __contains__(self, tag_id):
+        return tag_id in self.items
+
+    def register(self, item):
+        """
+        Register an item under its tag id.
+        
+        Raises:
+            ValueError: If the tag id is already registered
+        """
+        with self._lock:
+            if item.tag_id in self.items:
+                raise ValueError(f"Tag {item.tag_id} is already registered")
+            self.items[item.tag_id] = item
+            item.registry = self
+            if not item.is_deactivated:
+                self.active_count += 1
+        return item
+
+    def create_unit(self, template):
+        """
+        Tag and register a new unit of a catalog item.
+        
+        The unit's tag id is the catalog tag id plus a serial number, so
+        every unit gets its own tag.
+        """
+        with self._lock:
+            self.serial += 1
+            item = Item.from_sku(template.sku, f"{template.tag_id}-{self.prefix}{self.serial:06d}")
+            # Same as register(), under the lock already held; new units are active
+            if item.tag_id in self.items:
+                raise ValueError(f"Tag {item.tag_id} is already registered")
+            self.items[item.tag_id] = item
+            item.registry = self
+            self.active_count += 1
+        return item
+
+    def lookup(self, tag_id):
+        """Get the item carrying a tag, or None if the tag is unknown."""
+        return self.items.get(tag_id)
+
+    def get_state(self, tag_id):
+        """Get a tag's state: 'active', 'deactivated' or None if unknown."""
+        item = self.items.get(tag_id)
+        if item is None:
+            return None
+        return "deactivated" if item.is_deactivated else "active"
+
+    def deactivate(self, tag_id):
+        """
+        Deactivate a tag by id.
+        
+        Raises:
+            KeyError: If the tag is not registered
+        """
+        item = self.items[tag_id]
+        if not item.is_deactivated:
+            item.deactivate()
+        return item
+
+    def retire(self, tag_id):
+        """Drop a tag from the index (e.g. once its item has left the store)."""
+        with self._lock:
+            item = self.items.pop(tag_id, None)
+            if item is None:
+                return None
+            if not item.is_deactivated:
+                self.active_count -= 1
+            item.registry = None
+            self.retired_count += 1
+        return item
+
+    def retire_items(self, items):
+        """Drop the tags of several items (e.g. a basket leaving the store) under one lock."""
+        with self._lock:
+            pop = self.items.pop
+            for item in items:
+                item = pop(item.tag_id, None)
+                if item is None:
+                    continue
+                if not item.is_deactivated:
+                    self.active_count -= 1
+                item.registry = None
+                self.retired_count += 1
+
+    def tag_state_changed(self, item):
+        """Keep the active count in step with an item's tag state."""
+        with self._lock:
+            self.active_count += -1 if item.is_deactivated else 1
+
+    def get_stats(self):
+        """Get registry statistics."""
+        return {
+            'registered_tags': len(self.items),
+            'active_tags': self.active_count,
+            'deactivated_tags': len(self.items) - self.active_count,
+            'retired_tags': self.retired_count
+        }
+
+
+class Person:
+    """
+    Represents a customer in the store.
+    
+    Attributes:
+        name (str): Customer name
+        items (list): Items in possession
+        entry_time (datetime): When the customer entered
+        total_spent (float): Total amount spent
+        active_tags (set): Tag ids of carried items whose tags are still active
+        retention (dict): Settings for the visit and shopping path histories (see History)
+    """
+    
+    retention = {'max_items': 500}
+    
+    __slots__ = ('name', 'items', 'entry_time', 'total_spent', 'visit_history',
+                 'shopping_path', 'basket_location', 'active_tags', '_name_hash')
+    
+    def __init__(self, name, retention=None):
+        retention = retention or Person.retention
+        self.name = name
+        self.items = []
+        self.entry_time = datetime.now()
+        self.total_spent = 0.0
+        self.visit_history = History(**retention)
+        self.shopping_path = History(**retention)
+        self.basket_location = f"with_{name}"
+        self.active_tags = set()
+        self._name_hash = None
+
+    @property
+    def name_hash(self):
+        """Sketch hash of the name (see HyperLogLog.hash), computed on first use."""
+        if self._name_hash is None:
+            self._name_hash = HyperLogLog.hash(self.name)
+        return self._name_hash
+
+    def add_item(self, item, timestamp=None):
+        """
+        Add an item to the person's possession.
+        
+        The item's location update and the pick-up on the shopping path
+        are one event and share one timestamp (by default now;
+        simulations pass their virtual time).
+        """
+        timestamp = timestamp or datetime.now()
+        self.items.append(item)
+        item.owner = self
+        if not item.is_deactivated:
+            self.active_tags.add(item.tag_id)
+        item.update_location(self.basket_location, timestamp)
+        self.shopping_path.append({
+            'action': 'pick_up',
+            'item': item.name,
+            'timestamp': timestamp
+        })
+        self.total_spent += item.price
+        return f"Added {item.name} to {self.name}'s basket"
+
+    def remove_item(self, item):
+        """Remove an item from the person's possession."""
+        if item in self.items:
+            self.items.remove(item)
+            item.owner = None
+            self.active_tags.discard(item.tag_id)
+            item.update_location('shelf')
+            self.shopping_path.append({
+                'action': 'return',
+                'item': item.name,
+                'timestamp': datetime.now()
+            })
+            self.calculate_total()
+            return f"Removed {item.name} from {self.name}'s basket"
+        return f"{item.name} not found in {self.name}'s basket"
+
+    def clear_items(self):
+        """Drop every item from the person's possession."""
+        for item in self.items:
+            item.owner = None
+        self.items = []
+        self.active_tags.clear()
+        self.total_spent = 0.0
+
+    def tag_state_changed(self, item):
+        """Keep the active tag set in step with a carried item's tag state."""
+        if item.is_deactivated:
+            self.active_tags.discard(item.tag_id)
+        else:
+            self.active_tags.add(item.tag_id)
+
+    def get_active_tag_count(self):
+        """Get the number of carried items with active tags (O(1))."""
+        return len(self.active_tags)
+
+    def has_active_tags(self):
+        """Whether the person would trigger the gate (O(1))."""
+        return bool(self.active_tags)
+
+    def get_total_items(self):
+        """Get the total number of items."""
+        return len(self.items)
+
+    def calculate_total(self):
+        """Calculate total price of all items."""
+        self.total_spent = sum(item.price for item in self.items)
+        return self.total_spent
+
+    def log_visit(self, action, location):
+        """Log customer's movement in the store."""
+        self.visit_history.append({
+            'timestamp': datetime.now(),
+            'action': action,
+            'location': location
+        })
+
+    def get_shopping_summary(self):
+        """Get a summary of the shopping session."""
+        return {
+            'customer': self.name,
+            'entry_time': self.entry_time,
+            'duration': (datetime.now() - self.entry_time).total_seconds(),
+            'items_picked': self.shopping_path.appended,
+            'final_items': len(self.items),
+            'total_spent': self.total_spent,
+            'shopping_path': self.shopping_path.get_records()
+        }
+
+    def __str__(self):
+        return f"{self.name} is carrying {len(self.items)} item(s) worth ${self.total_spent:.2f}"
+
+
+class CheckoutResult:
+    """
+    Outcome of a checkout, with the receipt text rendered on demand.
+    
+    Attributes:
+        cashier (str): Name of the cashier
+        customer (str): Name of the customer
+        items (tuple): Items scanned, in order
+        scan_times (list): Seconds spent on each item
+        total (float): Basket total
+        duration (float): Seconds the whole transaction took
+        deactivated (int): Number of tags deactivated
+    """
+    
+    __slots__ = ('cashier', 'customer', 'items', 'scan_times', 'total', 'duration',
+                 'deactivated', '_text')
+    
+    def __init__(self, cashier, customer, items, scan_times, total, duration, deactivated):
+        self.cashier = cashier
+        self.customer = customer
+        self.items = items
+        self.scan_times = scan_times
+        self.total = total
+        self.duration = duration
+        self.deactivated = deactivated
+        self._text = None
+
+    @staticmethod
+    def format_item(item):
+        """Render the receipt line for one scanned item."""
+        return f" - Scanning {item.name} (${item.price:.2f})... ✅ Tag deactivated.\n"
+
+    @property
+    def text(self):
+        """The receipt text (rendered on first access)."""
+        if self._text is None:
+            parts = [f"\n🧾 {self.cashier} is scanning {self.customer}'s items at the checkout...\n"]
+            parts.extend(self.format_item(item) for item in self.items)
+            parts.append(f"\nTotal: ${self.total:.2f}\n")
+            self._text = "".join(parts)
+        return self._text
+
+    def __str__(self):
+        return self.text
+
+
+class GateScanResult:
+    """
+    Outcome of a gate scan, with the report text rendered on demand.
+    
+    Attributes:
+        person (str): Name of the scanned person
+        alert_triggered (bool): Whether an active tag was detected
+        items (tuple): Items carried (only kept when an alert fires)
+        active_tags (list): Tag ids that were still active
+        total_value (float): Value of the basket
+        timestamp (datetime): Time of the scan
+        duration (float): Seconds the scan took
+    """
+    
+    __slots__ = ('person', 'alert_triggered', 'items', 'active_tags', 'total_value',
+                 'timestamp', 'duration', '_text')
+    
+    def __init__(self, person, alert_triggered, items, active_tags, total_value,
+                 timestamp, duration):
+        self.person = person
+        self.alert_triggered = alert_triggered
+        self.items = items
+        self.active_tags = active_tags
+        self.total_value = total_value
+        self.timestamp = timestamp
+        self.duration = duration
+        self._text = None
+
+    @property
+    def text(self):
+        """The gate report text (rendered on first access)."""
+        if self._text is None:
+            parts = [f"\n🚪 Scanning {self.person} at the exit gate...\n"]
+            if self.alert_triggered:
+                active = set(self.active_tags)
+                for item in self.items:
+                    parts.append(f" - Checking item: {item}\n")
+                    if item.tag_id in active:
+                        parts.append(f"   🔴 ALERT: Active tag detected on {item.name} (${item.price:.2f})!\n")
+                parts.append(f"\n⚠️ Total value of items with active tags: ${self.total_value:.2f}\n")
+            else:
+                parts.append("✅ All items are safe. No alert.\n")
+            self._text = "".join(parts)
+        return self._text
+
+    def __str__(self):
+        return self.text
+
+
+class Cashier:
+    """
+    Represents a cashier who can scan and deactivate items.
+    
+    Attributes:
+        name (str): Cashier name
+        items_processed (int): Count of items processed
+        total_sales (float): Total sales amount
+        registry (TagRegistry): Optional tag index for deactivating tags by id
+        retention (dict): Settings for the transaction history (see History)
+        scan_latency (LatencyHistogram): Time taken by each item scan
+        transaction_latency (LatencyHistogram): Time taken by each whole transaction
+        unique_customers (WindowedHyperLogLog): Distinct customers served per hour and day
+    """
+    
+    retention = {'max_items': 10000}
+    
+    def __init__(self, name, registry=None, retention=None):
+        self.name = name
+        self.registry = registry
+        self.items_processed = 0
+        self.total_sales = 0.0
+        self.transaction_history = History(**(retention or Cashier.retention))
+        self.shift_start = datetime.now()
+        self.scan_latency = LatencyHistogram()
+        self.transaction_latency = LatencyHistogram()
+        self.unique_customers = WindowedHyperLogLog()
+        self.performance_metrics = {
+            'successful_deactivations': 0,
+            'failed_deactivations': 0
+        }
+
+    def scan_and_deactivate(self, person, callback=None, timestamp=None):
+        """
+        Scan and deactivate items one by one.
+        
+        Args:
+            person (Person): The customer being served
+            callback (function): Optional callback for GUI updates
+            timestamp (datetime): Time of the transaction (defaults to now;
+                simulations pass virtual time)
+            
+        Returns:
+            CheckoutResult: Items, totals and timings of the transaction
+        """
+        transaction_start = timestamp or datetime.now()
+        transaction_clock = now_ns()
+        items = tuple(person.items)
+        scan_times = []
+        
+        for item in items:
+            scan_times.append(self.scan_item(item, transaction_start))
+            
+            if callback:
+                callback(CheckoutResult.format_item(item))
+        
+        duration = (now_ns() - transaction_clock) / 1e9
+        return self.complete_transaction(person, items, scan_times, transaction_start, duration)
+
+    def scan_item(self, item, timestamp=None):
+        """
+        Scan and deactivate a single item.
+        
+        Args:
+            item (Item): The item being scanned
+            timestamp (datetime): Time of the scan (defaults to now)
+            
+        Returns:
+            float: Time the scan took in seconds
+        """
+        scan_start = now_ns()
+        item.deactivate(timestamp)
+        scan_time = now_ns() - scan_start
+        self.scan_latency.record(scan_time)
+        
+        self.items_processed += 1
+        self.total_sales += item.price
+        self.performance_metrics['successful_deactivations'] += 1
+        return scan_time / 1e9
+
+    def complete_transaction(self, person, items, scan_times, transaction_start, duration):
+        """
+        Log a finished transaction whose items were scanned with scan_item().
+        
+        Args:
+            person (Person): The customer served
+            items (tuple): The items scanned
+            scan_times (list): Scan time of each item in seconds
+            transaction_start (datetime): When the transaction started
+            duration (float): Transaction time in seconds
+            
+        Returns:
+            CheckoutResult: Items, totals and timings of the transaction
+        """
+        self.transaction_latency.record(int(duration * 1e9))
+        self.unique_customers.add_hash(person.name_hash, (transaction_start - EPOCH).total_seconds())
+        self.transaction_history.append({
+            'timestamp': transaction_start,
+            'customer': person.name,
+            'items': len(items),
+            'total': person.total_spent,
+            'duration': duration
+        })
+        
+        return CheckoutResult(self.name, person.name, items, scan_times,
+                              person.total_spent, duration, len(items))
+
+    def deactivate_tag(self, tag_id):
+        """
+        Deactivate a single tag by id through the tag registry.
+        
+        Args:
+            tag_id (str): The tag read at the counter
+            
+        Returns:
+            Item: The deactivated item, or None if the tag is unknown
+        """
+        item = self.registry.lookup(tag_id) if self.registry else None
+        if item is None:
+            self.performance_metrics['failed_deactivations'] += 1
+            return None
+        if not item.is_deactivated:
+            item.deactivate()
+            self.performance_metrics['successful_deactivations'] += 1
+        return item
+
+    def get_shift_summary(self):
+        """Get a summary of the cashier's current shift."""
+        return {
+            'cashier': self.name,
+            'shift_start': self.shift_start,
+            'duration': (datetime.now() - self.shift_start).total_seconds(),
+            'items_processed': self.items_processed,
+            'total_sales': self.total_sales,
+            'avg_scan_time': self.scan_latency.mean / 1e9,
+            'successful_deactivations': self.performance_metrics['successful_deactivations'],
+            'transaction_count': self.transaction_history.appended
+        }
+
+    def get_transaction_history(self):
+        """Get the retained transaction history."""
+        return self.transaction_history.get_records()
+
+    def get_stats(self):
+        """Get cashier's performance statistics."""
+        return {
+            "name": self.name,
+            "items_processed": self.items_processed,
+            "total_sales": self.total_sales,
+            "performance_metrics": self.performance_metrics,
+            "scan_latency": self.scan_latency.get_stats(),
+            "transaction_latency": self.transaction_latency.get_stats(),
+            "unique_customers": self.unique_customers.estimate()
+        }
+
+
+class Gate:
+    """
+    Represents a security gate that can detect active RFID tags.
+    
+    Attributes:
+        total_scans (int): Total number of scans performed
+        alerts_triggered (int): Number of alerts triggered
+        items_scanned (int): Items carried through the gate over its lifetime
+        alerted_value (float): Basket value of every scan that raised an alert
+        scan_history (ScanStore): Columnar record of recent scans
+        registry (TagRegistry): Optional tag index; tags are retired once a person leaves safely
+        retention (dict): Settings for the scan history (see ScanStore)
+        scan_latency (LatencyHistogram): Time taken by each scan
+        traffic (RollingTimeSeries): Scans and alerts per second, minute and hour
+        alert_tags (SpaceSaving): Alert counts of the most frequently alerting tags
+        tag_capacity (int): Most tags whose alert counts are tracked
+        unique_customers (WindowedHyperLogLog): Distinct people scanned per hour and day
+        unique_alert_tags (WindowedHyperLogLog): Distinct alerting tags per hour and day
+        analytics (bool): Whether scans update the traffic series and the alert tag and
+            distinct-count sketches; without them peak hours, recent traffic and
+            distinct counts stay empty
+    """
+    
+    retention = {'max_items': 100000}
+    tag_capacity = 1000
+    
+    def __init__(self, registry=None, retention=None, analytics=True):
+        self.registry = registry
+        self.analytics = analytics
+        self.total_scans = 0
+        self.alerts_triggered = 0
+        self.items_scanned = 0
+        self.alerted_value = 0.0
+        self.scan_history = ScanStore(**(retention or Gate.retention))
+        self.scan_latency = LatencyHistogram()
+        self.traffic = RollingTimeSeries(('scans', 'alerts'))
+        # Scans may run on a worker thread while the UI reads the traffic
+        self._lock = threading.Lock()
+        self.alert_tags = SpaceSaving(self.tag_capacity)
+        self.unique_customers = WindowedHyperLogLog()
+        self.unique_alert_tags = WindowedHyperLogLog()
+
+    @property
+    def peak_times(self):
+        """Scans per hour of day over the hourly traffic window."""
+        return {hour: int(count) for hour, count in enumerate(self.get_hourly_counts())
+                if count > 0}
+
+    @property
+    def alert_patterns(self):
+        """Estimated alerts per tracked tag id, most frequent first."""
+        return self.alert_tags.counts()
+
+    def scan(self, person, timestamp=None):
+        """
+        Scan a person for active RFID tags.
+        
+        Args:
+            person (Person): The person to scan
+            timestamp (datetime): Time of the scan (defaults to now; simulations pass virtual time)
+            
+        Returns:
+            GateScanResult: Alert flag, active tags and timings of the scan
+        """
+        scan_start = timestamp or datetime.now()
+        scan_clock = now_ns()
+        seconds = (scan_start - EPOCH).total_seconds()
+        self.total_scans += 1
+        item_count = len(person.items)
+        self.items_scanned += item_count
+        alert_triggered = person.has_active_tags()
+        items = ()
+        active_tags = []
+        
+        # The decision is O(1); walk the basket only to report an alert
+        if alert_triggered:
+            self.alerts_triggered += 1
+            self.alerted_value += person.total_spent
+            items = tuple(person.items)
+            active_tags = [item.tag_id for item in items if not item.is_deactivated]
+            if self.analytics:
+                for tag_id in active_tags:
+                    self.alert_tags.update(tag_id)
+                    self.unique_alert_tags.add(tag_id, seconds)
+        else:
+            # Paid items have left the store; drop them from the tag index
+            if self.registry is not None:
+                self.registry.retire_items(person.items)
+        
+        # Log scan details
+        if self.analytics:
+            with self._lock:
+                self.traffic.record(seconds, 1, alert_triggered)
+            self.unique_customers.add_hash(person.name_hash, seconds)
+        elapsed = now_ns() - scan_clock
+        self.scan_latency.record(elapsed)
+        duration = elapsed / 1e9
+        self.scan_history.append(
+            scan_start,
+            person.name,
+            item_count,
+            alert_triggered,
+            active_tags,
+            duration,
+            person.total_spent
+        )
+        
+        return GateScanResult(person.name, alert_triggered, items, active_tags,
+                              person.total_spent, scan_start, duration)
+
+    def check_tags(self, tag_ids):
+        """
+        Check tag ids read at the gate against the tag registry.
+        
+        Args:
+            tag_ids (iterable): Tag ids picked up by the gate antenna
+            
+        Returns:
+            list: Registered items whose tags are still active
+        """
+        if self.registry is None:
+            raise ValueError("Gate has no tag registry")
+        lookup = self.registry.lookup
+        active = []
+        for tag_id in tag_ids:
+            item = lookup(tag_id)
+            if item is not None and not item.is_deactivated:
+                active.append(item)
+        return active
+
+    def get_hourly_counts(self):
+        """Get scans per hour of day as a 24-element array, safe against a scanning thread."""
+        with self._lock:
+            return self.traffic.hour_of_day()
+
+    def get_peak_hours(self):
+        """Get the busiest hours at the gate."""
+        hourly = self.get_hourly_counts()
+        if not hourly.any():
+            return None
+        return {
+            'busiest_hour': int(hourly.argmax()),
+            'hourly_traffic': {hour: int(count) for hour, count in enumerate(hourly) if count > 0}
+        }
+
+    def get_recent_traffic(self, minutes=5, now=None):
+        """
+        Get the scans and alerts of the last ``minutes`` minutes.
+        
+        Minutes are counted back from the newest scan, so simulations in
+        virtual time get the same answers as a live gate.
+        
+        Args:
+            minutes (float): Length of the span
+            now (float): End of the span in seconds since EPOCH (defaults to the newest scan)
+        
+        Returns:
+            dict: 'scans' and 'alerts' counts
+        """
+        with self._lock:
+            return self.traffic.last(minutes * 60, now=now)
+
+    def get_unique_counts(self, seconds=None):
+        """
+        Get estimated distinct customers and alerting tags.
+        
+        Args:
+            seconds (float): Only count the last ``seconds`` seconds up to
+                the newest scan, in whole hours or days (None for all time)
+        
+        Returns:
+            dict: 'customers' and 'alert_tags' estimates
+        """
+        if seconds is None:
+            return {
+                'customers': self.unique_customers.estimate(),
+                'alert_tags': self.unique_alert_tags.estimate()
+            }
+        now = self.unique_customers.latest
+        return {
+            'customers': self.unique_customers.count_last(seconds),
+            'alert_tags': self.unique_alert_tags.count_last(seconds, now=now)
+        }
+
+    def get_alert_patterns(self):
+        """
+        Get patterns in tag alerts.
+        
+        Tag counts are estimates that may be too high by at most
+        'error_bound'; with fewer than ``tag_capacity`` distinct alerting
+        tags they are exact and the bound is 0.
+        """
+        return {
+            'most_triggered_tags': {tag: count for tag, count, _ in self.alert_tags.top(5)},
+            'error_bound': self.alert_tags.error_bound,
+            'alert_rate': (self.alerts_triggered / self.total_scans * 100) 
+                         if self.total_scans > 0 else 0
+        }
+
+    def get_scan_history(self):
+        """Get the retained scan history (records are rebuilt as dicts on access)."""
+        return self.scan_history
+
+    def get_stats(self):
+        """
+        Get gate statistics.
+        
+        Top-level figures cover every scan since the gate was created.
+        Figures over the retained scan history only, which may have evicted
+        older scans, are kept apart under 'window'.
+        """
+        return {
+            "total_scans": self.total_scans,
+            "alerts_triggered": self.alerts_triggered,
+            "alert_rate": (self.alerts_triggered / self.total_scans * 100) 
+                         if self.total_scans > 0 else 0,
+            "avg_items_per_scan": (self.items_scanned / self.total_scans)
+                                  if self.total_scans > 0 else 0,
+            "avg_scan_duration": self.scan_latency.mean / 1e9,
+            "alerted_value": self.alerted_value,
+            "window": self.scan_history.summary(),
+            "peak_hours": self.get_peak_hours(),
+            "last_hour": self.get_recent_traffic(60),
+            "alert_patterns": self.get_alert_patterns(),
+            "unique": self.get_unique_counts(),
+            "scan_latency": self.scan_latency.get_stats()
+        }
\ No newline at end of file
@@ -0,0 +1,303 @@
+from datetime import datetime, timedelta
+import json
+import numpy as np
+from history import mark_flushed, mark_unflushed
+
+# Timestamps are stored as seconds since this epoch in local (naive) time,
+# so the hour of day falls out of plain integer arithmetic
+EPOCH = datetime(1970, 1, 1)
+
+
+class ScanStore:
+    """
+    Columnar store of gate scans backed by growable NumPy arrays.
+
+    Each scan is one row across the column arrays. Person names and tag ids
+    are interned to integer ids; the active tags of all scans live in one
+    flat array, with ``tag_offsets`` marking where each scan's tags start.
+
+    With ``max_items`` or ``max_age`` set the store only retains a window
+    of recent scans: expired rows are skipped by advancing ``start`` and
+    are compacted away (and optionally spilled to a JSON Lines file) once
+    the arrays fill up, so appends stay amortized O(1). Rows evicted but
+    not yet spilled are written by close(), or by history.close_all() for
+    every store and history at shutdown.
+
+    Attributes:
+        size (int): Number of scans retained
+        start (int): First retained row
+        end (int): One past the last retained row
+        max_items (int): Most scans retained (None for no limit)
+        max_age (float): Oldest scan age in seconds (None for no limit)
+        spill_file (str): JSON Lines file for evicted scans (None to drop them)
+        evicted (int): Scans evicted so far
+        timestamps (ndarray): Scan times as local seconds since 1970-01-01
+        item_counts (ndarray): Items carried per scan
+        alerts (ndarray): Alert flag per scan
+        durations (ndarray): Scan processing time in seconds
+        values (ndarray): Basket value per scan
+        person_ids (ndarray): Interned person id per scan
+        tag_offsets (ndarray): Start of each scan's tags in ``tag_ids``
+        tag_ids (ndarray): Interned ids of active tags, scan after scan
+    """
+
+    def __init__(self, capacity=1024, max_items=None, max_age=None, spill_file=None):
+        if max_items is not None:
+            capacity = min(capacity, max_items)
+        self.start = 0
+        self.end = 0
+        self.max_items = max_items
+        self.max_age = max_age
+        self.spill_file = spill_file
+        self.evicted = 0
+        self.timestamps = np.empty(capacity, dtype=np.float64)
+        self.item_counts = np.empty(capacity, dtype=np.int32)
+        self.alerts = np.empty(capacity, dtype=np.bool_)
+        self.durations = np.empty(capacity, dtype=np.float64)
+        self.values = np.empty(capacity, dtype=np.float64)
+        self.person_ids = np.empty(capacity, dtype=np.int32)
+        self.tag_offsets = np.zeros(capacity + 1, dtype=np.int64)
+        self.tag_ids = np.empty(capacity, dtype=np.int32)
+        self.person_names = []
+        self.person_index = {}
+        self.tag_names = []
+        self.tag_index = {}
+
+    @property
+    def size(self):
+        return self.end - self.start
+
+    @property
+    def tag_count(self):
+        return int(self.tag_offsets[self.end])
+
+    def __len__(self):
+        return self.end - self.start
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += self.size
+        if not 0 <= index < self.size:
+            raise IndexError("scan index out of range")
+        return self.get_record(self.start + index)
+
+    def __iter__(self):
+        for row in range(self.start, self.end):
+            yield self.get_record(row)
+
+    def intern_person(self, name):
+        """Get the integer id of a person name, assigning one if new."""
+        person_id = self.person_index.get(name)
+        if person_id is None:
+            person_id = self.person_index[name] = len(self.person_names)
+            self.person_names.append(name)
+        return person_id
+
+    def intern_tag(self, tag_id):
+        """Get the integer id of a tag, assigning one if new."""
+        tag = self.tag_index.get(tag_id)
+        if tag is None:
+            tag = self.tag_index[tag_id] = len(self.tag_names)
+            self.tag_names.append(tag_id)
+        return tag
+
+    def grow(self, min_capacity):
+        """Grow the scan columns to hold at least ``min_capacity`` rows."""
+        capacity = max(min_capacity, 2 * len(self.timestamps))
+        for name in ('timestamps', 'item_counts', 'alerts', 'durations', 'values', 'person_ids'):
+            column = getattr(self, name)
+            grown = np.empty(capacity, dtype=column.dtype)
+            grown[:self.end] = column[:self.end]
+            setattr(self, name, grown)
+        offsets = np.zeros(capacity + 1, dtype=np.int64)
+        offsets[:self.end + 1] = self.tag_offsets[:self.end + 1]
+        self.tag_offsets = offsets
+
+    def grow_tags(self, min_capacity):
+        """Grow the flat tag array to hold at least ``min_capacity`` tags."""
+        capacity = max(min_capacity, 2 * len(self.tag_ids))
+        grown = np.empty(capacity, dtype=np.int32)
+        tag_count = self.tag_count
+        grown[:tag_count] = self.tag_ids[:tag_count]
+        self.tag_ids = grown
+
+    def compact(self):
+        """
+        Drop evicted rows from the front of the arrays.
+        
+        Evicted rows are spilled first, and the person and tag tables are
+        re-interned so they only hold names that live rows still use.
+        """
+        start, end = self.start, self.end
+        if start == 0:
+            return
+        self.spill(start)
+        mark_flushed(self)
+        live = end - start
+        tag_start, tag_end = int(self.tag_offsets[start]), int(self.tag_offsets[end])
+
+        for name in ('timestamps', 'item_counts', 'alerts', 'durations', 'values', 'person_ids'):
+            column = getattr(self, name)
+            column[:live] = column[start:end]
+        self.tag_offsets[:live + 1] = self.tag_offsets[start:end + 1] - tag_start
+        self.tag_ids[:tag_end - tag_start] = self.tag_ids[tag_start:tag_end]
+        self.start, self.end = 0, live
+
+        # Re-intern names still referenced by live rows
+        used, self.person_ids[:live] = np.unique(self.person_ids[:live], return_inverse=True)
+        self.person_names = [self.person_names[i] for i in used]
+        self.person_index = {name: i for i, name in enumerate(self.person_names)}
+        used, self.tag_ids[:tag_end - tag_start] = np.unique(
+            self.tag_ids[:tag_end - tag_start], return_inverse=True)
+        self.tag_names = [self.tag_names[i] for i in used]
+        self.tag_index = {tag: i for i, tag in enumerate(self.tag_names)}
+
+    def spill(self, stop):
+        """Write evicted rows ``[0, stop)`` to the spill file, if any."""
+        if self.spill_file is not None and stop > 0:
+            with open(self.spill_file, 'a') as file:
+                file.write("".join(json.dumps(self.get_record(row), default=str) + "\n"
+                                   for row in range(stop)))
+
+    def flush(self):
+        """Compact the store, spilling any evicted rows."""
+        self.compact()
+
+    def close(self):
+        """Spill any evicted rows so none are lost at shutdown."""
+        self.flush()
+
+    def append(self, timestamp, person, items, alert_triggered, active_tags, duration, value):
+        """
+        Append a scan.
+
+        Args:
+            timestamp (datetime): When the scan happened
+            person (str): Name of the scanned person
+            items (int): Number of items carried
+            alert_triggered (bool): Whether the scan raised an alert
+            active_tags (list): Ids of the active tags detected
+            duration (float): Scan processing time in seconds
+            value (float): Basket value
+        """
+        row = self.end
+        if row == len(self.timestamps):
+            # Reclaim evicted rows when they make up at least half the arrays
+            if self.start * 2 >= row:
+                self.compact()
+                row = self.end
+            if row == len(self.timestamps):
+                self.grow(row + 1)
+
+        seconds = (timestamp - EPOCH).total_seconds()
+        self.timestamps[row] = seconds
+        self.item_counts[row] = items
+        self.alerts[row] = alert_triggered
+        self.durations[row] = duration
+        self.values[row] = value
+        self.person_ids[row] = self.intern_person(person)
+
+        tag_count = int(self.tag_offsets[row])
+        if active_tags:
+            tag_end = tag_count + len(active_tags)
+            if tag_end > len(self.tag_ids):
+                self.grow_tags(tag_end)
+            self.tag_ids[tag_count:tag_end] = [self.intern_tag(tag) for tag in active_tags]
+            tag_count = tag_end
+        self.tag_offsets[row + 1] = tag_count
+        self.end = row + 1
+
+        # Evict rows that fall outside the retention window
+        first = self.start
+        if self.max_items is not None and self.end - self.start > self.max_items:
+            self.start = self.end - self.max_items
+            self.evicted += 1
+        if self.max_age is not None:
+            cutoff = seconds - self.max_age
+            while self.timestamps[self.start] < cutoff:
+                self.start += 1
+                self.evicted += 1
+        if first == 0 and self.start and self.spill_file is not None:
+            mark_unflushed(self)
+
+    def get_record(self, index):
+        """Rebuild a scan record dict for row ``index``."""
+        start, end = self.tag_offsets[index], self.tag_offsets[index + 1]
+        return {
+            'timestamp': EPOCH + timedelta(seconds=float(self.timestamps[index])),
+            'person': self.person_names[self.person_ids[index]],
+            'items': int(self.item_counts[index]),
+            'alert_triggered': bool(self.alerts[index]),
+            'active_tags': [self.tag_names[tag] for tag in self.tag_ids[start:end]],
+            'duration': float(self.durations[index]),
+            'value': float(self.values[index])
+        }
+
+    def hourly_counts(self):
+        """Get the number of scans per hour of day as a 24-element array."""
+        hours = (self.timestamps[self.start:self.end] // 3600 % 24).astype(np.int64)
+        return np.bincount(hours, minlength=24)
+
+    def tag_counts(self):
+        """Get the number of alerts per interned tag id."""
+        tags = self.tag_ids[self.tag_offsets[self.start]:self.tag_offsets[self.end]]
+        return np.bincount(tags, minlength=len(self.tag_names))
+
+    def top_tags(self, k=5):
+        """
+        Get the most frequently alerting tags.
+
+        Ties are broken by first appearance.
+
+        Returns:
+            dict: Up to ``k`` tag ids mapped to their alert counts
+        """
+        counts = self.tag_counts()
+        order = np.argsort(-counts, kind='stable')[:k]
+        return {self.tag_names[tag]: int(counts[tag]) for tag in order if counts[tag] > 0}
+
+    def summary(self):
+        """
+        Get aggregate statistics over all stored scans.
+
+        Returns:
+            dict: Scan and alert counts plus item, duration and value aggregates
+        """
+        if self.size == 0:
+            return {
+                'scans': 0,
+                'alerts': 0,
+                'avg_items': 0,
+                'avg_duration': 0,
+                'total_value': 0,
+                'alerted_value': 0
+            }
+        live = slice(self.start, self.end)
+        alerts = self.alerts[live]
+        values = self.values[live]
+        return {
+            'scans': self.size,
+            'alerts': int(np.count_nonzero(alerts)),
+            'avg_items': float(self.item_counts[live].mean()),
+            'avg_duration': float(self.durations[live].mean()),
+            'total_value': float(values.sum()),
+            'alerted_value': float(values[alerts].sum())
+        }
+
+
+def merge_summaries(summaries):
+    """Merge ScanStore.summary() results into the summary of all their scans."""
+    summaries = list(summaries)
+    scans = sum(summary['scans'] for summary in summaries)
+    merged = {
+        'scans': scans,
+        'alerts': sum(summary['alerts'] for summary in summaries),
+        'avg_items': 0,
+        'avg_duration': 0,
+        'total_value': sum(summary['total_value'] for summary in summaries),
+        'alerted_value': sum(summary['alerted_value'] for summary in summaries)
+    }
+    if scans:
+        for key in ('avg_items', 'avg_duration'):
+            merged[key] = sum(summary[key] * summary['scans'] for summary in summaries) / scans
+    return merged
@@ -0,0 +1,370 @@
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+import numpy as np
+from instrumentation import LatencyHistogram, merge_histograms
+from models import Gate, TagRegistry
+from sketches import SpaceSaving, WindowedHyperLogLog
+from simulation import StoreSimulation
+
+
+def shard_seed(seed, shard):
+    """
+    Derive the random seed of one shard from the run's base seed.
+
+    String seeds are hashed with SHA-512 by ``random.Random``, so the result
+    is the same in every process and on every run.
+    """
+    return random.Random(f"{seed}:{shard}").getrandbits(64)
+
+
+def plan_shards(num_shards=4, duration=12 * 3600, start_time=None, seed=None, mode="time",
+                **options):
+    """
+    Split a simulated day into shards.
+
+    In ``"time"`` mode every shard simulates one consecutive slice of the
+    day. In ``"zone"`` mode every shard is a store zone with its own
+    cashier lanes that runs for the whole day and receives an equal share
+    of the arrivals. Customers still queued when a slice ends are served
+    by that shard; the next slice starts with empty lanes.
+
+    Args:
+        num_shards (int): Number of shards
+        duration (float): Virtual seconds in the simulated day
+        start_time (datetime): Virtual time at which the day starts
+        seed (int): Base seed; each shard gets its own seed derived from it
+        mode (str): "time" to slice the day, "zone" to split the store
+        **options: Further StoreSimulation arguments (arrival_rate,
+            num_cashiers, theft_probability, ...)
+
+    Returns:
+        list: One shard spec dict per shard
+    """
+    if num_shards < 1:
+        raise ValueError("At least one shard is required")
+    if mode not in ("time", "zone"):
+        raise ValueError(f"Unknown shard mode: {mode}")
+    start_time = start_time or datetime.now().replace(hour=8, minute=0, second=0, microsecond=0)
+
+    specs = []
+    for shard in range(num_shards):
+        shard_options = dict(options)
+        if mode == "time":
+            shard_duration = duration / num_shards
+            shard_start = start_time + timedelta(seconds=shard * shard_duration)
+        else:
+            shard_duration = duration
+            shard_start = start_time
+            shard_options['arrival_rate'] = options.get('arrival_rate', 0.1) / num_shards
+        specs.append({
+            'shard': shard,
+            'seed': shard_seed(seed, shard),
+            'start_time': shard_start,
+            'duration': shard_duration,
+            'options': shard_options
+        })
+    return specs
+
+
+def build_shard(spec, **overrides):
+    """
+    Create the StoreSimulation for one shard.
+
+    Every shard gets its own TagRegistry whose tag prefix names the shard,
+    and its customers are named with the same prefix, so unit tags and
+    distinct customer counts stay apart once shard results are merged.
+    """
+    options = dict(spec['options'])
+    options.update(overrides)
+    prefix = f"S{spec['shard']}-"
+    options.setdefault('registry', TagRegistry(prefix=prefix))
+    options.setdefault('customer_prefix', prefix)
+    return StoreSimulation(start_time=spec['start_time'], seed=spec['seed'], **options)
+
+
+def recent_buckets(series, seconds):
+    """
+    Get the buckets a series sums to count its last ``seconds`` seconds.
+
+    Returns:
+        dict: 'resolution' in seconds plus the 'start' and per-channel
+        counts of the buckets (see RollingTimeSeries.buckets)
+    """
+    level, count = series.span(seconds)
+    buckets = series.buckets(level.resolution, count)
+    buckets['resolution'] = level.resolution
+    return buckets
+
+
+def merge_recent(bucket_sets, channels):
+    """
+    Count the last span of merged series from each series' recent buckets.
+
+    The span ends with the newest bucket of any series, like
+    RollingTimeSeries.last on a series that recorded everything; older
+    buckets of the other series that fall before the span are left out.
+    """
+    totals = dict.fromkeys(channels, 0)
+    if not bucket_sets:
+        return totals
+    resolution = bucket_sets[0]['resolution']
+    first = max(buckets['start'] for buckets in bucket_sets)
+    for buckets in bucket_sets:
+        skip = max(0, round((first - buckets['start']) / resolution))
+        for channel in channels:
+            totals[channel] += int(buckets[channel][skip:].sum())
+    return totals
+
+
+def summarize_shard(spec, simulation, wall_time=0.0):
+    """
+    Reduce a finished shard to a compact, mergeable summary.
+
+    Args:
+        spec (dict): The shard spec
+        simulation (StoreSimulation): The simulation after its run
+        wall_time (float): Real seconds the run took
+
+    Returns:
+        dict: Counts, value sums, the hourly histogram, alert tag counts and
+        the gate's distinct-count sketches and last hour of traffic
+    """
+    stats = simulation.stats
+    hourly = [0] * 24
+    for hour, count in stats['hourly_traffic'].items():
+        hourly[hour] = count
+
+    gate = simulation.gate
+    cashiers = simulation.cashiers
+    return {
+        'shard': spec['shard'],
+        'seed': spec['seed'],
+        'customers': stats['customers'],
+        'items': stats['items'],
+        'checkouts': stats['checkouts'],
+        'skipped_checkout': stats['skipped_checkout'],
+        'alerts': stats['alerts'],
+        'safe_exits': stats['safe_exits'],
+        'revenue': stats['revenue'],
+        'prevented_theft': stats['prevented_theft'],
+        'total_queue_wait': stats['total_queue_wait'],
+        'max_queue_wait': stats['max_queue_wait'],
+        'max_queue_length': stats['max_queue_length'],
+        'hourly_traffic': hourly,
+        'alert_tags': simulation.alert_tags,
+        'virtual_duration': simulation.now,
+        'wall_time': wall_time,
+        'gate': {
+            'total_scans': gate.total_scans,
+            'alerts_triggered': gate.alerts_triggered,
+            'items_scanned': gate.items_scanned,
+            'alerted_value': gate.alerted_value,
+            'scan_latency': gate.scan_latency,
+            'unique_customers': gate.unique_customers,
+            'unique_alert_tags': gate.unique_alert_tags,
+            'last_hour': recent_buckets(gate.traffic, 3600)
+        },
+        'cashier': {
+            'shift_start': min(cashier.shift_start for cashier in cashiers),
+            'shift_end': datetime.now(),
+            'items_processed': sum(cashier.items_processed for cashier in cashiers),
+            'total_sales': sum(cashier.total_sales for cashier in cashiers),
+            'scan_latency': merge_histograms(cashier.scan_latency for cashier in cashiers),
+            'transaction_latency': merge_histograms(cashier.transaction_latency
+                                                    for cashier in cashiers),
+            'successful_deactivations': sum(cashier.performance_metrics['successful_deactivations']
+                                            for cashier in cashiers),
+            'transaction_count': sum(cashier.transaction_history.appended for cashier in cashiers)
+        }
+    }
+
+
+def run_shard(spec):
+    """Run one shard and return its summary (the process pool's worker)."""
+    wall_start = time.perf_counter()
+    simulation = build_shard(spec)
+    simulation.run(duration=spec['duration'])
+    return summarize_shard(spec, simulation, time.perf_counter() - wall_start)
+
+
+def merge_summaries(summaries):
+    """
+    Merge shard summaries into whole-day statistics.
+
+    Counts and histograms add up exactly. Alert tag summaries are merged
+    in shard order, so while fewer tags alert than a summary tracks, the
+    top tags and their tie order match a single Gate that scanned the
+    shards one after another. Distinct-count sketches merge to the same
+    registers as that Gate's, and the last hour of traffic ends with the
+    newest scan of any shard. Value sums agree with a single Gate or
+    Cashier up to float rounding.
+
+    Args:
+        summaries (list): Shard summaries in shard order
+
+    Returns:
+        dict: 'simulation' totals plus 'gate' and 'cashier' dicts shaped like
+        Gate.get_stats() and Cashier.get_shift_summary()
+    """
+    hourly = np.zeros(24, dtype=np.int64)
+    alert_tags = SpaceSaving(Gate.tag_capacity)
+    totals = dict.fromkeys(('customers', 'items', 'checkouts', 'skipped_checkout', 'alerts',
+                            'safe_exits', 'revenue', 'prevented_theft', 'total_queue_wait',
+                            'wall_time'), 0)
+    gate = dict.fromkeys(('total_scans', 'alerts_triggered', 'items_scanned', 'alerted_value'), 0)
+    cashier = dict.fromkeys(('items_processed', 'total_sales', 'successful_deactivations',
+                             'transaction_count'), 0)
+    gate_latency = LatencyHistogram()
+    unique_customers = WindowedHyperLogLog()
+    unique_alert_tags = WindowedHyperLogLog()
+    scan_latency = LatencyHistogram()
+    transaction_latency = LatencyHistogram()
+    max_queue_wait = 0.0
+    max_queue_length = 0
+
+    for summary in summaries:
+        for key in totals:
+            totals[key] += summary[key]
+        for key in gate:
+            gate[key] += summary['gate'][key]
+        for key in cashier:
+            cashier[key] += summary['cashier'][key]
+        gate_latency.merge(summary['gate']['scan_latency'])
+        unique_customers.merge(summary['gate']['unique_customers'])
+        unique_alert_tags.merge(summary['gate']['unique_alert_tags'])
+        scan_latency.merge(summary['cashier']['scan_latency'])
+        transaction_latency.merge(summary['cashier']['transaction_latency'])
+        max_queue_wait = max(max_queue_wait, summary['max_queue_wait'])
+        max_queue_length = max(max_queue_length, summary['max_queue_length'])
+        hourly += summary['hourly_traffic']
+        alert_tags.merge(summary['alert_tags'])
+
+    total_scans = gate['total_scans']
+    alert_rate = (gate['alerts_triggered'] / total_scans * 100) if total_scans > 0 else 0
+    peak_hours = None
+    if hourly.any():
+        peak_hours = {
+            'busiest_hour': int(hourly.argmax()),
+            'hourly_traffic': {hour: int(count) for hour, count in enumerate(hourly) if count > 0}
+        }
+
+    shift_start = min((summary['cashier']['shift_start'] for summary in summaries), default=None)
+    shift_end = max((summary['cashier']['shift_end'] for summary in summaries), default=None)
+    items_processed = cashier['items_processed']
+    customers = totals['customers']
+
+    return {
+        'shards': len(summaries),
+        'simulation': {
+            'customers': customers,
+            'items': totals['items'],
+            'checkouts': totals['checkouts'],
+            'skipped_checkout': totals['skipped_checkout'],
+            'alerts': totals['alerts'],
+            'safe_exits': totals['safe_exits'],
+            'alert_rate': (totals['alerts'] / customers * 100) if customers > 0 else 0,
+            'revenue': totals['revenue'],
+            'prevented_theft': totals['prevented_theft'],
+            'avg_queue_wait': (totals['total_queue_wait'] / totals['checkouts'])
+                              if totals['checkouts'] > 0 else 0,
+            'max_queue_wait': max_queue_wait,
+            'max_queue_length': max_queue_length,
+            'hourly_traffic': peak_hours['hourly_traffic'] if peak_hours else {},
+            'wall_time': totals['wall_time']
+        },
+        'gate': {
+            'total_scans': total_scans,
+            'alerts_triggered': gate['alerts_triggered'],
+            'alert_rate': alert_rate,
+            'avg_items_per_scan': (gate['items_scanned'] / total_scans) if total_scans > 0 else 0,
+            'avg_scan_duration': gate_latency.mean / 1e9,
+            'alerted_value': gate['alerted_value'],
+            'peak_hours': peak_hours,
+            'last_hour': merge_recent([summary['gate']['last_hour'] for summary in summaries],
+                                      ('scans', 'alerts')),
+            'alert_patterns': {
+                'most_triggered_tags': {tag: count for tag, count, _ in alert_tags.top(5)},
+                'error_bound': alert_tags.error_bound,
+                'alert_rate': alert_rate
+            },
+            'unique': {
+                'customers': unique_customers.estimate(),
+                'alert_tags': unique_alert_tags.estimate()
+            },
+            'scan_latency': gate_latency.get_stats()
+        },
+        'cashier': {
+            'cashier': "All lanes",
+            'shift_start': shift_start,
+            'duration': (shift_end - shift_start).total_seconds() if shift_start else 0,
+            'items_processed': items_processed,
+            'total_sales': cashier['total_sales'],
+            'avg_scan_time': scan_latency.mean / 1e9,
+            'successful_deactivations': cashier['successful_deactivations'],
+            'transaction_count': cashier['transaction_count'],
+            'scan_latency': scan_latency.get_stats(),
+            'transaction_latency': transaction_latency.get_stats()
+        }
+    }
+
+
+def run_sharded(num_shards=4, duration=12 * 3600, start_time=None, seed=None, mode="time",
+                max_workers=None, **options):
+    """
+    Run a simulated day split into shards on a process pool.
+
+    Args:
+        num_shards (int): Number of shards
+        duration (float): Virtual seconds in the simulated day
+        start_time (datetime): Virtual time at which the day starts
+        seed (int): Base seed (a random one is drawn and reported if None)
+        mode (str): "time" to slice the day, "zone" to split the store
+        max_workers (int): Worker processes (defaults to the CPU count)
+        **options: Further StoreSimulation arguments
+
+    Returns:
+        dict: Merged statistics (see merge_summaries) plus the base seed and
+        the run's wall time
+    """
+    if seed is None:
+        seed = random.SystemRandom().getrandbits(32)
+    specs = plan_shards(num_shards, duration, start_time, seed, mode, **options)
+
+    wall_start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        summaries = list(executor.map(run_shard, specs))
+    wall_time = time.perf_counter() - wall_start
+
+    merged = merge_summaries(summaries)
+    merged['seed'] = seed
+    merged['wall_time'] = wall_time
+    merged['customers_per_second'] = (merged['simulation']['customers'] / wall_time
+                                      if wall_time > 0 else 0)
+    return merged
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Run a store simulation split across processes")
+    parser.add_argument("--shards", type=int, default=4)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--hours", type=float, default=12.0)
+    parser.add_argument("--mode", choices=("time", "zone"), default="time")
+    parser.add_argument("--cashiers", type=int, default=4)
+    parser.add_argument("--arrival-rate", type=float, default=0.1)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    result = run_sharded(num_shards=args.shards, duration=args.hours * 3600, seed=args.seed,
+                         mode=args.mode, max_workers=args.workers,
+                         num_cashiers=args.cashiers, arrival_rate=args.arrival_rate)
+    for section in ('simulation', 'gate', 'cashier'):
+        print(f"[{section}]")
+        for key, value in result[section].items():
+            print(f"  {key}: {value}")
+    print(f"seed: {result['seed']}")
+    print(f"wall_time: {result['wall_time']:.2f}s "
+          f"({result['customers_per_second']:.0f} customers/s)")
@@ -0,0 +1,282 @@
+import heapq
+import random
+import time
+from collections import deque
+from datetime import datetime, timedelta
+from models import Item, Person, Cashier, Gate, TagRegistry
+from sketches import SpaceSaving
+
+
+def default_catalog():
+    """Create the default store catalog."""
+    return [
+        Item("Milk", "RFID001", price=3.99, category="Dairy"),
+        Item("Bread", "RFID002", price=2.49, category="Bakery"),
+        Item("Cheese", "RFID003", price=4.99, category="Dairy"),
+        Item("Coffee", "RFID004", price=7.99, category="Beverages"),
+        Item("Chocolate", "RFID005", price=1.99, category="Snacks"),
+        Item("Apple", "RFID006", price=0.99, category="Produce"),
+        Item("Cereal", "RFID007", price=5.99, category="Breakfast"),
+        Item("Chips", "RFID008", price=3.49, category="Snacks"),
+        Item("Soda", "RFID009", price=2.99, category="Beverages"),
+        Item("Eggs", "RFID010", price=4.49, category="Dairy")
+    ]
+
+
+class StoreSimulation:
+    """
+    Headless discrete-event simulation of customers moving through the store.
+
+    Runs on virtual time: events are kept in a heap ordered by their virtual
+    timestamp and processed one after another, so no real time passes
+    between a customer's arrival, checkout and exit. The models from
+    models.py do all the bookkeeping; a GUI can watch the run through the
+    optional listener.
+
+    Attributes:
+        catalog (list): Items customers pick from
+        cashiers (list): Cashier lanes
+        gate (Gate): The exit gate
+        registry (TagRegistry): Index of the tags of units currently in the store
+        arrival_rate (float): Mean customer arrivals per virtual second
+        theft_probability (float): Chance that a customer skips the cashier
+        min_items (int): Minimum items per basket
+        max_items (int): Maximum items per basket
+        seconds_per_item (float): Virtual checkout time per item
+        checkout_overhead (float): Virtual checkout time per transaction
+        start_time (datetime): Virtual time at which the simulation starts
+        listener (function): Optional callback(event, person, now, detail)
+        customer_prefix (str): Inserted before each customer's number, so
+            runs in different processes name their customers apart
+        alert_tags (SpaceSaving): Alerts per tag id over the whole run (most frequent tags)
+
+    The run keeps its own hourly traffic and alert tag counts, so a gate
+    created by the simulation can skip its traffic and sketch analytics
+    (``gate_analytics=False``) when only throughput matters. Scan records
+    carry virtual time, so no event reads the wall clock. Expect roughly
+    0.6M customers per minute of wall time with analytics and 0.85M
+    without on one core; that is short of millions per minute.
+    """
+
+    ARRIVAL = 0
+    CHECKOUT_DONE = 1
+    EXIT = 2
+
+    def __init__(self, catalog=None, cashiers=None, gate=None, registry=None, num_cashiers=4,
+                 arrival_rate=0.1, theft_probability=0.3, min_items=1, max_items=5,
+                 seconds_per_item=3.0, checkout_overhead=20.0, start_time=None,
+                 seed=None, listener=None, gate_analytics=True, customer_prefix=""):
+        self.catalog = catalog or default_catalog()
+        self.registry = registry if registry is not None else TagRegistry()
+        self.cashiers = cashiers or [Cashier(f"Lane {i + 1}", registry=self.registry)
+                                     for i in range(num_cashiers)]
+        self.gate = gate or Gate(registry=self.registry, analytics=gate_analytics)
+        self.arrival_rate = arrival_rate
+        self.theft_probability = theft_probability
+        self.min_items = min_items
+        self.max_items = max_items
+        self.seconds_per_item = seconds_per_item
+        self.checkout_overhead = checkout_overhead
+        self.start_time = start_time or datetime.now().replace(hour=8, minute=0, second=0, microsecond=0)
+        self.listener = listener
+        self.customer_prefix = customer_prefix
+        self.random = random.Random(seed)
+
+        self.events = []
+        self.stopped = False
+        self.sequence = 0
+        self.now = 0.0
+        self.lane_queues = [deque() for _ in self.cashiers]
+        self.lane_busy = [False] * len(self.cashiers)
+        self.lane_busy_time = [0.0] * len(self.cashiers)
+        self.alert_tags = SpaceSaving(Gate.tag_capacity)
+        self.stats = {
+            'customers': 0,
+            'items': 0,
+            'checkouts': 0,
+            'skipped_checkout': 0,
+            'alerts': 0,
+            'safe_exits': 0,
+            'revenue': 0.0,
+            'prevented_theft': 0.0,
+            'total_queue_wait': 0.0,
+            'max_queue_wait': 0.0,
+            'max_queue_length': 0,
+            'hourly_traffic': {}
+        }
+
+    def schedule(self, delay, kind, payload):
+        """Schedule an event ``delay`` virtual seconds from now."""
+        self.sequence += 1
+        heapq.heappush(self.events, (self.now + delay, self.sequence, kind, payload))
+
+    def notify(self, event, person, detail=None):
+        """Forward an event to the listener, if any."""
+        if self.listener:
+            self.listener(event, person, self.now, detail)
+
+    def virtual_datetime(self):
+        """Get the current virtual time as a datetime."""
+        return self.start_time + timedelta(seconds=self.now)
+
+    def run(self, num_customers=None, duration=None):
+        """
+        Run the simulation.
+
+        Args:
+            num_customers (int): Stop generating arrivals after this many customers
+            duration (float): Stop generating arrivals after this many virtual seconds
+
+        Returns:
+            dict: Aggregate statistics of the run
+        """
+        if num_customers is None and duration is None:
+            raise ValueError("Either num_customers or duration is required")
+
+        wall_start = time.perf_counter()
+        self.schedule(self.random.expovariate(self.arrival_rate), self.ARRIVAL, None)
+
+        events = self.events
+        while events and not self.stopped:
+            self.now, _, kind, payload = heapq.heappop(events)
+            if kind == self.ARRIVAL:
+                if duration is not None and self.now > duration:
+                    continue
+                self.handle_arrival()
+                if num_customers is None or self.stats['customers'] < num_customers:
+                    self.schedule(self.random.expovariate(self.arrival_rate), self.ARRIVAL, None)
+            elif kind == self.CHECKOUT_DONE:
+                self.handle_checkout_done(payload)
+            else:
+                self.handle_exit(payload)
+
+        return self.get_stats(time.perf_counter() - wall_start)
+
+    def stop(self):
+        """Stop a running simulation after the current event (safe from another thread)."""
+        self.stopped = True
+
+    def handle_arrival(self):
+        """A customer arrives at the checkout area with a full basket."""
+        self.stats['customers'] += 1
+        person = Person(f"Customer {self.customer_prefix}{self.stats['customers']}")
+        self.notify('arrival', person)
+
+        now = self.virtual_datetime()
+        for _ in range(self.random.randint(self.min_items, self.max_items)):
+            item = self.registry.create_unit(self.random.choice(self.catalog))
+            person.add_item(item, now)
+            self.notify('item', person, item)
+        self.stats['items'] += len(person.items)
+
+        if self.random.random() < self.theft_probability:
+            self.stats['skipped_checkout'] += 1
+            self.notify('skip', person)
+            self.schedule(0.0, self.EXIT, person)
+            return
+
+        # Join the lane with the fewest waiting customers
+        lane = min(range(len(self.cashiers)),
+                   key=lambda i: len(self.lane_queues[i]) + self.lane_busy[i])
+        self.lane_queues[lane].append((self.now, person))
+        self.stats['max_queue_length'] = max(self.stats['max_queue_length'],
+                                             len(self.lane_queues[lane]))
+        if not self.lane_busy[lane]:
+            self.start_checkout(lane)
+
+    def start_checkout(self, lane):
+        """Start serving the next customer waiting at a lane."""
+        queued_at, person = self.lane_queues[lane].popleft()
+        wait = self.now - queued_at
+        self.stats['total_queue_wait'] += wait
+        self.stats['max_queue_wait'] = max(self.stats['max_queue_wait'], wait)
+
+        service_time = self.checkout_overhead + self.seconds_per_item * len(person.items)
+        self.lane_busy[lane] = True
+        self.lane_busy_time[lane] += service_time
+        self.schedule(service_time, self.CHECKOUT_DONE, (lane, person))
+
+    def handle_checkout_done(self, payload):
+        """A cashier finishes scanning a customer's basket."""
+        lane, person = payload
+        result = self.cashiers[lane].scan_and_deactivate(person, timestamp=self.virtual_datetime())
+        self.stats['checkouts'] += 1
+        self.stats['revenue'] += person.total_spent
+        self.notify('checkout', person, result)
+        self.schedule(0.0, self.EXIT, person)
+
+        self.lane_busy[lane] = False
+        if self.lane_queues[lane]:
+            self.start_checkout(lane)
+
+    def handle_exit(self, person):
+        """A customer walks through the exit gate."""
+        scan_time = self.virtual_datetime()
+        result = self.gate.scan(person, timestamp=scan_time)
+        if result.alert_triggered:
+            self.stats['alerts'] += 1
+            self.stats['prevented_theft'] += person.total_spent
+            for tag in result.active_tags:
+                self.alert_tags.update(tag)
+            # The customer is stopped and the items go back into stock
+            self.registry.retire_items(person.items)
+        else:
+            self.stats['safe_exits'] += 1
+
+        hour = scan_time.hour
+        self.stats['hourly_traffic'][hour] = self.stats['hourly_traffic'].get(hour, 0) + 1
+        self.notify('exit', person, result)
+
+    def get_stats(self, wall_time=0.0):
+        """
+        Get aggregate statistics of the simulation.
+
+        Args:
+            wall_time (float): Real seconds the run took
+
+        Returns:
+            dict: Customer, revenue, queue and lane statistics
+        """
+        stats = self.stats
+        return {
+            'customers': stats['customers'],
+            'items': stats['items'],
+            'checkouts': stats['checkouts'],
+            'skipped_checkout': stats['skipped_checkout'],
+            'alerts': stats['alerts'],
+            'safe_exits': stats['safe_exits'],
+            'alert_rate': (stats['alerts'] / stats['customers'] * 100)
+                          if stats['customers'] > 0 else 0,
+            'revenue': stats['revenue'],
+            'prevented_theft': stats['prevented_theft'],
+            'avg_queue_wait': (stats['total_queue_wait'] / stats['checkouts'])
+                              if stats['checkouts'] > 0 else 0,
+            'max_queue_wait': stats['max_queue_wait'],
+            'max_queue_length': stats['max_queue_length'],
+            'lane_utilization': [busy / self.now if self.now > 0 else 0
+                                 for busy in self.lane_busy_time],
+            'hourly_traffic': dict(sorted(stats['hourly_traffic'].items())),
+            'virtual_duration': self.now,
+            'wall_time': wall_time,
+            'customers_per_second': (stats['customers'] / wall_time) if wall_time > 0 else 0
+        }
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Run a headless store simulation")
+    parser.add_argument("--customers", type=int, default=100000)
+    parser.add_argument("--cashiers", type=int, default=4)
+    parser.add_argument("--arrival-rate", type=float, default=0.1)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--no-gate-analytics", action="store_true",
+                        help="skip the gate's traffic series and sketches")
+    args = parser.parse_args()
+
+    simulation = StoreSimulation(num_cashiers=args.cashiers,
+                                 arrival_rate=args.arrival_rate,
+                                 seed=args.seed,
+                                 gate_analytics=not args.no_gate_analytics)
+    for key, value in simulation.run(num_customers=args.customers).items():
+        print(f"{key}: {value}")
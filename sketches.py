@@ -0,0 +1,460 @@
+import hashlib
+import math
+import numpy as np
+
+
+class _Bucket:
+    """Items of a SpaceSaving summary that share one count (a Stream-Summary node)."""
+
+    __slots__ = ('count', 'items', 'lower', 'higher')
+
+    def __init__(self, count, lower=None, higher=None):
+        self.count = count
+        # Insertion-ordered set: items reached this count in this order
+        self.items = {}
+        self.lower = lower
+        self.higher = higher
+
+
+class SpaceSaving:
+    """
+    Streaming top-k counts in fixed memory (Metwally et al.'s Space-Saving).
+
+    At most ``capacity`` items are monitored. A new item that arrives when
+    the summary is full replaces the item with the lowest count and
+    inherits that count as its error. Every estimate is then at most
+    ``error_bound`` above the true count, and any item whose true count is
+    above ``error_bound`` is monitored. The bound never exceeds
+    ``total / capacity``.
+
+    Counts live in a Stream-Summary: a doubly linked list of buckets, one
+    per distinct count, lowest first. Updates move an item to the
+    neighbouring bucket in O(1), and the k most frequent items are read
+    off the highest buckets in O(k). Items with the same count are
+    reported in the order they reached it.
+
+    Summaries can be merged (e.g. across gate lanes or simulation shards)
+    keeping the same guarantees, with the error bounds adding up.
+
+    Attributes:
+        capacity (int): Most items monitored
+        total (int): Updates counted
+        counters (dict): Monitored item -> its count bucket
+        errors (dict): Monitored item -> how much its count may be overestimated
+        floor (int): Error bound carried over from merged summaries
+    """
+
+    def __init__(self, capacity=1000):
+        if capacity < 1:
+            raise ValueError("A summary needs room for at least one item")
+        self.capacity = capacity
+        self.total = 0
+        self.counters = {}
+        self.errors = {}
+        self.floor = 0
+        self.lowest = None
+        self.highest = None
+
+    def __len__(self):
+        return len(self.counters)
+
+    def __contains__(self, item):
+        return item in self.counters
+
+    @property
+    def error_bound(self):
+        """Most any count may be overestimated, and most any unmonitored item was seen."""
+        if len(self.counters) < self.capacity:
+            return self.floor
+        return max(self.floor, self.lowest.count)
+
+    def _link_after(self, bucket, count):
+        """Create a bucket for ``count`` right above ``bucket`` (None for the bottom)."""
+        higher = bucket.higher if bucket is not None else self.lowest
+        created = _Bucket(count, bucket, higher)
+        if bucket is not None:
+            bucket.higher = created
+        else:
+            self.lowest = created
+        if higher is not None:
+            higher.lower = created
+        else:
+            self.highest = created
+        return created
+
+    def _unlink(self, bucket):
+        if bucket.lower is not None:
+            bucket.lower.higher = bucket.higher
+        else:
+            self.lowest = bucket.higher
+        if bucket.higher is not None:
+            bucket.higher.lower = bucket.lower
+        else:
+            self.highest = bucket.lower
+
+    def _promote(self, item, bucket):
+        """Move ``item`` from ``bucket`` to the bucket one count higher."""
+        target = bucket.higher
+        if target is None or target.count != bucket.count + 1:
+            target = self._link_after(bucket, bucket.count + 1)
+        target.items[item] = None
+        self.counters[item] = target
+        bucket.items.pop(item, None)
+        if not bucket.items:
+            self._unlink(bucket)
+
+    def update(self, item):
+        """Count one occurrence of ``item``."""
+        self.total += 1
+        bucket = self.counters.get(item)
+        if bucket is not None:
+            self._promote(item, bucket)
+            return
+        if len(self.counters) < self.capacity:
+            lowest = self.lowest
+            if lowest is None or lowest.count != 1:
+                lowest = self._link_after(None, 1)
+            lowest.items[item] = None
+            self.counters[item] = lowest
+            self.errors[item] = 0
+            return
+
+        # Replace the item that reached the lowest count first
+        lowest = self.lowest
+        victim = next(iter(lowest.items))
+        del lowest.items[victim]
+        del self.counters[victim]
+        del self.errors[victim]
+        self.errors[item] = lowest.count
+        self._promote(item, lowest)
+
+    def estimate(self, item):
+        """Get the estimated count of an item (0 if it is not monitored)."""
+        bucket = self.counters.get(item)
+        return bucket.count if bucket is not None else 0
+
+    def items(self):
+        """Yield (item, count, error) tuples, highest count first."""
+        bucket = self.highest
+        errors = self.errors
+        while bucket is not None:
+            for item in bucket.items:
+                yield item, bucket.count, errors[item]
+            bucket = bucket.lower
+
+    def top(self, k=5):
+        """
+        Get the ``k`` items with the highest estimated counts, in O(k).
+
+        Returns:
+            list: (item, count, error) tuples, highest count first
+        """
+        result = []
+        if k <= 0:
+            return result
+        for entry in self.items():
+            result.append(entry)
+            if len(result) == k:
+                break
+        return result
+
+    def counts(self):
+        """Get every monitored item mapped to its estimated count."""
+        return {item: count for item, count, _ in self.items()}
+
+    def _rebuild(self, entries, floor):
+        """Replace the contents with (item, count, error) entries, highest count first."""
+        self.counters = {}
+        self.errors = {}
+        self.lowest = self.highest = None
+        truncated = entries[self.capacity:]
+        entries = entries[:self.capacity]
+        # Items cut off here may have been seen as often as their estimate
+        self.floor = max(floor, truncated[0][1] if truncated else 0)
+
+        bucket = None
+        for item, count, error in entries:
+            if bucket is None or bucket.count != count:
+                bucket = _Bucket(count, None, bucket)
+                if bucket.higher is not None:
+                    bucket.higher.lower = bucket
+                else:
+                    self.highest = bucket
+            bucket.items[item] = None
+            self.counters[item] = bucket
+            self.errors[item] = error
+        self.lowest = bucket
+
+    def merge(self, other):
+        """
+        Add the counts of another summary.
+
+        An item only one side monitors is counted with the other side's
+        error bound added, so estimates still never undercount; the error
+        bounds of the two summaries add up.
+        """
+        own_bound = self.error_bound
+        other_bound = other.error_bound
+        other_entries = {item: (count, error) for item, count, error in other.items()}
+        merged = []
+        for item, count, error in self.items():
+            if item in other_entries:
+                other_count, other_error = other_entries.pop(item)
+            else:
+                other_count = other_error = other_bound
+            merged.append((item, count + other_count, error + other_error))
+        for item, (count, error) in other_entries.items():
+            merged.append((item, count + own_bound, error + own_bound))
+        # Stable sort: ties keep this summary's items first, in their order
+        merged.sort(key=lambda entry: entry[1], reverse=True)
+        self.total += other.total
+        self._rebuild(merged, own_bound + other_bound)
+        return self
+
+    def __getstate__(self):
+        # The bucket list is rebuilt on load; pickling it would recurse along the links
+        return {'capacity': self.capacity, 'total': self.total, 'floor': self.floor,
+                'entries': list(self.items())}
+
+    def __setstate__(self, state):
+        self.capacity = state['capacity']
+        self.total = state['total']
+        self._rebuild(state['entries'], state['floor'])
+
+    def get_stats(self, k=5):
+        """
+        Get the top items and the error guarantee.
+
+        Returns:
+            dict: 'top' items mapped to estimated counts, the 'error_bound'
+            and how many items are 'tracked' out of 'capacity'
+        """
+        return {
+            'top': {item: count for item, count, _ in self.top(k)},
+            'error_bound': self.error_bound,
+            'tracked': len(self.counters),
+            'capacity': self.capacity,
+            'total': self.total
+        }
+
+
+class HyperLogLog:
+    """
+    Approximate distinct count in fixed memory (Flajolet et al.'s HyperLogLog).
+
+    Items are hashed to 64 bits with BLAKE2b, so estimates are the same in
+    every process and on every run. The first ``precision`` bits pick one
+    of ``2 ** precision`` registers, which keeps the longest run of leading
+    zeros seen in the rest. With the default precision of 12 a sketch
+    takes 4 KB and the standard error is about 1.6%. Small counts use
+    linear counting and are close to exact.
+
+    Sketches of the same precision merge by taking the larger register, so
+    the union of lanes, shards or time windows costs nothing extra.
+
+    Attributes:
+        precision (int): Bits of the hash that pick a register
+        registers (bytearray): Longest zero run + 1 per register
+    """
+
+    __slots__ = ('precision', 'registers')
+
+    def __init__(self, precision=12):
+        if not 4 <= precision <= 18:
+            raise ValueError("HyperLogLog precision must be between 4 and 18")
+        self.precision = precision
+        self.registers = bytearray(1 << precision)
+
+    def __len__(self):
+        return round(self.estimate())
+
+    @staticmethod
+    def hash(item):
+        """Hash an item (its str() form) to a 64-bit integer."""
+        digest = hashlib.blake2b(str(item).encode(), digest_size=8).digest()
+        return int.from_bytes(digest, 'little')
+
+    def add_hash(self, hashed):
+        """Add an item by its 64-bit hash."""
+        bits = 64 - self.precision
+        index = hashed >> bits
+        rank = bits - (hashed & ((1 << bits) - 1)).bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def add(self, item):
+        """Add an item."""
+        self.add_hash(self.hash(item))
+
+    def estimate(self):
+        """Get the estimated number of distinct items added."""
+        registers = np.frombuffer(self.registers, dtype=np.uint8)
+        m = len(registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        raw = alpha * m * m / np.ldexp(1.0, -registers.astype(np.int64)).sum()
+        zeros = m - np.count_nonzero(registers)
+        if raw <= 2.5 * m and zeros:
+            return m * math.log(m / zeros)
+        return float(raw)
+
+    def merge(self, other):
+        """Add the items of another sketch of the same precision."""
+        if other.precision != self.precision:
+            raise ValueError("Cannot merge sketches of different precision")
+        registers = np.frombuffer(self.registers, dtype=np.uint8)
+        merged = np.maximum(registers, np.frombuffer(other.registers, dtype=np.uint8))
+        self.registers[:] = merged.tobytes()
+        return self
+
+    def copy(self):
+        """Get an independent copy of the sketch."""
+        sketch = HyperLogLog(self.precision)
+        sketch.registers[:] = self.registers
+        return sketch
+
+
+class WindowedHyperLogLog:
+    """
+    Distinct counts per time window, e.g. unique customers per hour and day.
+
+    Every item goes into a lifetime sketch and into the window it falls
+    in at each resolution. Each resolution keeps its ``keep`` most recent
+    windows, so memory is bounded at a few KB per window. Counts over a
+    span are the estimate of the union of its windows.
+
+    Items are hashed once and the hash goes to every sketch. The windows
+    of the newest item are kept at hand, so further items in the same
+    windows skip the per-resolution lookups.
+
+    Attributes:
+        levels (list): (seconds per window, windows kept) per resolution, finest first
+        precision (int): Precision of every sketch
+        lifetime (HyperLogLog): Every item ever added
+        windows (list): Per resolution, window number -> HyperLogLog
+        evicted (list): Per resolution, the newest window dropped so far (None if none)
+        latest (float): Time of the newest item in seconds (None until then)
+    """
+
+    def __init__(self, levels=((3600, 48), (86400, 35)), precision=12):
+        self.levels = sorted(levels)
+        self.precision = precision
+        self.lifetime = HyperLogLog(precision)
+        self.windows = [{} for _ in self.levels]
+        self.evicted = [None] * len(self.levels)
+        self.latest = None
+        # Span shared by the newest item's windows, and their sketches
+        self._open = (math.inf, -math.inf, ())
+
+    def add(self, item, seconds):
+        """Add an item seen at a time in seconds."""
+        self.add_hash(HyperLogLog.hash(item), seconds)
+
+    def add_hash(self, hashed, seconds):
+        """Add an item by its 64-bit hash (see HyperLogLog.hash)."""
+        self.lifetime.add_hash(hashed)
+        if self.latest is None or seconds > self.latest:
+            self.latest = seconds
+        start, end, sketches = self._open
+        if start <= seconds < end:
+            for sketch in sketches:
+                sketch.add_hash(hashed)
+            return
+        self._open = (math.inf, -math.inf, ())
+        start, end, sketches = -math.inf, math.inf, []
+        for level, (resolution, _) in enumerate(self.levels):
+            window = int(seconds // resolution)
+            windows = self.windows[level]
+            sketch = windows.get(window)
+            if sketch is None:
+                evicted = self.evicted[level]
+                if evicted is not None and window <= evicted:
+                    # Too late for this resolution; only the lifetime sketch counts it
+                    continue
+                sketch = windows[window] = HyperLogLog(self.precision)
+                self._trim(level)
+            sketch.add_hash(hashed)
+            sketches.append(sketch)
+            start = max(start, window * resolution)
+            end = min(end, (window + 1) * resolution)
+        if seconds == self.latest and len(sketches) == len(self.levels):
+            # The newest windows are never the ones trimmed
+            self._open = (start, end, tuple(sketches))
+
+    def _trim(self, level, evicted=None):
+        """Drop the oldest windows of a resolution beyond the number it keeps."""
+        windows = self.windows[level]
+        if evicted is not None:
+            self._mark_evicted(level, evicted)
+        while len(windows) > self.levels[level][1]:
+            oldest = min(windows)
+            del windows[oldest]
+            self._mark_evicted(level, oldest)
+
+    def _mark_evicted(self, level, window):
+        if self.evicted[level] is None or window > self.evicted[level]:
+            self.evicted[level] = window
+
+    def union(self, start, end):
+        """
+        Merge the windows covering ``[start, end)`` into one sketch.
+
+        The span is rounded out to whole windows of the finest resolution
+        that still holds every window it touches.
+
+        Raises:
+            ValueError: If no resolution holds the whole span any more
+        """
+        for level, (resolution, keep) in enumerate(self.levels):
+            first, last = int(start // resolution), math.ceil(end / resolution)
+            evicted = self.evicted[level]
+            if last - first <= keep and (evicted is None or first > evicted):
+                break
+        else:
+            raise ValueError("Span is older or longer than the windows keep")
+        merged = HyperLogLog(self.precision)
+        for window, sketch in self.windows[level].items():
+            if first <= window < last:
+                merged.merge(sketch)
+        return merged
+
+    def count_between(self, start, end):
+        """Get the estimated distinct items seen in ``[start, end)``."""
+        return round(self.union(start, end).estimate())
+
+    def count_last(self, seconds, now=None):
+        """
+        Get the estimated distinct items of the last ``seconds`` seconds.
+
+        The span ends with the window of ``now`` (by default the newest
+        item) and is rounded out to whole windows.
+        """
+        now = self.latest if now is None else now
+        if now is None:
+            return 0
+        for resolution, keep in self.levels:
+            if seconds <= resolution * keep:
+                break
+        end = (int(now // resolution) + 1) * resolution
+        return self.count_between(end - math.ceil(seconds / resolution) * resolution, end)
+
+    def estimate(self):
+        """Get the estimated distinct items over the whole lifetime."""
+        return round(self.lifetime.estimate())
+
+    def merge(self, other):
+        """Add the items of another windowed sketch with the same levels and precision."""
+        if other.levels != self.levels:
+            raise ValueError("Cannot merge sketches with different windows")
+        self._open = (math.inf, -math.inf, ())
+        self.lifetime.merge(other.lifetime)
+        for level in range(len(self.levels)):
+            windows = self.windows[level]
+            for window, sketch in other.windows[level].items():
+                if window in windows:
+                    windows[window].merge(sketch)
+                else:
+                    windows[window] = sketch.copy()
+            self._trim(level, other.evicted[level])
+        if other.latest is not None and (self.latest is None or other.latest > self.latest):
+            self.latest = other.latest
+        return self
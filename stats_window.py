@@ -0,0 +1,177 @@
+import tkinter as tk
+import numpy as np
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+
+
+class StatisticsDashboard:
+    """
+    Matplotlib artists of the live statistics dashboard.
+
+    Shows the alert rate and revenue over the last ``history`` samples and
+    scans per hour of day. Artists are animated, so they are left out of
+    full redraws and drawn over a cached background instead; the data is
+    changed in place. Each series has a fixed length, so updating costs
+    the same however long the store has been running.
+
+    Attributes:
+        figure (Figure): The one figure of the dashboard
+        history (int): Samples kept per time series
+        times (ndarray): Sample positions in seconds relative to now
+        alert_rates (ndarray): Alert rate in percent per sample
+        revenues (ndarray): Cashier sales per sample
+        artists (list): Animated artists drawn on every update
+    """
+
+    def __init__(self, figure, history=300, interval=1.0):
+        self.figure = figure
+        self.history = history
+        self.times = np.arange(1 - history, 1) * interval
+        self.alert_rates = np.full(history, np.nan)
+        self.revenues = np.full(history, np.nan)
+
+        self.rate_ax, self.traffic_ax, self.revenue_ax = figure.subplots(3, 1)
+
+        self.rate_ax.set_title("Alert rate (%)")
+        self.rate_ax.set_xlim(self.times[0], 0)
+        self.rate_ax.set_ylim(0, 100)
+        self.rate_line, = self.rate_ax.plot(self.times, self.alert_rates, color='#e74c3c',
+                                            animated=True)
+
+        self.traffic_ax.set_title("Scans per hour")
+        self.traffic_ax.set_xlim(-0.5, 23.5)
+        self.traffic_ax.set_ylim(0, 10)
+        self.traffic_bars = self.traffic_ax.bar(range(24), np.zeros(24), color='#3498db')
+
+        self.revenue_ax.set_title("Revenue ($)")
+        self.revenue_ax.set_xlabel("Seconds")
+        self.revenue_ax.set_xlim(self.times[0], 0)
+        self.revenue_ax.set_ylim(0, 100)
+        self.revenue_line, = self.revenue_ax.plot(self.times, self.revenues, color='#2ecc71',
+                                                  animated=True)
+
+        self.summary = figure.text(0.01, 0.995, "", va='top', animated=True)
+        figure.tight_layout(rect=(0, 0, 1, 0.97))
+
+        self.artists = [self.rate_line, self.revenue_line, self.summary]
+        for bar in self.traffic_bars:
+            bar.set_animated(True)
+            self.artists.append(bar)
+
+    @staticmethod
+    def grow_limit(ax, value):
+        """Raise an axis' upper y limit above ``value``; returns True if it changed."""
+        if value <= ax.get_ylim()[1]:
+            return False
+        ax.set_ylim(0, value * 1.5)
+        return True
+
+    def update(self, scans, alerts, hourly, revenue):
+        """
+        Add a sample.
+
+        Args:
+            scans (int): Gate scans so far
+            alerts (int): Gate alerts so far
+            hourly (dict): Scans per hour of day
+            revenue (float): Cashier sales so far
+
+        Returns:
+            bool: Whether an axis was rescaled, so the background must be redrawn
+        """
+        self.alert_rates[:-1] = self.alert_rates[1:]
+        self.alert_rates[-1] = alerts / scans * 100 if scans else 0
+        self.revenues[:-1] = self.revenues[1:]
+        self.revenues[-1] = revenue
+        self.rate_line.set_ydata(self.alert_rates)
+        self.revenue_line.set_ydata(self.revenues)
+
+        for hour, bar in enumerate(self.traffic_bars):
+            bar.set_height(hourly.get(hour, 0))
+        self.summary.set_text(f"Scans: {scans}   Alerts: {alerts}   Revenue: ${revenue:,.2f}")
+
+        rescaled = self.grow_limit(self.revenue_ax, revenue)
+        return self.grow_limit(self.traffic_ax, max(hourly.values(), default=0)) or rescaled
+
+    def draw_artists(self):
+        """Draw the animated artists onto the canvas."""
+        for artist in self.artists:
+            self.figure.draw_artist(artist)
+
+
+class StatisticsWindow:
+    """
+    Live statistics window.
+
+    One window and one figure are reused for the life of the application:
+    closing the window only hides it. While shown, a timer samples the gate
+    and cashier and blits the updated artists over a cached background; a
+    full redraw only happens on resize or when an axis has to rescale.
+
+    Attributes:
+        gate (Gate): Gate sampled for scans, alerts and hourly traffic
+        cashier (Cashier): Cashier sampled for revenue
+        interval_ms (int): Milliseconds between samples
+    """
+
+    def __init__(self, parent, gate, cashier, interval_ms=1000, history=300):
+        self.gate = gate
+        self.cashier = cashier
+        self.interval_ms = interval_ms
+        self.after_id = None
+        self.background = None
+
+        self.window = tk.Toplevel(parent)
+        self.window.title("Scan Statistics")
+        self.window.geometry("800x700")
+        self.window.protocol("WM_DELETE_WINDOW", self.hide)
+
+        # A plain Figure stays out of pyplot's global figure registry
+        self.figure = Figure(figsize=(8, 7))
+        self.dashboard = StatisticsDashboard(self.figure, history, interval_ms / 1000)
+
+        # Embed plot in Tkinter window
+        self.canvas = FigureCanvasTkAgg(self.figure, master=self.window)
+        self.canvas.mpl_connect('draw_event', self.on_draw)
+        self.canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True, padx=20, pady=20)
+        self.show()
+
+    def on_draw(self, event):
+        """Cache the background after a full redraw and put the artists back on it."""
+        self.background = self.canvas.copy_from_bbox(self.figure.bbox)
+        self.dashboard.draw_artists()
+
+    def sample(self):
+        """Read the current gate and cashier figures into the dashboard."""
+        gate = self.gate
+        return self.dashboard.update(gate.total_scans, gate.alerts_triggered, gate.peak_times,
+                                     self.cashier.total_sales)
+
+    def tick(self):
+        """Sample and redraw, then schedule the next tick."""
+        if self.sample() or self.background is None:
+            self.canvas.draw()
+        else:
+            self.canvas.restore_region(self.background)
+            self.dashboard.draw_artists()
+            self.canvas.blit(self.figure.bbox)
+        self.after_id = self.window.after(self.interval_ms, self.tick)
+
+    def show(self):
+        """Show the window and start the update timer."""
+        self.window.deiconify()
+        self.window.lift()
+        if self.after_id is None:
+            self.tick()
+
+    def hide(self):
+        """Hide the window and stop the update timer."""
+        if self.after_id is not None:
+            self.window.after_cancel(self.after_id)
+            self.after_id = None
+        self.window.withdraw()
+
+    def destroy(self):
+        """Close the window for good."""
+        self.hide()
+        self.window.destroy()
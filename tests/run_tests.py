@@ -1,76 +1,78 @@
 import unittest
-from models import Item, Person, Cashier, Gate
+import sys
+import os
 
-class TestItem(unittest.TestCase):
-    def setUp(self):
-        self.item = Item("Test Item", "TEST001")
-    
-    def test_item_creation(self):
-        self.assertEqual(self.item.name, "Test Item")
-        self.assertEqual(self.item.tag_id, "TEST001")
-        self.assertFalse(self.item.is_deactivated)
-    
-    def test_item_string_representation(self):
-        expected = "Test Item (Tag: TEST001, Active)"
-        self.assertEqual(str(self.item), expected)
-        
-        self.item.is_deactivated = True
-        expected = "Test Item (Tag: TEST001, Deactivated)"
-        self.assertEqual(str(self.item), expected)
+# Add the parent directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+# Import all test modules
+from tests.test_models import TestItem, TestTagRegistry, TestPerson, TestCashier, TestGate
+from tests.test_logger import TestSystemLogger, TestLogRotation, TestRunningStats
+from tests.test_simulation import TestStoreSimulation
+from tests.test_scan_store import TestScanStore
+from tests.test_history import TestHistory
+from tests.test_gate_service import TestMultiLaneGate
+from tests.test_sharded_simulation import TestShardedSimulation
+from tests.test_checkout_pipeline import TestCheckoutPipeline
+from tests.test_ui_scheduler import TestFrameScheduler, TestRendering
+from tests.test_gui import TestBasketView, TestLogBuffer, TestLogView
+from tests.test_stats_window import TestStatisticsDashboard
+from tests.test_startup import TestStartup
+from tests.test_bench_models import TestBenchModels
+from tests.test_instrumentation import TestLatencyHistogram
+from tests.test_timeseries import TestRollingTimeSeries
+from tests.test_sketches import TestSpaceSaving, TestHyperLogLog
+from tests.test_log_store import TestSQLiteLogStore
 
-class TestPerson(unittest.TestCase):
-    def setUp(self):
-        self.person = Person("Test Person")
-        self.item = Item("Test Item", "TEST001")
+def run_tests():
+    # Create a test suite
+    test_suite = unittest.TestSuite()
     
-    def test_person_creation(self):
-        self.assertEqual(self.person.name, "Test Person")
-        self.assertEqual(len(self.person.items), 0)
+    # Add test cases
+    test_suite.addTests(unittest.TestLoader().loadTestsFromTestCase(TestItem))
+    test_suite.addTests(unittest.TestLoader().loadTestsFromTestCase(TestTagRegistry))
+    test_suite.addTests(unittest.TestLoader().loadTestsFromTestCase(TestPerson))
+    test_suite.addTests(unittest.TestLoader().loadTestsFromTestCase(TestCashier))
+    test_suite.addTests(unittest.TestLoader().loadTestsFromTestCase(TestGate))
+    test_suite.addTests(unittest.TestLoader().loadTestsFromTestCase(TestSystemLogger))
+    test_suite.addTests(unittest.TestLoader().loadTestsFromTestCase(TestLogRotation))
+    test_suite.addTests(unittest.TestLoader().loadTestsFromTestCase(TestRunningStats))
+    test_suite.addTests(unittest.TestLoader().loadTestsFromTestCase(TestStoreSimulation))
+    test_suite.addTests(unittest.TestLoader().loadTestsFromTestCase(TestScanStore))
+    test_suite.addTests(unittest.TestLoader().loadTestsFromTestCase(TestHistory))
+    test_suite.addTests(unittest.TestLoader().loadTestsFromTestCase(TestMultiLaneGate))
+    test_suite.addTests(unittest.TestLoader().loadTestsFromTestCase(TestShardedSimulation))
+    test_suite.addTests(unittest.TestLoader().loadTestsFromTestCase(TestCheckoutPipeline))
+    test_suite.addTests(unittest.TestLoader().loadTestsFromTestCase(TestFrameScheduler))
+    test_suite.addTests(unittest.TestLoader().loadTestsFromTestCase(TestRendering))
+    test_suite.addTests(unittest.TestLoader().loadTestsFromTestCase(TestBasketView))
+    test_suite.addTests(unittest.TestLoader().loadTestsFromTestCase(TestLogBuffer))
+    test_suite.addTests(unittest.TestLoader().loadTestsFromTestCase(TestLogView))
+    test_suite.addTests(unittest.TestLoader().loadTestsFromTestCase(TestStatisticsDashboard))
+    test_suite.addTests(unittest.TestLoader().loadTestsFromTestCase(TestStartup))
+    test_suite.addTests(unittest.TestLoader().loadTestsFromTestCase(TestBenchModels))
+    test_suite.addTests(unittest.TestLoader().loadTestsFromTestCase(TestLatencyHistogram))
+    test_suite.addTests(unittest.TestLoader().loadTestsFromTestCase(TestRollingTimeSeries))
+    test_suite.addTests(unittest.TestLoader().loadTestsFromTestCase(TestSpaceSaving))
+    test_suite.addTests(unittest.TestLoader().loadTestsFromTestCase(TestHyperLogLog))
+    test_suite.addTests(unittest.TestLoader().loadTestsFromTestCase(TestSQLiteLogStore))
     
-    def test_add_item(self):
-        self.person.add_item(self.item)
-        self.assertEqual(len(self.person.items), 1)
-        self.assertEqual(self.person.items[0], self.item)
+    # Run the test suite
+    runner = unittest.TextTestRunner(verbosity=2)
+    result = runner.run(test_suite)
     
-    def test_person_string_representation(self):
-        expected = "Test Person is carrying 0 item(s)."
-        self.assertEqual(str(self.person), expected)
-        
-        self.person.add_item(self.item)
-        expected = "Test Person is carrying 1 item(s)."
-        self.assertEqual(str(self.person), expected)
-
+    return result.wasSuccessful()
 
-class TestCashier(unittest.TestCase):
-    def setUp(self):
-        self.cashier = Cashier("Test Cashier")
-        self.person = Person("Test Person")
-        self.item = Item("Test Item", "TEST001")
-        self.person.add_item(self.item)
+def run_benchmarks():
+    # The benchmarks live in benchmarks/, which is not a package
+    sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'benchmarks'))
+    from bench_models import main
     
-    def test_scan_and_deactivate(self):
-        result = self.cashier.scan_and_deactivate(self.person)
-        self.assertIn("Test Cashier is scanning Test Person's items", result)
-        self.assertIn("Scanning Test Item", result)
-        self.assertTrue(self.item.is_deactivated)
+    # Extra arguments after --bench go to the benchmark suite (e.g. --compare FILE)
+    return main(['--quick'] + sys.argv[sys.argv.index('--bench') + 1:]) == 0
 
-
-class TestGate(unittest.TestCase):
-    def setUp(self):
-        self.gate = Gate()
-        self.person = Person("Test Person")
-        self.item = Item("Test Item", "TEST001")
-        self.person.add_item(self.item)
-    
-    def test_gate_scan_with_active_tag(self):
-        result, alert = self.gate.scan(self.person)
-        self.assertIn("Scanning Test Person at the exit gate", result)
-        self.assertIn("ALERT: Active tag detected!", result)
-        self.assertTrue(alert)
-    
-    def test_gate_scan_with_deactivated_tag(self):
-        self.item.is_deactivated = True
-        result, alert = self.gate.scan(self.person)
-        self.assertIn("All items are safe", result)
-        self.assertFalse(alert)
\ No newline at end of file
+if __name__ == '__main__':
+    success = run_tests()
+    if success and '--bench' in sys.argv:
+        success = run_benchmarks()
+    sys.exit(0 if success else 1)
\ No newline at end of file
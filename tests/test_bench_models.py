@@ -0,0 +1,41 @@
+import os
+import sys
+import unittest
+
+# The benchmarks live in benchmarks/, which is not a package
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'benchmarks'))
+
+from bench_models import BENCHMARKS, SIMULATIONS, compare, run_case, run_simulation
+
+class TestBenchModels(unittest.TestCase):
+    def test_every_benchmark_runs(self):
+        for name in BENCHMARKS:
+            result = run_case(name, basket=3, history=10, rounds=1)
+            self.assertEqual(result['benchmark'], name)
+            self.assertGreater(result['ops_per_sec'], 0)
+            self.assertAlmostEqual(result['items_per_sec'], result['ops_per_sec'] * 3)
+            self.assertGreater(result['alloc_peak_bytes'], 0)
+    
+    def test_simulation_cases_run(self):
+        for name in SIMULATIONS:
+            result = run_simulation(name, customers=200, rounds=1)
+            self.assertEqual(result['repeats'], 200)
+            self.assertAlmostEqual(result['customers_per_min'], result['ops_per_sec'] * 60)
+            self.assertGreater(result['items_per_sec'], result['ops_per_sec'])
+            self.assertGreater(result['alloc_peak_bytes'], 0)
+        
+        baseline = {'results': [dict(result, ops_per_sec=result['ops_per_sec'] * 2)]}
+        self.assertEqual(len(compare([result], baseline, threshold=0.2)), 1)
+    
+    def test_compare_flags_slower_cases(self):
+        def result(name, ops):
+            return {'benchmark': name, 'basket': 10, 'history': 0, 'ops_per_sec': ops}
+        
+        baseline = {'results': [result('gate_scan_paid', 1000.0), result('add_item', 1000.0)]}
+        current = [result('gate_scan_paid', 700.0), result('add_item', 900.0),
+                   result('log_gate_scan', 1.0)]
+        regressions = compare(current, baseline, threshold=0.2)
+        
+        self.assertEqual(len(regressions), 1)
+        self.assertEqual(regressions[0][0]['benchmark'], 'gate_scan_paid')
+        self.assertAlmostEqual(regressions[0][2], 0.7)
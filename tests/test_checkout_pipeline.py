@@ -0,0 +1,79 @@
+import asyncio
+import unittest
+from models import Cashier, Gate, TagRegistry
+from checkout_pipeline import (CheckoutPipeline, RoundRobin, fewest_items, make_customers,
+                               run_pipeline, shortest_queue)
+
+class TestCheckoutPipeline(unittest.TestCase):
+    def run_customers(self, pipeline, count, **kwargs):
+        customers = make_customers(count, pipeline.registry, seed=3, **kwargs)
+        return asyncio.run(pipeline.run(customers))
+    
+    def test_thousands_of_concurrent_customers(self):
+        pipeline = CheckoutPipeline(num_lanes=4)
+        stats = self.run_customers(pipeline, 3000)
+        
+        self.assertEqual(stats['customers'], 3000)
+        self.assertEqual(stats['checkouts'], 3000)
+        self.assertEqual(stats['alerts'], 0)
+        self.assertEqual(sum(stats['lane_customers']), 3000)
+        self.assertEqual(pipeline.gate.total_scans, 3000)
+        self.assertEqual(len(pipeline.registry), 0)
+        self.assertGreater(stats['throughput'], 0)
+        self.assertGreater(stats['max_queue_length'], 1)
+    
+    def test_skipped_checkout_triggers_alert(self):
+        pipeline = CheckoutPipeline(num_lanes=2)
+        stats = self.run_customers(pipeline, 200, theft_probability=0.5)
+        
+        self.assertEqual(stats['checkouts'] + stats['skipped_checkout'], 200)
+        self.assertEqual(stats['alerts'], stats['skipped_checkout'])
+        self.assertGreater(stats['alerts'], 0)
+    
+    def test_uses_given_cashiers_and_gate(self):
+        registry = TagRegistry()
+        cashiers = [Cashier("Sarah", registry=registry), Cashier("Tom", registry=registry)]
+        gate = Gate(registry=registry)
+        events = []
+        pipeline = CheckoutPipeline(cashiers=cashiers, gate=gate, registry=registry,
+                                    listener=lambda event, person, detail: events.append(event))
+        self.run_customers(pipeline, 50)
+        
+        self.assertEqual(sum(len(c.get_transaction_history()) for c in cashiers), 50)
+        self.assertEqual(sum(c.items_processed for c in cashiers),
+                         sum(r['items'] for r in gate.get_scan_history()))
+        self.assertEqual(events.count('checkout'), 50)
+        self.assertEqual(events.count('exit'), 50)
+    
+    def test_failing_lane_stops_the_run(self):
+        class BrokenCashier(Cashier):
+            def scan_item(self, item):
+                raise RuntimeError("scanner offline")
+        
+        registry = TagRegistry()
+        cashiers = [Cashier("Sarah", registry=registry), BrokenCashier("Tom", registry=registry)]
+        pipeline = CheckoutPipeline(cashiers=cashiers, registry=registry, policy=RoundRobin())
+        with self.assertRaisesRegex(RuntimeError, "scanner offline"):
+            self.run_customers(pipeline, 20)
+    
+    def test_failing_gate_stops_the_run(self):
+        pipeline = CheckoutPipeline(num_lanes=2)
+        pipeline.gate.scan = lambda person: 1 / 0
+        with self.assertRaises(ZeroDivisionError):
+            self.run_customers(pipeline, 20)
+    
+    def test_lane_policies(self):
+        pipeline = CheckoutPipeline(num_lanes=3, policy=RoundRobin())
+        stats = self.run_customers(pipeline, 30)
+        self.assertEqual(stats['lane_customers'], [10, 10, 10])
+        
+        for policy in (shortest_queue, fewest_items):
+            stats = run_pipeline(300, num_lanes=3, policy=policy, seed=1)
+            self.assertTrue(all(served > 0 for served in stats['lane_customers']))
+    
+    def test_item_delay_measures_waits_and_utilization(self):
+        stats = run_pipeline(20, num_lanes=2, item_delay=0.001, seed=2)
+        
+        self.assertGreater(stats['avg_queue_wait'], 0)
+        self.assertGreaterEqual(stats['max_queue_wait'], stats['avg_queue_wait'])
+        self.assertTrue(all(0 < u <= 1.0 for u in stats['lane_utilization']))
@@ -0,0 +1,98 @@
+import unittest
+import sys
+import threading
+from datetime import datetime
+from models import Item, Person, Gate, TagRegistry
+from gate_service import MultiLaneGate
+
+class TestMultiLaneGate(unittest.TestCase):
+    def setUp(self):
+        self.milk = Item("Milk", "RFID001", price=3.99, category="Dairy")
+    
+    def make_person(self, registry, name, pay, hour):
+        person = Person(name)
+        for _ in range(2):
+            person.add_item(registry.create_unit(self.milk))
+        if pay:
+            for item in person.items:
+                item.deactivate()
+        return person, datetime(2024, 3, 4, hour, 0)
+    
+    def test_merged_stats_match_single_gate(self):
+        registry = TagRegistry()
+        service = MultiLaneGate(num_lanes=3)
+        single = Gate()
+        for i in range(30):
+            person, timestamp = self.make_person(registry, f"Person {i}", i % 4 != 0, 8 + i % 5)
+            service.scan(i % 3, person, timestamp=timestamp)
+            single.scan(person, timestamp=timestamp)
+        
+        merged = service.get_stats()
+        expected = single.get_stats()
+        for key in ('total_scans', 'alerts_triggered', 'alert_rate', 'peak_hours'):
+            self.assertEqual(merged[key], expected[key])
+        self.assertEqual(service.get_tag_counts(), single.alert_patterns)
+        self.assertEqual(sum(lane['total_scans'] for lane in merged['lanes']), 30)
+        self.assertEqual(merged['scan_latency']['count'], 30)
+        self.assertEqual(merged['last_hour'], expected['last_hour'])
+        self.assertEqual(merged['unique'], expected['unique'])
+        self.assertEqual(service.get_recent_traffic(24 * 60), single.get_recent_traffic(24 * 60))
+        
+        self.assertEqual(set(merged) - {'lanes'}, set(expected))
+        for key in ('avg_items_per_scan', 'alerted_value'):
+            self.assertAlmostEqual(merged[key], expected[key])
+        for key in ('scans', 'alerts', 'avg_items', 'total_value', 'alerted_value'):
+            self.assertAlmostEqual(merged['window'][key], expected['window'][key])
+    
+    def test_concurrent_lanes_keep_exact_totals(self):
+        lanes = 8
+        per_lane = 1500
+        registry = TagRegistry()
+        service = MultiLaneGate(num_lanes=lanes, registry=registry)
+        
+        # Build customers up front so the threads only exercise the scan path
+        customers = [
+            [self.make_person(registry, f"Lane {lane} Person {i}", i % 5 != 0, i % 24)
+             for i in range(per_lane)]
+            for lane in range(lanes)
+        ]
+        barrier = threading.Barrier(lanes)
+        errors = []
+        
+        def run_lane(lane):
+            try:
+                barrier.wait()
+                for person, timestamp in customers[lane]:
+                    service.scan(lane, person, timestamp=timestamp)
+            except Exception as e:
+                errors.append(e)
+        
+        interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        try:
+            threads = [threading.Thread(target=run_lane, args=(lane,)) for lane in range(lanes)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        finally:
+            sys.setswitchinterval(interval)
+        
+        self.assertEqual(errors, [])
+        stats = service.get_stats()
+        alerts_per_lane = len(range(0, per_lane, 5))
+        self.assertEqual(stats['total_scans'], lanes * per_lane)
+        self.assertEqual(stats['alerts_triggered'], lanes * alerts_per_lane)
+        self.assertEqual(sum(stats['peak_hours']['hourly_traffic'].values()), lanes * per_lane)
+        # Each lane tracks fewer tags than its capacity, so its counts are exact
+        for lane in service.lanes:
+            self.assertEqual(sum(lane.alert_patterns.values()), alerts_per_lane * 2)
+        self.assertEqual(service.get_alert_tags().total, lanes * alerts_per_lane * 2)
+        
+        # Safe exits retired their tags from the shared registry; alerts kept theirs
+        self.assertEqual(len(registry), lanes * alerts_per_lane * 2)
+        self.assertEqual(registry.active_count, lanes * alerts_per_lane * 2)
+    
+    def test_requires_a_lane(self):
+        with self.assertRaises(ValueError):
+            MultiLaneGate(num_lanes=0)
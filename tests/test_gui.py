@@ -0,0 +1,157 @@
+import unittest
+from gui import BasketView, LogBuffer, LogView
+from models import Item
+
+class FakeText:
+    """Minimal stand-in for tk.Text that understands line.column indexes."""
+    def __init__(self):
+        self.content = "\n"
+        self.edits = 0
+    
+    def config(self, **options):
+        pass
+    
+    def index(self, index):
+        lines = self.content.split("\n")
+        if index == "end-1c":
+            return len(self.content) - 1
+        row, column = index.split(".")
+        offset = sum(len(line) + 1 for line in lines[:int(row) - 1])
+        return offset + (len(lines[int(row) - 1]) if column == "end" else int(column))
+    
+    def insert(self, index, text):
+        position = self.index(index)
+        self.content = self.content[:position] + text + self.content[position:]
+        self.edits += 1
+    
+    def delete(self, start, end):
+        self.content = self.content[:self.index(start)] + self.content[self.index(end):]
+        self.edits += 1
+    
+    def get(self):
+        return self.content[:-1]
+
+class TestBasketView(unittest.TestCase):
+    def setUp(self):
+        self.text = FakeText()
+        self.view = BasketView(self.text)
+    
+    def test_renders_whole_basket(self):
+        items = [Item("Milk", "RFID001", price=3.99), Item("Bread", "RFID002", price=2.49)]
+        self.view.render([])
+        self.assertEqual(self.text.get(), "Basket is empty")
+        
+        self.view.render(items)
+        self.assertEqual(self.text.get(), "\n".join(BasketView.format_lines(items)))
+        self.assertIn("Total: $6.48", self.text.get())
+        
+        self.view.render([])
+        self.assertEqual(self.text.get(), "Basket is empty")
+    
+    def test_only_changed_lines_are_edited(self):
+        items = [Item(f"Item {i}", f"RFID{i:03d}", price=1.0) for i in range(200)]
+        self.view.render(items)
+        
+        edits = self.text.edits
+        items.append(Item("Extra", "RFID999", price=2.0))
+        self.view.render(items)
+        self.assertLessEqual(self.text.edits - edits, 5)
+        
+        edits = self.text.edits
+        items[10].deactivate()
+        self.view.render(items)
+        self.assertEqual(self.text.edits - edits, 2)
+        self.assertEqual(self.text.get(), "\n".join(BasketView.format_lines(items)))
+        
+        edits = self.text.edits
+        self.view.render(items)
+        self.assertEqual(self.text.edits, edits)
+
+class FakeScrollbar:
+    def __init__(self):
+        self.position = None
+    
+    def set(self, first, last):
+        self.position = (first, last)
+
+class TestLogBuffer(unittest.TestCase):
+    def test_line_cap_drops_oldest_lines(self):
+        buffer = LogBuffer(max_lines=100)
+        for i in range(250):
+            buffer.append(f"line {i}\n", alert=(i % 10 == 0), customer=f"Customer {i % 5}")
+        
+        self.assertEqual(len(buffer), 100)
+        self.assertEqual(buffer.window(None, 0, 1), ["line 150"])
+        self.assertEqual(len(buffer.alert_seqs), 10)
+        self.assertEqual(sum(len(seqs) for seqs in buffer.customer_seqs.values()), 100)
+        rows = buffer.rows(alerts_only=True, customer="Customer 0")
+        self.assertEqual(buffer.window(rows, 0, 20), [f"line {i}" for i in range(150, 250, 10)])
+    
+    def test_windows_after_the_ring_wraps(self):
+        buffer = LogBuffer(max_lines=1000)
+        for i in range(2500):
+            buffer.append(f"line {i}", alert=(i % 7 == 0))
+        
+        self.assertEqual(buffer.slots[0], ("line 2000", False, None))
+        self.assertEqual(buffer.window(None, 500, 3), ["line 2000", "line 2001", "line 2002"])
+        self.assertEqual(buffer.window(None, 998, 10), ["line 2498", "line 2499"])
+        alerts = [f"line {i}" for i in range(1500, 2500) if i % 7 == 0]
+        rows = buffer.rows(alerts_only=True)
+        self.assertEqual(buffer.window(rows, 70, 5), alerts[70:75])
+    
+    def test_filters(self):
+        buffer = LogBuffer()
+        buffer.append("\nfirst\nsecond\n", customer="Ann")
+        buffer.append("alert\n", alert=True, customer="Bob")
+        buffer.append("summary\n")
+        
+        self.assertEqual(buffer.window(None, 0, 10), ["", "first", "second", "alert", "summary"])
+        rows = buffer.rows(alerts_only=True)
+        self.assertEqual(buffer.window(rows, 0, 10), ["alert"])
+        rows = buffer.rows(customer="Ann")
+        self.assertEqual(buffer.window(rows, 1, 10), ["first", "second"])
+        self.assertEqual(len(buffer.rows(alerts_only=True, customer="Ann")), 0)
+        rows = buffer.rows(alerts_only=True, customer="Bob")
+        self.assertEqual(buffer.window(rows, 0, 10), ["alert"])
+        self.assertEqual(len(buffer.rows(customer="Nobody")), 0)
+
+class TestLogView(unittest.TestCase):
+    def setUp(self):
+        self.text = FakeText()
+        self.scrollbar = FakeScrollbar()
+        self.view = LogView(self.text, self.scrollbar, LogBuffer(max_lines=1000), height=5)
+    
+    def test_widget_only_holds_visible_window(self):
+        for i in range(500):
+            self.view.buffer.append(f"line {i}", alert=(i % 50 == 0), customer=f"Customer {i % 3}")
+        self.view.render()
+        
+        self.assertEqual(self.text.get().split("\n"), [f"line {i}" for i in range(495, 500)])
+        self.assertEqual(self.scrollbar.position, (0.99, 1.0))
+        
+        self.view.yview('moveto', '0.0')
+        self.assertFalse(self.view.follow)
+        self.assertEqual(self.text.get().split("\n")[0], "line 0")
+        self.view.yview('scroll', '1', 'pages')
+        self.assertEqual(self.text.get().split("\n")[0], "line 5")
+        
+        # New lines do not move a view that is scrolled up
+        self.view.buffer.append("line 500")
+        self.view.render()
+        self.assertEqual(self.text.get().split("\n")[0], "line 5")
+    
+    def test_filters_replace_only_the_window(self):
+        for i in range(500):
+            self.view.buffer.append(f"line {i}", alert=(i % 50 == 0), customer=f"Customer {i % 3}")
+        self.view.render()
+        
+        edits = self.text.edits
+        self.view.set_filter(alerts_only=True)
+        self.assertEqual(self.text.get().split("\n"), [f"line {i}" for i in range(250, 500, 50)])
+        self.assertLessEqual(self.text.edits - edits, 2 * self.view.height)
+        
+        self.view.set_filter(customer="Customer 1")
+        self.assertEqual(self.text.get().split("\n")[-1], "line 499")
+        self.view.set_filter(alerts_only=True, customer="Nobody")
+        self.assertEqual(self.text.get(), "")
+        self.assertEqual(self.scrollbar.position, (0.0, 1.0))
@@ -0,0 +1,81 @@
+import unittest
+import os
+import json
+from datetime import datetime, timedelta
+from history import History, close_all
+
+class TestHistory(unittest.TestCase):
+    def setUp(self):
+        self.spill_file = "test_history_spill.jsonl"
+        self.start = datetime(2024, 3, 4, 9, 0)
+    
+    def tearDown(self):
+        if os.path.exists(self.spill_file):
+            os.remove(self.spill_file)
+    
+    def record(self, i, seconds=None):
+        return {'timestamp': self.start + timedelta(seconds=i if seconds is None else seconds), 'n': i}
+    
+    def test_unbounded(self):
+        history = History()
+        for i in range(100):
+            history.append(self.record(i))
+        self.assertEqual(len(history), 100)
+        self.assertEqual(history.evicted, 0)
+    
+    def test_capacity_eviction(self):
+        history = History(max_items=3)
+        for i in range(10):
+            history.append(self.record(i))
+        self.assertEqual([r['n'] for r in history], [7, 8, 9])
+        self.assertEqual(history.appended, 10)
+        self.assertEqual(history.evicted, 7)
+        self.assertEqual(history[-1]['n'], 9)
+    
+    def test_age_eviction(self):
+        history = History(max_age=60)
+        for i in range(5):
+            history.append(self.record(i, seconds=i * 30))
+        # Newest record is at 120s; anything before 60s has expired
+        self.assertEqual([r['n'] for r in history], [2, 3, 4])
+    
+    def test_spill_file(self):
+        history = History(max_items=2, spill_file=self.spill_file)
+        for i in range(5):
+            history.append(self.record(i))
+        history.flush()
+        with open(self.spill_file) as f:
+            spilled = [json.loads(line)['n'] for line in f]
+        self.assertEqual(spilled, [0, 1, 2])
+    
+    def test_close_writes_unflushed_spill(self):
+        history = History(max_items=2, spill_file=self.spill_file)
+        for i in range(5):
+            history.append(self.record(i))
+        self.assertFalse(os.path.exists(self.spill_file))
+        history.close()
+        with open(self.spill_file) as f:
+            self.assertEqual([json.loads(line)['n'] for line in f], [0, 1, 2])
+    
+    def test_close_all_writes_every_unflushed_spill_once(self):
+        from logger import SystemLogger
+        log_files = ("test_history_alerts.csv", "test_history_alerts.jsonl")
+        logger = SystemLogger(*log_files, async_writes=True)
+        history = History(max_items=1, spill_file=self.spill_file)
+        for i in range(3):
+            history.append(self.record(i))
+        try:
+            # The logger leaves spills to the application's shutdown path
+            logger.close()
+            self.assertFalse(os.path.exists(self.spill_file))
+            close_all()
+            with open(self.spill_file) as f:
+                self.assertEqual([json.loads(line)['n'] for line in f], [0, 1])
+            # Nothing left to write, so a second shutdown adds nothing
+            close_all()
+            with open(self.spill_file) as f:
+                self.assertEqual(len(f.readlines()), 2)
+        finally:
+            for path in log_files:
+                if os.path.exists(path):
+                    os.remove(path)
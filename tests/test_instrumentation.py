@@ -0,0 +1,81 @@
+import unittest
+import pickle
+import random
+from instrumentation import LatencyHistogram, merge_histograms
+
+class TestLatencyHistogram(unittest.TestCase):
+    def test_empty(self):
+        stats = LatencyHistogram().get_stats()
+        self.assertEqual(stats['count'], 0)
+        for key in ('mean', 'min', 'p50', 'p95', 'p99', 'max'):
+            self.assertEqual(stats[key], 0)
+
+    def test_small_values_are_exact(self):
+        histogram = LatencyHistogram()
+        for value in range(1, 101):
+            histogram.record(value)
+        self.assertEqual(histogram.percentiles(50, 95, 99, 100), [50, 95, 99, 100])
+        self.assertEqual(histogram.minimum, 1)
+        self.assertEqual(histogram.mean, 50.5)
+
+    def test_buckets_are_contiguous(self):
+        histogram = LatencyHistogram(significant_bits=4)
+        previous_high = -1
+        for index in range(200):
+            low, high = histogram.bucket_bounds(index)
+            self.assertEqual(low, previous_high + 1)
+            self.assertEqual(histogram.bucket_index(low), index)
+            self.assertEqual(histogram.bucket_index(high), index)
+            previous_high = high
+
+    def test_percentiles_within_relative_error(self):
+        rng = random.Random(3)
+        values = sorted(int(rng.lognormvariate(10, 2)) for _ in range(20000))
+        histogram = LatencyHistogram()
+        for value in values:
+            histogram.record(value)
+        for percent in (50, 95, 99, 99.9):
+            exact = values[int(len(values) * percent / 100) - 1]
+            reported = histogram.percentile(percent)
+            self.assertGreaterEqual(reported, exact)
+            self.assertLessEqual(reported, exact * (1 + 2 ** -6) + 1)
+        self.assertEqual(histogram.percentile(100), values[-1])
+        self.assertEqual(histogram.get_stats()['max'], values[-1] / 1e9)
+
+    def test_tail_is_not_hidden_by_mean(self):
+        histogram = LatencyHistogram()
+        for _ in range(990):
+            histogram.record(1000)
+        for _ in range(10):
+            histogram.record(5000000)
+        stats = histogram.get_stats()
+        self.assertLess(stats['p50'], 2e-6)
+        self.assertLess(stats['p95'], 2e-6)
+        self.assertGreater(stats['max'], 4e-3)
+        self.assertGreater(histogram.percentile(99.5), 4000000)
+
+    def test_merge_is_exact(self):
+        rng = random.Random(5)
+        values = [rng.randrange(10 ** 9) for _ in range(3000)]
+        single = LatencyHistogram()
+        parts = [LatencyHistogram() for _ in range(3)]
+        for i, value in enumerate(values):
+            single.record(value)
+            parts[i % 3].record(value)
+        merged = merge_histograms(parts)
+        self.assertEqual(merged.counts, single.counts)
+        self.assertEqual(merged.get_stats(), single.get_stats())
+        with self.assertRaises(ValueError):
+            merged.merge(LatencyHistogram(significant_bits=5))
+
+    def test_timer_and_pickling(self):
+        histogram = LatencyHistogram()
+        with histogram.time() as timer:
+            sum(range(1000))
+        self.assertEqual(histogram.count, 1)
+        self.assertEqual(histogram.maximum, timer.elapsed)
+        copy = pickle.loads(pickle.dumps(histogram))
+        self.assertEqual(copy.get_stats(), histogram.get_stats())
+
+if __name__ == '__main__':
+    unittest.main()
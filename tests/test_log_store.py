@@ -0,0 +1,117 @@
+import unittest
+from unittest import mock
+import os
+import random
+import threading
+from datetime import datetime, timedelta
+from log_store import SQLiteLogStore
+from logger import SystemLogger
+from models import Item, Person
+
+class TestSQLiteLogStore(unittest.TestCase):
+    def setUp(self):
+        self.db_file = "test_alerts.db"
+        self.store = SQLiteLogStore(self.db_file)
+        self.base = datetime(2024, 1, 1, 9, 0, 0)
+        rng = random.Random(5)
+        self.records = []
+        for i in range(2000):
+            timestamp = self.base + timedelta(seconds=30 * i)
+            entry = {
+                'timestamp': timestamp.strftime("%Y-%m-%d %H:%M:%S"),
+                'person': f"Customer {i % 50}",
+                'items': [["Milk", 2.99], ["Bread", 1.5]][:rng.randint(0, 2)],
+                'alert': rng.random() < 0.1,
+                'total_value': round(rng.uniform(0, 100), 2),
+                'duration': rng.uniform(30, 600)
+            }
+            self.records.append((entry, timestamp.timestamp()))
+        for i in range(0, len(self.records), 100):
+            self.store.write(self.records[i:i + 100])
+        self.entries = [entry for entry, _ in self.records]
+
+    def tearDown(self):
+        self.store.close()
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(self.db_file + suffix):
+                os.remove(self.db_file + suffix)
+
+    def test_schema_and_wal(self):
+        connection = self.store.connection()
+        self.assertEqual(connection.execute("PRAGMA journal_mode").fetchone()[0], "wal")
+        indexes = {row[1] for row in connection.execute("PRAGMA index_list(scans)")}
+        self.assertEqual(indexes, {"scans_timestamp", "scans_person", "scans_alert"})
+        self.assertEqual(self.store.rows_written, 2000)
+
+    def test_round_trip(self):
+        self.assertEqual(self.store.query(), self.entries)
+        self.assertEqual(self.store.query(limit=3, newest_first=True), self.entries[::-1][:3])
+
+    def test_filters_use_indexes(self):
+        start, end = self.base + timedelta(hours=2), self.base + timedelta(hours=3)
+        window = [e for e in self.entries
+                  if start.strftime("%Y-%m-%d %H:%M:%S") <= e['timestamp'] < end.strftime("%Y-%m-%d %H:%M:%S")]
+        self.assertEqual(self.store.query(start, end), window)
+        self.assertEqual(self.store.count(start, end), 120)
+        self.assertEqual(self.store.query(start, end, alerts_only=True),
+                         [e for e in window if e['alert']])
+        self.assertEqual(self.store.query(person="Customer 7"),
+                         [e for e in self.entries if e['person'] == "Customer 7"])
+        self.assertEqual(self.store.count(alerts_only=True), sum(e['alert'] for e in self.entries))
+
+        connection = self.store.connection()
+        for args, index in (((start, end, None, False), "scans_timestamp"),
+                            ((None, None, "Customer 7", False), "scans_person"),
+                            ((start, end, None, True), "scans_alert")):
+            where, params = self.store.where(*args)
+            plan = " ".join(row[-1] for row in connection.execute(
+                f"EXPLAIN QUERY PLAN SELECT * FROM scans{where} ORDER BY timestamp", params))
+            self.assertIn(index, plan)
+
+    def test_summary(self):
+        summary = self.store.summary()
+        self.assertEqual(summary['scans'], 2000)
+        self.assertEqual(summary['alerts'], sum(e['alert'] for e in self.entries))
+        self.assertAlmostEqual(summary['total_value'], sum(e['total_value'] for e in self.entries))
+        self.assertEqual(summary['first'], self.base)
+        self.assertEqual(summary['last'], self.base + timedelta(seconds=30 * 1999))
+        empty = self.store.summary(start=self.base + timedelta(days=1))
+        self.assertEqual(empty['scans'], 0)
+        self.assertIsNone(empty['first'])
+
+    def test_reads_from_another_thread(self):
+        counts = []
+        reader = threading.Thread(target=lambda: counts.append(self.store.count()))
+        reader.start()
+        reader.join()
+        self.assertEqual(counts, [2000])
+        self.assertEqual(len(self.store._connections), 2)
+
+    def test_logger_writes_through_store(self):
+        files = ("test_store_alerts.csv", "test_store_alerts.jsonl")
+        logger = SystemLogger(*files, async_writes=True, store=SQLiteLogStore(self.db_file))
+        try:
+            person = Person("Store Person")
+            item = Item("Test Item", "TEST001")
+            item.price = 4.0
+            person.add_item(item)
+            for alert in (True, False, True):
+                logger.log_gate_scan(person, alert)
+            scans = logger.query_scans(person="Store Person")
+            self.assertEqual(scans, logger.log_entries)
+            self.assertEqual(len(logger.query_scans(person="Store Person", alerts_only=True)), 2)
+
+            with mock.patch('logger.messagebox'):
+                logger.generate_report(3, 2, 1, ["Store Person"])
+            with open('summary_report.txt') as f:
+                report = f.read()
+            self.assertIn("=== Stored Log ===", report)
+            self.assertIn("Scans Stored: 2003", report)
+        finally:
+            logger.close()
+            for path in files + ('summary_report.txt',):
+                if os.path.exists(path):
+                    os.remove(path)
+
+if __name__ == '__main__':
+    unittest.main()
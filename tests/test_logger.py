@@ -1,22 +1,33 @@
 import unittest
+from unittest import mock
 import os
 import csv
-from datetime import datetime
+import json
+import shutil
+import tempfile
+import threading
+from datetime import datetime, timedelta
 from models import Item, Person
-from logger import SystemLogger
+from logger import SystemLogger, RunningStats
+from log_segments import open_segment
 
 class TestSystemLogger(unittest.TestCase):
     def setUp(self):
         self.test_log_file = "test_alerts.csv"
-        self.logger = SystemLogger(self.test_log_file)
+        self.test_json_file = "test_alerts.jsonl"
+        self.test_index_file = "test_alerts.idx"
+        self.test_export_file = "test_alerts.json"
+        self.logger = SystemLogger(self.test_log_file, self.test_json_file)
         self.person = Person("Test Person")
         self.item = Item("Test Item", "TEST001")
         self.person.add_item(self.item)
     
     def tearDown(self):
         # Clean up test files after each test
-        if os.path.exists(self.test_log_file):
-            os.remove(self.test_log_file)
+        for path in (self.test_log_file, self.test_json_file,
+                     self.test_index_file, self.test_export_file):
+            if os.path.exists(path):
+                os.remove(path)
         if os.path.exists("summary_report.txt"):
             os.remove("summary_report.txt")
     
@@ -25,7 +36,8 @@ class TestSystemLogger(unittest.TestCase):
         with open(self.test_log_file, 'r') as f:
             reader = csv.reader(f)
             header = next(reader)
-            expected_header = ['Timestamp', 'Person', 'Items', 'Alert', 'Details']
+            expected_header = ['Timestamp', 'Person', 'Items', 'Alert', 'Details',
+                               'Total Value', 'Duration']
             self.assertEqual(header, expected_header)
     
     def test_log_gate_scan(self):
@@ -40,11 +52,161 @@ class TestSystemLogger(unittest.TestCase):
             datetime.strptime(row[0], "%Y-%m-%d %H:%M:%S")
             
             self.assertEqual(row[1], "Test Person")
-            self.assertEqual(row[2], "Test Item")
+            self.assertEqual(row[2], "Test Item ($0.00)")
             self.assertEqual(row[3], "Yes")
             self.assertEqual(row[4], "Undeactivated tags detected")
     
-    def test_generate_report(self):
+    def test_json_log_is_append_only(self):
+        self.logger.log_gate_scan(self.person, True)
+        self.logger.log_gate_scan(self.person, False)
+        
+        with open(self.test_json_file, 'r') as f:
+            lines = f.read().splitlines()
+        self.assertEqual(len(lines), 2)
+        self.assertTrue(json.loads(lines[0])['alert'])
+        self.assertFalse(json.loads(lines[1])['alert'])
+    
+    def test_index_file(self):
+        self.logger = SystemLogger(self.test_log_file, self.test_json_file,
+                                   index_file=self.test_index_file)
+        for _ in range(5):
+            self.logger.log_gate_scan(self.person, False)
+        self.logger.log_gate_scan(self.person, True)
+        
+        self.assertEqual(self.logger.get_entry_count(), 6)
+        entries = self.logger.read_json_entries(start=5)
+        self.assertEqual(len(entries), 1)
+        self.assertTrue(entries[0]['alert'])
+        self.assertEqual(len(self.logger.read_json_entries(1, 3)), 2)
+    
+    def test_rebuild_index(self):
+        for _ in range(3):
+            self.logger.log_gate_scan(self.person, False)
+        self.logger = SystemLogger(self.test_log_file, self.test_json_file,
+                                   index_file=self.test_index_file)
+        self.assertEqual(self.logger.get_entry_count(), 3)
+        self.assertEqual(len(self.logger.read_json_entries(start=2)), 1)
+    
+    def test_export_json_array(self):
+        self.logger.log_gate_scan(self.person, True)
+        self.logger.log_gate_scan(self.person, False)
+        self.logger.export_json_array(self.test_export_file)
+        
+        with open(self.test_export_file, 'r') as f:
+            exported = f.read()
+        self.assertEqual(exported, json.dumps(self.logger.log_entries, indent=2))
+    
+    def test_async_writer_batches_and_flushes(self):
+        self.logger = SystemLogger(self.test_log_file, self.test_json_file,
+                                   async_writes=True, batch_size=10, flush_interval=5.0)
+        for _ in range(25):
+            self.logger.log_gate_scan(self.person, False)
+        self.logger.flush()
+        
+        stats = self.logger.get_writer_stats()
+        self.assertEqual(stats['queue_depth'], 0)
+        self.assertEqual(stats['records_written'], 25)
+        self.assertLessEqual(stats['batches_written'], 3)
+        self.assertGreater(stats['max_write_latency'], 0)
+        self.assertEqual(stats['write_latency']['count'], stats['batches_written'])
+        with open(self.test_log_file, 'r') as f:
+            self.assertEqual(len(list(csv.reader(f))), 26)
+        self.logger.close()
+    
+    def test_async_writer_close_writes_pending(self):
+        self.logger = SystemLogger(self.test_log_file, self.test_json_file,
+                                   async_writes=True, flush_interval=5.0)
+        self.logger.log_gate_scan(self.person, True)
+        self.logger.close()
+        
+        self.assertFalse(self.logger._writer.is_alive())
+        with open(self.test_json_file, 'r') as f:
+            self.assertEqual(len(f.read().splitlines()), 1)
+    
+    def test_logging_after_close_writes_synchronously(self):
+        self.logger = SystemLogger(self.test_log_file, self.test_json_file,
+                                   async_writes=True, max_queue_size=1)
+        self.logger.log_gate_scan(self.person, True)
+        self.logger.close()
+        
+        # The writer has stopped, so these must neither be dropped nor
+        # block on the full bounded queue
+        for _ in range(3):
+            self.logger.log_gate_scan(self.person, False)
+        self.assertEqual(self.logger._queue.qsize(), 0)
+        self.assertEqual(self.logger.get_entry_count(), 4)
+        self.assertEqual(self.logger.writer_stats['records_written'], 4)
+    
+    def test_full_queue_drops_scans_instead_of_blocking(self):
+        self.logger = SystemLogger(self.test_log_file, self.test_json_file,
+                                   async_writes=True, batch_size=1, max_queue_size=1)
+        # Hold up the writer so the queue fills
+        with self.logger._write_lock:
+            for _ in range(5):
+                self.logger.log_gate_scan(self.person, False)
+        self.logger.close()
+        
+        stats = self.logger.get_writer_stats()
+        self.assertGreaterEqual(stats['dropped'], 3)
+        self.assertEqual(stats['records_written'] + stats['dropped'], 5)
+        self.assertEqual(len(self.logger.log_entries), 5)
+    
+    @mock.patch('logger.messagebox')
+    def test_worker_thread_errors_wait_for_the_ui_thread(self, messagebox):
+        class BrokenPerson:
+            name = "Broken"
+            def calculate_total(self):
+                raise ValueError("no basket")
+        
+        worker = threading.Thread(target=self.logger.log_gate_scan, args=(BrokenPerson(), True))
+        worker.start()
+        worker.join()
+        messagebox.showerror.assert_not_called()
+        self.assertEqual(self.logger.get_writer_stats()['errors'], 1)
+        
+        self.logger.report_errors()
+        self.logger.report_errors()
+        messagebox.showerror.assert_called_once()
+        self.assertIn("no basket", messagebox.showerror.call_args[0][1])
+    
+    def test_entries_keep_numeric_fields(self):
+        self.item.price = 2.5
+        self.logger.log_gate_scan(self.person, False)
+        entry = self.logger.log_entries[0]
+        self.assertEqual(entry['total_value'], 2.5)
+        self.assertIsInstance(entry['duration'], float)
+        self.assertEqual(entry['items'], [["Test Item", 2.5]])
+        
+        row = SystemLogger.format_csv_row(entry)
+        self.assertEqual(row[2], "Test Item ($2.50)")
+        self.assertEqual(row[5], "$2.50")
+        self.assertTrue(row[6].endswith("s"))
+    
+    def test_query_scans_without_store(self):
+        self.logger.log_gate_scan(self.person, True)
+        self.logger.log_gate_scan(self.person, False)
+        self.assertEqual(self.logger.query_scans(), self.logger.log_entries)
+        self.assertEqual(self.logger.query_scans(alerts_only=True), self.logger.log_entries[:1])
+        self.assertEqual(self.logger.query_scans(person="Nobody"), [])
+        self.assertEqual(self.logger.query_scans(start=datetime.now() + timedelta(minutes=1)), [])
+    
+    def test_get_analytics(self):
+        self.assertIsNone(self.logger.get_analytics())
+        self.item.price = 4.0
+        self.logger.log_gate_scan(self.person, True)
+        self.item.price = 2.0
+        self.logger.log_gate_scan(self.person, False)
+        
+        analytics = self.logger.get_analytics()
+        self.assertEqual(analytics['total_entries'], 2)
+        self.assertEqual(analytics['alert_rate'], 0.5)
+        self.assertAlmostEqual(analytics['avg_basket_value'], 3.0)
+        self.assertEqual(analytics['min_basket_value'], 2.0)
+        self.assertEqual(analytics['max_basket_value'], 4.0)
+        self.assertAlmostEqual(analytics['basket_value_variance'], 1.0)
+    
+    @mock.patch('logger.messagebox')
+    def test_generate_report(self, _messagebox):
         # Test report generation with some sample data
         self.logger.generate_report(
             person_counter=5,
@@ -60,4 +222,141 @@ class TestSystemLogger(unittest.TestCase):
             self.assertIn("Total Alerts: 2", content)
             self.assertIn("Total Safe Scans: 3", content)
             self.assertIn("Person 1", content)
-            self.assertIn("Person 3", content)
\ No newline at end of file
+            self.assertIn("Person 3", content)
+
+
+class TestLogRotation(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.log_file = os.path.join(self.directory, "alerts.csv")
+        self.json_file = os.path.join(self.directory, "alerts.jsonl")
+        self.index_file = os.path.join(self.directory, "alerts.idx")
+        self.base = datetime(2024, 1, 1)
+    
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+    
+    def make_logger(self, **options):
+        return SystemLogger(self.log_file, self.json_file, index_file=self.index_file, **options)
+    
+    def make_records(self, count, step=3600, offset=0):
+        records = []
+        for i in range(offset, offset + count):
+            timestamp = self.base + timedelta(seconds=step * i)
+            entry = {
+                'timestamp': timestamp.strftime("%Y-%m-%d %H:%M:%S"),
+                'person': f"Customer {i}",
+                'items': [["Milk", 2.5]],
+                'alert': i % 4 == 0,
+                'total_value': 2.5,
+                'duration': 60.0
+            }
+            records.append((entry, timestamp.timestamp()))
+        return records
+    
+    def test_daily_rotation_compresses_segments(self):
+        logger = self.make_logger(rotate_daily=True)
+        records = self.make_records(72)
+        logger.write_records(records)
+        logger.close()
+        
+        segments = logger.manifest.segments()
+        self.assertEqual([s['sequence'] for s in segments], [1, 2])
+        self.assertEqual([(s['start'], s['end'], s['entries']) for s in segments],
+                         [("2024-01-01 00:00:00", "2024-01-01 23:00:00", 24),
+                          ("2024-01-02 00:00:00", "2024-01-02 23:00:00", 24)])
+        for segment in segments:
+            self.assertTrue(segment['compressed'])
+            self.assertTrue(segment['jsonl'].endswith(".jsonl.gz"))
+            self.assertTrue(os.path.exists(logger.manifest.resolve(segment['csv'])))
+        self.assertFalse(os.path.exists(os.path.join(self.directory, "alerts.000001.csv")))
+        with open(self.log_file) as f:
+            self.assertEqual(next(csv.reader(f))[0], 'Timestamp')
+            self.assertEqual(len(f.readlines()), 24)
+        
+        entries = [entry for entry, _ in records]
+        self.assertEqual(logger.get_entry_count(), 72)
+        self.assertEqual(logger.read_json_entries(), entries)
+        self.assertEqual(logger.read_json_entries(20, 30), entries[20:30])
+        self.assertEqual(logger.read_json_entries(start=60), entries[60:])
+        
+        exported = os.path.join(self.directory, "alerts.json")
+        logger.export_json_array(exported)
+        with open(exported) as f:
+            self.assertEqual(json.load(f), entries)
+    
+    def test_size_rotation(self):
+        logger = self.make_logger(max_bytes=2000, compress_segments=False)
+        records = self.make_records(60, step=60)
+        for i in range(0, 60, 5):
+            logger.write_records(records[i:i + 5])
+        
+        segments = logger.manifest.segments()
+        self.assertGreaterEqual(len(segments), 2)
+        for segment in segments:
+            self.assertFalse(segment['compressed'])
+            path = logger.manifest.resolve(segment['jsonl'])
+            self.assertLess(os.path.getsize(path), 2000 + 1000)
+        self.assertEqual(sum(s['entries'] for s in segments) + logger.active_segment['entries'], 60)
+        self.assertEqual(logger.read_json_entries(), [entry for entry, _ in records])
+    
+    def test_queries_open_only_overlapping_segments(self):
+        logger = self.make_logger(rotate_daily=True)
+        logger.write_records(self.make_records(96))
+        logger.wait_for_compression()
+        
+        with mock.patch('logger.open_segment', wraps=open_segment) as opened:
+            scans = logger.query_scans(self.base + timedelta(days=1, hours=6),
+                                       self.base + timedelta(days=1, hours=13), alerts_only=True)
+        self.assertEqual([scan['person'] for scan in scans], ["Customer 32", "Customer 36"])
+        self.assertEqual([os.path.basename(call.args[0]) for call in opened.call_args_list],
+                         ["alerts.000002.jsonl.gz"])
+        
+        with mock.patch('logger.open_segment', wraps=open_segment) as opened, \
+                mock.patch('logger.messagebox'):
+            cwd = os.getcwd()
+            os.chdir(self.directory)
+            try:
+                logger.generate_report(0, 0, 0, [], start=self.base + timedelta(days=3))
+            finally:
+                os.chdir(cwd)
+        self.assertEqual([call.args[0] for call in opened.call_args_list], [self.json_file])
+        with open(os.path.join(self.directory, "summary_report.txt")) as f:
+            report = f.read()
+        self.assertIn("Scans Logged: 24", report)
+        self.assertIn("Alerts Logged: 6", report)
+        logger.close()
+    
+    def test_reopening_continues_the_log(self):
+        logger = self.make_logger(rotate_daily=True, compress_segments=False)
+        logger.write_records(self.make_records(30))
+        logger.close()
+        
+        logger = self.make_logger(rotate_daily=True, compress_segments=False)
+        self.assertEqual(logger.active_segment,
+                         {'start': "2024-01-02 00:00:00", 'end': "2024-01-02 05:00:00", 'entries': 6})
+        logger.write_records(self.make_records(24, offset=30))
+        logger.close()
+        self.assertEqual([s['entries'] for s in logger.manifest.segments()], [24, 24])
+        self.assertEqual(logger.get_entry_count(), 54)
+        self.assertEqual(logger.summarize_scans()['scans'], 54)
+
+class TestRunningStats(unittest.TestCase):
+    def test_matches_batch_statistics(self):
+        values = [3.5, 1.0, 7.25, 4.0, 2.0]
+        stats = RunningStats()
+        for value in values:
+            stats.update(value)
+        
+        mean = sum(values) / len(values)
+        self.assertEqual(stats.count, 5)
+        self.assertAlmostEqual(stats.total, sum(values))
+        self.assertAlmostEqual(stats.mean, mean)
+        self.assertAlmostEqual(stats.variance, sum((v - mean) ** 2 for v in values) / len(values))
+        self.assertEqual(stats.minimum, 1.0)
+        self.assertEqual(stats.maximum, 7.25)
+    
+    def test_empty(self):
+        stats = RunningStats()
+        self.assertEqual(stats.variance, 0.0)
+        self.assertIsNone(stats.get_summary()['min'])
\ No newline at end of file
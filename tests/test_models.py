@@ -1,31 +1,339 @@
 import unittest
-import sys
-import os
+import threading
+from datetime import datetime, timedelta
+from models import Item, ItemType, Person, Cashier, Gate, TagRegistry
 
-# Add the parent directory to the Python path
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+class TestItem(unittest.TestCase):
+    def setUp(self):
+        self.item = Item("Test Item", "TEST001")
+    
+    def test_item_creation(self):
+        self.assertEqual(self.item.name, "Test Item")
+        self.assertEqual(self.item.tag_id, "TEST001")
+        self.assertFalse(self.item.is_deactivated)
+    
+    def test_item_string_representation(self):
+        expected = "Test Item (Tag: TEST001, Active, $0.00)"
+        self.assertEqual(str(self.item), expected)
+        
+        self.item.is_deactivated = True
+        expected = "Test Item (Tag: TEST001, Deactivated, $0.00)"
+        self.assertEqual(str(self.item), expected)
+    
+    def test_units_share_product_data(self):
+        milk = Item("Milk", "RFID001", price=3.99, category="Dairy")
+        unit = Item.from_sku(milk.sku, "RFID001-2")
+        self.assertIs(unit.sku, milk.sku)
+        self.assertIs(Item("Milk", "RFID001-3", price=3.99, category="Dairy").sku, milk.sku)
+        self.assertEqual((unit.name, unit.price, unit.category), ("Milk", 3.99, "Dairy"))
+        self.assertFalse(unit.is_deactivated)
+        
+        with self.assertRaises(AttributeError):
+            milk.sku.price = 0.0
+        with self.assertRaises(AttributeError):
+            unit.colour = "white"
+    
+    def test_scan_records_move_into_history_at_the_limit(self):
+        Person("Shopper").add_item(self.item)
+        # A plain list until retention applies; no History per basket unit
+        self.assertIs(type(self.item._scan_history), list)
+        for i in range(Item.retention['max_items']):
+            self.item.update_location(f"aisle {i}")
+        history = self.item.get_scan_history()
+        self.assertEqual(len(history), Item.retention['max_items'])
+        self.assertEqual(history.appended, Item.retention['max_items'] + 1)
+        self.assertEqual(history[-1]['location'], f"aisle {Item.retention['max_items'] - 1}")
+        self.assertEqual(self.item.get_details()['scan_count'], Item.retention['max_items'] + 1)
+    
+    def test_price_change_only_affects_one_unit(self):
+        sku = ItemType.get("Bread", 2.49, "Bakery")
+        first = Item.from_sku(sku, "RFID002-1")
+        second = Item.from_sku(sku, "RFID002-2")
+        first.price = 1.99
+        self.assertEqual(first.price, 1.99)
+        self.assertEqual(second.price, 2.49)
+        self.assertEqual(first.category, "Bakery")
 
-# Import all test modules
-from tests.test_models import TestItem, TestPerson, TestCashier, TestGate
-from tests.test_logger import TestSystemLogger
 
-def run_tests():
-    # Create a test suite
-    test_suite = unittest.TestSuite()
+class TestTagRegistry(unittest.TestCase):
+    def setUp(self):
+        self.registry = TagRegistry()
+        self.milk = Item("Milk", "RFID001", price=3.99, category="Dairy")
+    
+    def test_create_unit_assigns_unique_tags(self):
+        first = self.registry.create_unit(self.milk)
+        second = self.registry.create_unit(self.milk)
+        self.assertNotEqual(first.tag_id, second.tag_id)
+        self.assertTrue(first.tag_id.startswith("RFID001-"))
+        self.assertIs(self.registry.lookup(first.tag_id), first)
+        self.assertEqual(self.registry.active_count, 2)
+    
+    def test_register_rejects_duplicate_tag(self):
+        self.registry.register(Item("Milk", "TAG1"))
+        with self.assertRaises(ValueError):
+            self.registry.register(Item("Bread", "TAG1"))
+    
+    def test_deactivate_and_retire(self):
+        unit = self.registry.create_unit(self.milk)
+        self.assertEqual(self.registry.get_state(unit.tag_id), "active")
+        
+        self.registry.deactivate(unit.tag_id)
+        self.assertTrue(unit.is_deactivated)
+        self.assertEqual(self.registry.get_state(unit.tag_id), "deactivated")
+        self.assertEqual(self.registry.active_count, 0)
+        
+        self.assertIs(self.registry.retire(unit.tag_id), unit)
+        self.assertIsNone(self.registry.get_state(unit.tag_id))
+        self.assertNotIn(unit.tag_id, self.registry)
+        self.assertIsNone(self.registry.retire(unit.tag_id))
+        self.assertEqual(self.registry.get_stats()['retired_tags'], 1)
     
-    # Add test cases
-    test_suite.addTests(unittest.TestLoader().loadTestsFromTestCase(TestItem))
-    test_suite.addTests(unittest.TestLoader().loadTestsFromTestCase(TestPerson))
-    test_suite.addTests(unittest.TestLoader().loadTestsFromTestCase(TestCashier))
-    test_suite.addTests(unittest.TestLoader().loadTestsFromTestCase(TestGate))
-    test_suite.addTests(unittest.TestLoader().loadTestsFromTestCase(TestSystemLogger))
+    def test_active_count_follows_direct_state_changes(self):
+        unit = self.registry.create_unit(self.milk)
+        unit.is_deactivated = True
+        self.assertEqual(self.registry.active_count, 0)
+        unit.is_deactivated = False
+        self.assertEqual(self.registry.active_count, 1)
+        self.registry.retire(unit.tag_id)
+        self.assertEqual(self.registry.active_count, 0)
     
-    # Run the test suite
-    runner = unittest.TextTestRunner(verbosity=2)
-    result = runner.run(test_suite)
+    def test_retire_items(self):
+        paid, unpaid = self.registry.create_unit(self.milk), self.registry.create_unit(self.milk)
+        paid.deactivate()
+        self.registry.retire_items([paid, unpaid, Item("Milk", "UNKNOWN")])
+        self.assertEqual(len(self.registry), 0)
+        self.assertEqual(self.registry.active_count, 0)
+        self.assertEqual(self.registry.retired_count, 2)
+        self.assertIsNone(unpaid.registry)
     
-    return result.wasSuccessful()
+    def test_cashier_and_gate_use_registry(self):
+        cashier = Cashier("Sarah", registry=self.registry)
+        gate = Gate(registry=self.registry)
+        paid = self.registry.create_unit(self.milk)
+        unpaid = self.registry.create_unit(self.milk)
+        
+        self.assertIs(cashier.deactivate_tag(paid.tag_id), paid)
+        self.assertIsNone(cashier.deactivate_tag("UNKNOWN"))
+        self.assertEqual(gate.check_tags([paid.tag_id, unpaid.tag_id, "UNKNOWN"]), [unpaid])
+    
+    def test_gate_retires_tags_after_safe_exit(self):
+        gate = Gate(registry=self.registry)
+        person = Person("Test Person")
+        unit = self.registry.create_unit(self.milk)
+        person.add_item(unit)
+        
+        gate.scan(person)
+        self.assertIn(unit.tag_id, self.registry)
+        unit.deactivate()
+        gate.scan(person)
+        self.assertNotIn(unit.tag_id, self.registry)
+
 
-if __name__ == '__main__':
-    success = run_tests()
-    sys.exit(0 if success else 1)
\ No newline at end of file
+class TestPerson(unittest.TestCase):
+    def setUp(self):
+        self.person = Person("Test Person")
+        self.item = Item("Test Item", "TEST001")
+    
+    def test_person_creation(self):
+        self.assertEqual(self.person.name, "Test Person")
+        self.assertEqual(len(self.person.items), 0)
+    
+    def test_add_item(self):
+        self.person.add_item(self.item)
+        self.assertEqual(len(self.person.items), 1)
+        self.assertEqual(self.person.items[0], self.item)
+    
+    def test_active_tag_tracking(self):
+        other = Item("Other Item", "TEST002", price=2.0)
+        self.person.add_item(self.item)
+        self.person.add_item(other)
+        self.assertEqual(self.person.get_active_tag_count(), 2)
+        self.assertEqual(self.person.total_spent, 2.0)
+        
+        self.item.deactivate()
+        self.assertEqual(self.person.active_tags, {"TEST002"})
+        other.is_deactivated = True
+        self.assertFalse(self.person.has_active_tags())
+        other.is_deactivated = False
+        self.assertTrue(self.person.has_active_tags())
+        
+        self.person.remove_item(other)
+        self.assertFalse(self.person.has_active_tags())
+        self.assertEqual(self.person.total_spent, 0.0)
+        other.is_deactivated = True
+        self.assertEqual(self.person.active_tags, set())
+    
+    def test_clear_items(self):
+        self.person.add_item(self.item)
+        self.person.clear_items()
+        self.assertEqual(self.person.get_total_items(), 0)
+        self.assertFalse(self.person.has_active_tags())
+        self.assertIsNone(self.item.owner)
+    
+    def test_retention_bounds_histories(self):
+        person = Person("Busy Person", retention={'max_items': 3})
+        for i in range(10):
+            person.add_item(Item("Test Item", f"TAG{i}"))
+        summary = person.get_shopping_summary()
+        self.assertEqual(summary['items_picked'], 10)
+        self.assertEqual(len(summary['shopping_path']), 3)
+    
+    def test_person_string_representation(self):
+        expected = "Test Person is carrying 0 item(s) worth $0.00"
+        self.assertEqual(str(self.person), expected)
+        
+        self.person.add_item(self.item)
+        expected = "Test Person is carrying 1 item(s) worth $0.00"
+        self.assertEqual(str(self.person), expected)
+
+
+class TestCashier(unittest.TestCase):
+    def setUp(self):
+        self.cashier = Cashier("Test Cashier")
+        self.person = Person("Test Person")
+        self.item = Item("Test Item", "TEST001")
+        self.person.add_item(self.item)
+    
+    def test_scan_and_deactivate(self):
+        result = self.cashier.scan_and_deactivate(self.person)
+        self.assertIn("Test Cashier is scanning Test Person's items", result.text)
+        self.assertIn("Scanning Test Item", result.text)
+        self.assertTrue(self.item.is_deactivated)
+    
+    def test_transaction_history_retention(self):
+        cashier = Cashier("Test Cashier", retention={'max_items': 2})
+        for _ in range(5):
+            cashier.scan_and_deactivate(self.person)
+        self.assertEqual(len(cashier.get_transaction_history()), 2)
+        self.assertEqual(cashier.get_shift_summary()['transaction_count'], 5)
+    
+    def test_checkout_result_is_structured(self):
+        self.person.add_item(Item("Other Item", "TEST002", price=1.5))
+        result = self.cashier.scan_and_deactivate(self.person)
+        self.assertEqual(result.customer, "Test Person")
+        self.assertEqual(result.items, tuple(self.person.items))
+        self.assertEqual(len(result.scan_times), 2)
+        self.assertEqual(result.deactivated, 2)
+        self.assertEqual(result.total, 1.5)
+        self.assertIsNone(result._text)
+        stats = self.cashier.get_stats()
+        self.assertEqual(stats['scan_latency']['count'], 2)
+        self.assertEqual(stats['transaction_latency']['count'], 1)
+        self.assertLessEqual(stats['scan_latency']['p50'], stats['scan_latency']['max'])
+        self.assertIn("Total: $1.50", str(result))
+
+
+class TestGate(unittest.TestCase):
+    def setUp(self):
+        self.gate = Gate()
+        self.person = Person("Test Person")
+        self.item = Item("Test Item", "TEST001")
+        self.person.add_item(self.item)
+    
+    def test_gate_scan_with_active_tag(self):
+        result = self.gate.scan(self.person)
+        self.assertIn("Scanning Test Person at the exit gate", result.text)
+        self.assertIn("ALERT: Active tag detected on Test Item", result.text)
+        self.assertTrue(result.alert_triggered)
+        self.assertEqual(result.active_tags, ["TEST001"])
+    
+    def test_gate_scan_with_deactivated_tag(self):
+        self.item.is_deactivated = True
+        result = self.gate.scan(self.person)
+        self.assertIn("All items are safe", result.text)
+        self.assertFalse(result.alert_triggered)
+        self.assertEqual(result.items, ())
+    
+    def test_gate_only_walks_basket_on_alert(self):
+        self.item.deactivate()
+        result = self.gate.scan(self.person)
+        self.assertFalse(result.alert_triggered)
+        self.assertNotIn("Checking item", result.text)
+        
+        self.person.add_item(Item("Stolen Item", "TEST002", price=9.99))
+        result = self.gate.scan(self.person)
+        self.assertTrue(result.alert_triggered)
+        self.assertIn("Active tag detected on Stolen Item", result.text)
+        self.assertNotIn("Active tag detected on Test Item", result.text)
+        self.assertEqual(self.gate.get_scan_history()[-1]['active_tags'], ["TEST002"])
+    
+    def test_gate_retention(self):
+        gate = Gate(retention={'max_items': 2})
+        for _ in range(5):
+            gate.scan(self.person)
+        self.assertEqual(len(gate.get_scan_history()), 2)
+        self.assertEqual(gate.get_stats()['total_scans'], 5)
+    
+    def test_traffic_reads_while_another_thread_scans(self):
+        gate = Gate()
+        start = datetime(2024, 3, 4)
+        errors = []
+        
+        def scan():
+            # Every scan starts a new hour bucket, moving the window under the reader
+            for i in range(3000):
+                gate.scan(self.person, timestamp=start + timedelta(minutes=61 * i))
+        
+        scanner = threading.Thread(target=scan)
+        scanner.start()
+        while scanner.is_alive():
+            try:
+                gate.peak_times
+                gate.get_recent_traffic(60)
+            except Exception as e:
+                errors.append(e)
+        scanner.join()
+        self.assertEqual(errors, [])
+        # The hourly window keeps the newest 840 hours of scans
+        hours = [61 * i // 60 for i in range(3000)]
+        self.assertEqual(sum(gate.peak_times.values()),
+                         sum(1 for hour in hours if hour > hours[-1] - 840))
+    
+    def test_gate_stats_separate_lifetime_and_window(self):
+        gate = Gate(retention={'max_items': 2})
+        for count in range(5):
+            if count:
+                self.person.add_item(Item(f"Extra {count}", f"EXTRA{count}", price=1.0))
+            gate.scan(self.person)
+        
+        stats = gate.get_stats()
+        # Lifetime figures cover all five scans (1 to 5 items, all alerting)
+        self.assertEqual(stats['alert_rate'], 100)
+        self.assertEqual(stats['avg_items_per_scan'], 3)
+        self.assertAlmostEqual(stats['alerted_value'], 0 + 1 + 2 + 3 + 4)
+        self.assertGreater(stats['avg_scan_duration'], 0)
+        # Only the last two scans are left in the window
+        self.assertEqual(stats['window']['scans'], 2)
+        self.assertEqual(stats['window']['avg_items'], 4.5)
+        self.assertAlmostEqual(stats['window']['alerted_value'], 3 + 4)
+    
+    def test_gate_stats(self):
+        self.gate.scan(self.person, timestamp=datetime(2024, 3, 4, 10, 0))
+        self.gate.scan(self.person, timestamp=datetime(2024, 3, 4, 10, 30))
+        self.item.is_deactivated = True
+        self.gate.scan(self.person, timestamp=datetime(2024, 3, 4, 14, 0))
+        
+        stats = self.gate.get_stats()
+        self.assertEqual(stats['total_scans'], 3)
+        self.assertEqual(stats['alerts_triggered'], 2)
+        self.assertEqual(stats['peak_hours']['busiest_hour'], 10)
+        self.assertEqual(stats['peak_hours']['hourly_traffic'], {10: 2, 14: 1})
+        self.assertEqual(stats['alert_patterns']['most_triggered_tags'], {"TEST001": 2})
+        self.assertEqual(stats['alert_patterns']['error_bound'], 0)
+        self.assertEqual(stats['unique'], {'customers': 1, 'alert_tags': 1})
+        self.assertEqual(self.gate.get_unique_counts(3600), {'customers': 1, 'alert_tags': 0})
+        self.assertEqual(self.gate.peak_times, {10: 2, 14: 1})
+        self.assertEqual(stats['last_hour'], {'scans': 1, 'alerts': 0})
+        self.assertEqual(self.gate.get_recent_traffic(5 * 60), {'scans': 3, 'alerts': 2})
+        self.assertEqual(len(self.gate.get_scan_history()), 3)
+    
+    def test_gate_without_analytics(self):
+        gate = Gate(analytics=False)
+        gate.scan(self.person, timestamp=datetime(2024, 3, 4, 10, 0))
+        stats = gate.get_stats()
+        self.assertEqual(stats['total_scans'], 1)
+        self.assertEqual(stats['alerts_triggered'], 1)
+        self.assertEqual(len(gate.get_scan_history()), 1)
+        self.assertIsNone(stats['peak_hours'])
+        self.assertEqual(stats['alert_patterns']['most_triggered_tags'], {})
+        self.assertEqual(stats['unique'], {'customers': 0, 'alert_tags': 0})
\ No newline at end of file
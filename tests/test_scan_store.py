@@ -0,0 +1,105 @@
+import unittest
+import os
+import json
+from datetime import datetime, timedelta
+from history import close_all
+from models import Gate, Person
+from scan_store import ScanStore
+
+class TestScanStore(unittest.TestCase):
+    def setUp(self):
+        self.store = ScanStore(capacity=2)
+        self.morning = datetime(2024, 3, 4, 9, 15)
+        self.evening = datetime(2024, 3, 4, 18, 30)
+    
+    def test_append_grows_and_rebuilds_records(self):
+        for i in range(5):
+            self.store.append(self.morning, f"Person {i}", 2, i % 2 == 0,
+                              [f"TAG{i}"] if i % 2 == 0 else [], 0.01, 9.5)
+        
+        self.assertEqual(len(self.store), 5)
+        record = self.store[4]
+        self.assertEqual(record['timestamp'], self.morning)
+        self.assertEqual(record['person'], "Person 4")
+        self.assertEqual(record['items'], 2)
+        self.assertTrue(record['alert_triggered'])
+        self.assertEqual(record['active_tags'], ["TAG4"])
+        self.assertEqual(self.store[1]['active_tags'], [])
+        self.assertEqual([r['person'] for r in self.store][:2], ["Person 0", "Person 1"])
+    
+    def test_names_are_interned(self):
+        self.store.append(self.morning, "Alice", 1, True, ["TAG1", "TAG2"], 0.0, 1.0)
+        self.store.append(self.morning, "Alice", 1, True, ["TAG1"], 0.0, 1.0)
+        self.assertEqual(self.store.person_names, ["Alice"])
+        self.assertEqual(self.store.tag_names, ["TAG1", "TAG2"])
+    
+    def test_hourly_counts(self):
+        self.store.append(self.morning, "A", 1, False, [], 0.0, 1.0)
+        self.store.append(self.morning, "B", 1, False, [], 0.0, 1.0)
+        self.store.append(self.evening, "C", 1, False, [], 0.0, 1.0)
+        hourly = self.store.hourly_counts()
+        self.assertEqual(hourly[9], 2)
+        self.assertEqual(hourly[18], 1)
+        self.assertEqual(hourly.sum(), 3)
+    
+    def test_top_tags_breaks_ties_by_first_seen(self):
+        self.store.append(self.morning, "A", 3, True, ["TAG1", "TAG2", "TAG3"], 0.0, 1.0)
+        self.store.append(self.morning, "B", 1, True, ["TAG3"], 0.0, 1.0)
+        self.assertEqual(self.store.top_tags(2), {"TAG3": 2, "TAG1": 1})
+    
+    def test_summary(self):
+        self.assertEqual(self.store.summary()['scans'], 0)
+        self.store.append(self.morning, "A", 2, True, ["TAG1"], 0.2, 10.0)
+        self.store.append(self.morning, "B", 4, False, [], 0.4, 5.0)
+        summary = self.store.summary()
+        self.assertEqual(summary['alerts'], 1)
+        self.assertAlmostEqual(summary['avg_items'], 3.0)
+        self.assertAlmostEqual(summary['avg_duration'], 0.3)
+        self.assertAlmostEqual(summary['total_value'], 15.0)
+        self.assertAlmostEqual(summary['alerted_value'], 10.0)
+    
+    def test_max_items_keeps_recent_window(self):
+        store = ScanStore(capacity=4, max_items=5)
+        for i in range(50):
+            store.append(self.morning, f"Person {i}", 1, i % 3 == 0,
+                         [f"TAG{i}"] if i % 3 == 0 else [], 0.0, float(i))
+        
+        self.assertEqual(len(store), 5)
+        self.assertEqual([r['person'] for r in store], [f"Person {i}" for i in range(45, 50)])
+        self.assertEqual(store[0]['active_tags'], ["TAG45"])
+        self.assertEqual(store.top_tags(5), {"TAG45": 1, "TAG48": 1})
+        self.assertEqual(store.summary()['total_value'], sum(range(45, 50)))
+        self.assertEqual(store.evicted, 45)
+        # Interned tables only hold names that live rows still use
+        self.assertLessEqual(len(store.person_names), 10)
+        self.assertLessEqual(len(store.timestamps), 20)
+    
+    def test_max_age_and_spill(self):
+        spill_file = "test_scan_spill.jsonl"
+        self.addCleanup(lambda: os.path.exists(spill_file) and os.remove(spill_file))
+        store = ScanStore(capacity=2, max_age=3600, spill_file=spill_file)
+        for i in range(6):
+            store.append(self.morning + timedelta(minutes=30 * i), f"Person {i}", 1,
+                         False, [], 0.0, 1.0)
+        
+        self.assertEqual([r['person'] for r in store], ["Person 3", "Person 4", "Person 5"])
+        store.flush()
+        with open(spill_file) as f:
+            spilled = [json.loads(line)['person'] for line in f]
+        self.assertEqual(spilled, ["Person 0", "Person 1", "Person 2"])
+        self.assertEqual(len(store), 3)
+    
+    def test_shutdown_spills_every_evicted_gate_scan(self):
+        spill_file = "test_gate_spill.jsonl"
+        self.addCleanup(lambda: os.path.exists(spill_file) and os.remove(spill_file))
+        gate = Gate(retention={'max_items': 10, 'spill_file': spill_file})
+        for i in range(30):
+            gate.scan(Person(f"Person {i}"), timestamp=self.morning + timedelta(seconds=i))
+        self.assertEqual(gate.scan_history.evicted, 20)
+        
+        close_all()
+        with open(spill_file) as f:
+            spilled = [json.loads(line)['person'] for line in f]
+        self.assertEqual(spilled, [f"Person {i}" for i in range(20)])
+        self.assertEqual([r['person'] for r in gate.get_scan_history()],
+                         [f"Person {i}" for i in range(20, 30)])
\ No newline at end of file
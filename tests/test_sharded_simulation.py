@@ -0,0 +1,89 @@
+import unittest
+from datetime import datetime
+from models import Cashier, Gate
+from simulation import StoreSimulation
+from sharded_simulation import (build_shard, merge_summaries, plan_shards, run_shard,
+                                run_sharded, shard_seed)
+
+class TestShardedSimulation(unittest.TestCase):
+    def setUp(self):
+        self.start = datetime(2024, 1, 1, 8, 0)
+        self.specs = plan_shards(num_shards=3, duration=3 * 3600, start_time=self.start,
+                                 seed=11, num_cashiers=1, arrival_rate=0.02)
+    
+    def test_shard_seeds_are_reproducible(self):
+        self.assertEqual(shard_seed(11, 0), shard_seed(11, 0))
+        self.assertNotEqual(shard_seed(11, 0), shard_seed(11, 1))
+        again = plan_shards(num_shards=3, duration=3 * 3600, start_time=self.start, seed=11)
+        self.assertEqual([spec['seed'] for spec in self.specs], [spec['seed'] for spec in again])
+    
+    def test_time_slices_cover_the_day(self):
+        self.assertEqual([spec['start_time'].hour for spec in self.specs], [8, 9, 10])
+        self.assertTrue(all(spec['duration'] == 3600 for spec in self.specs))
+        
+        zones = plan_shards(num_shards=2, duration=3600, start_time=self.start, mode="zone",
+                            arrival_rate=0.2)
+        self.assertTrue(all(spec['start_time'] == self.start for spec in zones))
+        self.assertTrue(all(spec['options']['arrival_rate'] == 0.1 for spec in zones))
+        
+        with self.assertRaises(ValueError):
+            plan_shards(mode="aisle")
+    
+    def test_merge_matches_single_gate_and_cashier(self):
+        merged = merge_summaries([run_shard(spec) for spec in self.specs])
+        
+        # Replay the same shards through one Gate and one Cashier
+        gate = Gate()
+        cashier = Cashier("Lane 1")
+        for spec in self.specs:
+            build_shard(spec, gate=gate, cashiers=[cashier]).run(duration=spec['duration'])
+        gate_stats = gate.get_stats()
+        shift = cashier.get_shift_summary()
+        
+        for key in ('total_scans', 'alerts_triggered', 'peak_hours', 'alert_patterns',
+                    'last_hour'):
+            self.assertEqual(merged['gate'][key], gate_stats[key])
+        for key in ('alert_rate', 'avg_items_per_scan', 'alerted_value'):
+            self.assertAlmostEqual(merged['gate'][key], gate_stats[key])
+        for key in ('items_processed', 'successful_deactivations', 'transaction_count'):
+            self.assertEqual(merged['cashier'][key], shift[key])
+        self.assertAlmostEqual(merged['cashier']['total_sales'], shift['total_sales'])
+        self.assertEqual(merged['cashier']['scan_latency']['count'], shift['items_processed'])
+        self.assertEqual(merged['gate']['scan_latency']['count'], gate_stats['total_scans'])
+        self.assertGreater(merged['gate']['total_scans'], 0)
+        self.assertGreater(merged['gate']['alerts_triggered'], 0)
+        self.assertGreater(merged['gate']['last_hour']['scans'], 0)
+        self.assertGreater(merged['gate']['unique']['alert_tags'], 0)
+    
+    def test_unique_customers_match_an_unsharded_run(self):
+        merged = merge_summaries([run_shard(spec) for spec in self.specs])
+        whole = StoreSimulation(start_time=self.start, seed=11, num_cashiers=1, arrival_rate=0.02)
+        whole.run(duration=3 * 3600)
+        
+        # Every customer is a different person, sharded or not
+        for customers, unique in ((merged['simulation']['customers'], merged['gate']['unique']),
+                                  (whole.stats['customers'], whole.gate.get_stats()['unique'])):
+            self.assertGreater(customers, 100)
+            self.assertAlmostEqual(unique['customers'] / customers, 1, delta=0.03)
+    
+    def test_process_pool_matches_serial_run(self):
+        parallel = run_sharded(num_shards=3, duration=3 * 3600, start_time=self.start, seed=11,
+                               max_workers=2, num_cashiers=1, arrival_rate=0.02)
+        serial = merge_summaries([run_shard(spec) for spec in self.specs])
+        
+        self.assertEqual(parallel['seed'], 11)
+        self.assertEqual(parallel['shards'], 3)
+        self.assertEqual(parallel['gate']['peak_hours'], serial['gate']['peak_hours'])
+        self.assertEqual(parallel['gate']['alert_patterns'], serial['gate']['alert_patterns'])
+        self.assertEqual(parallel['simulation']['customers'], serial['simulation']['customers'])
+        self.assertEqual(parallel['simulation']['revenue'], serial['simulation']['revenue'])
+    
+    def test_shards_use_distinct_tags(self):
+        tags = []
+        for spec in self.specs[:2]:
+            seen = set()
+            listener = lambda event, person, now, detail: event == 'item' and seen.add(detail.tag_id)
+            build_shard(spec, listener=listener).run(duration=600)
+            tags.append(seen)
+        self.assertTrue(tags[0] and tags[1])
+        self.assertFalse(tags[0] & tags[1])
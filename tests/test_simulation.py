@@ -0,0 +1,87 @@
+import unittest
+from datetime import datetime, timedelta
+from models import Cashier, Gate
+from simulation import StoreSimulation, default_catalog
+
+class TestStoreSimulation(unittest.TestCase):
+    def test_run_counts_every_customer(self):
+        stats = StoreSimulation(seed=42).run(num_customers=500)
+        
+        self.assertEqual(stats['customers'], 500)
+        self.assertEqual(stats['checkouts'] + stats['skipped_checkout'], 500)
+        self.assertEqual(stats['alerts'] + stats['safe_exits'], 500)
+        self.assertEqual(sum(stats['hourly_traffic'].values()), 500)
+        self.assertGreater(stats['revenue'], 0)
+        self.assertGreater(stats['virtual_duration'], 0)
+    
+    def test_skipped_checkout_triggers_alert(self):
+        stats = StoreSimulation(theft_probability=1.0, seed=1).run(num_customers=50)
+        self.assertEqual(stats['alerts'], 50)
+        self.assertEqual(stats['revenue'], 0)
+        
+        stats = StoreSimulation(theft_probability=0.0, seed=1).run(num_customers=50)
+        self.assertEqual(stats['alerts'], 0)
+        self.assertEqual(stats['checkouts'], 50)
+    
+    def test_same_seed_is_reproducible(self):
+        first = StoreSimulation(seed=7).run(num_customers=200)
+        second = StoreSimulation(seed=7).run(num_customers=200)
+        for key in ('customers', 'items', 'alerts', 'revenue', 'virtual_duration', 'hourly_traffic'):
+            self.assertEqual(first[key], second[key])
+    
+    def test_duration_limit(self):
+        stats = StoreSimulation(arrival_rate=1.0, seed=3).run(duration=600)
+        self.assertGreater(stats['customers'], 0)
+        self.assertLess(stats['customers'], 1000)
+    
+    def test_uses_given_models_and_listener(self):
+        cashier = Cashier("Sarah")
+        gate = Gate()
+        events = []
+        simulation = StoreSimulation(
+            default_catalog(),
+            cashiers=[cashier],
+            gate=gate,
+            theft_probability=0.0,
+            seed=5,
+            listener=lambda event, person, now, detail: events.append(event)
+        )
+        stats = simulation.run(num_customers=20)
+        
+        self.assertEqual(gate.total_scans, 20)
+        self.assertEqual(len(cashier.get_transaction_history()), 20)
+        self.assertEqual(events.count('arrival'), 20)
+        self.assertEqual(events.count('exit'), 20)
+        self.assertEqual(events.count('item'), stats['items'])
+    
+    def test_stop_ends_run_early(self):
+        def listener(event, person, now, detail):
+            if event == 'arrival' and simulation.stats['customers'] == 10:
+                simulation.stop()
+        
+        simulation = StoreSimulation(seed=2, listener=listener)
+        stats = simulation.run(num_customers=1000)
+        self.assertEqual(stats['customers'], 10)
+    
+    def test_requires_stop_condition(self):
+        with self.assertRaises(ValueError):
+            StoreSimulation().run()
+    
+    def test_scan_records_use_virtual_time(self):
+        start = datetime(2020, 1, 6, 8, 0)
+        people = []
+        simulation = StoreSimulation(
+            start_time=start,
+            theft_probability=0.0,
+            seed=4,
+            listener=lambda event, person, now, detail: people.append(person) if event == 'exit' else None
+        )
+        stats = simulation.run(num_customers=20)
+        end = start + timedelta(seconds=stats['virtual_duration'])
+        
+        stamps = [record['timestamp'] for person in people for item in person.items
+                  for record in item.scan_history]
+        stamps += [step['timestamp'] for person in people for step in person.shopping_path]
+        self.assertTrue(stamps)
+        for stamp in stamps:
+            self.assertTrue(start <= stamp <= end)
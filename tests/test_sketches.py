@@ -0,0 +1,158 @@
+import unittest
+import pickle
+import random
+from collections import Counter
+from sketches import SpaceSaving, HyperLogLog, WindowedHyperLogLog
+
+class TestSpaceSaving(unittest.TestCase):
+    def setUp(self):
+        rng = random.Random(4)
+        self.stream = [f"TAG{int(rng.paretovariate(1.1)):05d}" for _ in range(20000)]
+        self.exact = Counter(self.stream)
+
+    def check_guarantees(self, summary):
+        bound = summary.error_bound
+        self.assertLessEqual(bound, summary.total / summary.capacity)
+        for item, count, error in summary.items():
+            self.assertLessEqual(self.exact[item], count)
+            self.assertLessEqual(count, self.exact[item] + bound)
+            self.assertLessEqual(error, bound)
+        for item, count in self.exact.items():
+            if count > bound:
+                self.assertIn(item, summary)
+
+    def test_exact_below_capacity(self):
+        summary = SpaceSaving(capacity=10)
+        for tag in ["A", "B", "A", "C", "B", "A"]:
+            summary.update(tag)
+        self.assertEqual(summary.top(2), [("A", 3, 0), ("B", 2, 0)])
+        self.assertEqual(summary.error_bound, 0)
+        self.assertEqual(summary.get_stats(k=1)['top'], {"A": 3})
+
+    def test_ties_keep_the_order_counts_were_reached(self):
+        summary = SpaceSaving(capacity=10)
+        for tag in ["A", "B", "C", "C", "B"]:
+            summary.update(tag)
+        self.assertEqual([item for item, _, _ in summary.top(3)], ["C", "B", "A"])
+
+    def test_memory_is_bounded_with_error_guarantee(self):
+        summary = SpaceSaving(capacity=50)
+        for tag in self.stream:
+            summary.update(tag)
+        self.assertEqual(len(summary), 50)
+        self.assertEqual(summary.total, len(self.stream))
+        self.assertGreater(summary.error_bound, 0)
+        self.check_guarantees(summary)
+        self.assertEqual([item for item, _, _ in summary.top(3)],
+                         [item for item, _ in self.exact.most_common(3)])
+
+    def test_merge_keeps_guarantees(self):
+        parts = [SpaceSaving(capacity=50) for _ in range(3)]
+        for i, tag in enumerate(self.stream):
+            parts[i % 3].update(tag)
+        merged = SpaceSaving(capacity=50)
+        for part in parts:
+            merged.merge(part)
+        self.assertEqual(merged.total, len(self.stream))
+        self.assertEqual(len(merged), 50)
+        self.check_guarantees(merged)
+
+    def test_merge_is_exact_below_capacity(self):
+        left, right, single = SpaceSaving(10), SpaceSaving(10), SpaceSaving(10)
+        for tag in "AABCD":
+            left.update(tag)
+            single.update(tag)
+        for tag in "DDEB":
+            right.update(tag)
+            single.update(tag)
+        left.merge(right)
+        self.assertEqual(left.counts(), single.counts())
+        self.assertEqual(left.error_bound, 0)
+
+    def test_pickling(self):
+        summary = SpaceSaving(capacity=20)
+        for tag in self.stream[:2000]:
+            summary.update(tag)
+        copy = pickle.loads(pickle.dumps(summary))
+        self.assertEqual(list(copy.items()), list(summary.items()))
+        self.assertEqual(copy.error_bound, summary.error_bound)
+        copy.update("NEW")
+        self.assertIn("NEW", copy)
+
+class TestHyperLogLog(unittest.TestCase):
+    def test_small_counts_are_close_to_exact(self):
+        sketch = HyperLogLog()
+        for i in range(100):
+            sketch.add(f"Customer {i}")
+            sketch.add(f"Customer {i}")
+        self.assertEqual(len(sketch), 100)
+        self.assertEqual(len(sketch.registers), 4096)
+
+    def test_large_counts_within_error(self):
+        sketch = HyperLogLog()
+        for i in range(200000):
+            sketch.add(f"TAG{i:07d}")
+        self.assertAlmostEqual(sketch.estimate() / 200000, 1, delta=0.05)
+
+    def test_merge_is_the_union(self):
+        left, right, union = HyperLogLog(), HyperLogLog(), HyperLogLog()
+        for i in range(30000):
+            left.add(i)
+            union.add(i)
+        for i in range(20000, 50000):
+            right.add(i)
+            union.add(i)
+        left.merge(right)
+        self.assertEqual(left.registers, union.registers)
+        self.assertAlmostEqual(left.estimate() / 50000, 1, delta=0.05)
+        with self.assertRaises(ValueError):
+            left.merge(HyperLogLog(precision=10))
+
+    def test_hash_is_stable(self):
+        self.assertEqual(HyperLogLog.hash("RFID001-000001"), HyperLogLog.hash("RFID001-000001"))
+        self.assertNotEqual(HyperLogLog.hash(1), HyperLogLog.hash(2))
+
+    def test_windows(self):
+        sketch = WindowedHyperLogLog(levels=((3600, 24), (86400, 7)))
+        # 20 customers an hour for 10 days; customers repeat every 2 hours
+        for hour in range(240):
+            for i in range(20):
+                sketch.add(f"Customer {(hour % 2) * 20 + i}", hour * 3600 + i * 60)
+        self.assertEqual(sketch.count_last(3600), 20)
+        self.assertEqual(sketch.count_last(2 * 3600), 40)
+        self.assertEqual(sketch.count_between(239 * 3600, 240 * 3600), 20)
+        # Day 5 is only kept per day, so the span covers all of it
+        self.assertEqual(sketch.count_between(5 * 86400, 5 * 86400 + 3600), 40)
+        self.assertEqual(sketch.estimate(), 40)
+        self.assertEqual(len(sketch.windows[0]), 24)
+        self.assertEqual(len(sketch.windows[1]), 7)
+        with self.assertRaises(ValueError):
+            sketch.count_between(0, 3600)
+
+    def test_windowed_merge(self):
+        lanes = [WindowedHyperLogLog() for _ in range(2)]
+        single = WindowedHyperLogLog()
+        for i in range(500):
+            lanes[i % 2].add(f"Customer {i}", i * 60)
+            single.add(f"Customer {i}", i * 60)
+        merged = WindowedHyperLogLog().merge(lanes[0]).merge(lanes[1])
+        self.assertEqual(merged.estimate(), single.estimate())
+        self.assertEqual(merged.count_last(3 * 3600), single.count_last(3 * 3600))
+
+    def test_late_items_land_in_their_windows(self):
+        rng = random.Random(4)
+        sketch = WindowedHyperLogLog(levels=((3600, 24), (86400, 7)))
+        seen = {}
+        for i in range(3000):
+            # Mostly in time order, with some items up to 5 hours late
+            seconds = max(0, i * 60 - (rng.uniform(0, 5 * 3600) if rng.random() < 0.2 else 0))
+            name = f"Customer {rng.randrange(60)}"
+            sketch.add_hash(HyperLogLog.hash(name), seconds)
+            seen.setdefault(int(seconds // 3600), set()).add(name)
+        self.assertEqual(sketch.latest, 2999 * 60)
+        for hour in range(40, 50):
+            self.assertEqual(sketch.count_between(hour * 3600, (hour + 1) * 3600), len(seen[hour]))
+        self.assertEqual(sketch.count_last(3600), len(seen[49]))
+
+if __name__ == '__main__':
+    unittest.main()
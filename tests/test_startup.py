@@ -0,0 +1,23 @@
+import os
+import sys
+import unittest
+
+# The startup benchmark lives in benchmarks/, which is not a package
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'benchmarks'))
+
+from bench_startup import IMPORT_BUDGET_MS, measure_imports
+
+class TestStartup(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.imports = measure_imports("gui")
+    
+    def test_heavy_modules_are_not_imported_at_startup(self):
+        names = {name for _, _, name in self.imports['modules']}
+        self.assertIn("gui", names)
+        self.assertNotIn("matplotlib", names)
+        self.assertNotIn("stats_window", names)
+    
+    def test_import_within_budget(self):
+        self.assertGreater(self.imports['total_ms'], 0)
+        self.assertLess(self.imports['total_ms'], IMPORT_BUDGET_MS)
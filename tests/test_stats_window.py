@@ -0,0 +1,56 @@
+import unittest
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from datetime import datetime
+from stats_window import StatisticsDashboard, StatisticsWindow
+from models import Gate, Item, Person
+
+class TestStatisticsDashboard(unittest.TestCase):
+    def setUp(self):
+        self.figure = Figure()
+        self.canvas = FigureCanvasAgg(self.figure)
+        self.dashboard = StatisticsDashboard(self.figure, history=10)
+    
+    def test_updates_artists_in_place(self):
+        line = self.dashboard.rate_line
+        self.assertFalse(self.dashboard.update(4, 1, {9: 4}, 20.0))
+        self.assertFalse(self.dashboard.update(10, 5, {9: 10}, 60.0))
+        
+        self.assertIs(self.dashboard.rate_line, line)
+        self.assertEqual(list(line.get_ydata()[-2:]), [25.0, 50.0])
+        self.assertEqual(list(self.dashboard.revenue_line.get_ydata()[-2:]), [20.0, 60.0])
+        self.assertEqual(self.dashboard.traffic_bars[9].get_height(), 10)
+        self.assertEqual(len(self.figure.axes), 3)
+    
+    def test_series_length_is_fixed(self):
+        for i in range(100):
+            self.dashboard.update(i, 0, {}, float(i))
+        self.assertEqual(len(self.dashboard.revenue_line.get_ydata()), 10)
+        self.assertEqual(self.dashboard.revenues[-1], 99.0)
+    
+    def test_rescale_requests_full_redraw(self):
+        self.assertTrue(self.dashboard.update(1, 0, {8: 1}, 1000.0))
+        self.assertGreater(self.dashboard.revenue_ax.get_ylim()[1], 1000.0)
+        self.assertFalse(self.dashboard.update(2, 0, {8: 2}, 1001.0))
+        
+        self.canvas.draw()
+        background = self.canvas.copy_from_bbox(self.figure.bbox)
+        self.canvas.restore_region(background)
+        self.dashboard.draw_artists()
+    
+    def test_sample_reads_the_gate(self):
+        gate = Gate()
+        for minute in range(4):
+            person = Person(f"Person {minute}")
+            person.add_item(Item("Milk", f"RFID{minute:03d}", price=3.99))
+            gate.scan(person, timestamp=datetime(2020, 1, 6, 9, minute))
+        
+        class Cashier:
+            total_sales = 20.0
+        
+        # Sampling needs no Tk window; build just the parts it reads
+        window = StatisticsWindow.__new__(StatisticsWindow)
+        window.gate, window.cashier, window.dashboard = gate, Cashier(), self.dashboard
+        window.sample()
+        self.assertEqual(self.dashboard.traffic_bars[9].get_height(), 4)
+        self.assertEqual(self.dashboard.revenues[-1], 20.0)
@@ -0,0 +1,94 @@
+import unittest
+import pickle
+import random
+import numpy as np
+from timeseries import RollingTimeSeries
+
+class TestRollingTimeSeries(unittest.TestCase):
+    def setUp(self):
+        rng = random.Random(2)
+        self.times = [rng.uniform(0, 4 * 86400) for _ in range(3000)]
+        self.alerts = [rng.random() < 0.2 for _ in self.times]
+
+    def build(self, times, alerts):
+        series = RollingTimeSeries(('scans', 'alerts'))
+        for seconds, alert in zip(times, alerts):
+            series.record(seconds, 1, alert)
+        return series
+
+    def expected(self, start, end):
+        return {
+            'scans': sum(1 for t in self.times if start <= t < end),
+            'alerts': sum(1 for t, a in zip(self.times, self.alerts) if start <= t < end and a)
+        }
+
+    def test_last_minutes(self):
+        order = sorted(range(len(self.times)), key=self.times.__getitem__)
+        series = self.build([self.times[i] for i in order], [self.alerts[i] for i in order])
+        newest = max(self.times)
+        # Spans are rounded up to whole buckets of the finest level that holds them
+        self.assertEqual(series.last(300), self.expected(newest // 1 - 299, newest + 1))
+        self.assertEqual(series.last(2 * 3600), self.expected((newest // 60 - 119) * 60, newest + 1))
+        self.assertEqual(series.last(3 * 86400),
+                         self.expected((newest // 3600 - 71) * 3600, newest + 1))
+        self.assertEqual(series.last(60, now=newest + 3600), {'scans': 0, 'alerts': 0})
+
+    def test_out_of_order_records_land_in_their_buckets(self):
+        series = self.build(self.times, self.alerts)
+        hourly = np.bincount((np.array(self.times) // 3600 % 24).astype(int), minlength=24)
+        self.assertTrue((series.hour_of_day() == hourly).all())
+        self.assertEqual(series.between(3 * 86400, 3 * 86400 + 5400),
+                         self.expected(3 * 86400, 3 * 86400 + 5400))
+        self.assertEqual(series.between(0, 5 * 86400), self.expected(0, 5 * 86400))
+
+    def test_buckets_for_dashboards(self):
+        series = self.build(self.times, self.alerts)
+        current = int(max(self.times) // 3600)
+        buckets = series.buckets(3600, 3)
+        self.assertEqual(buckets['start'], (current - 2) * 3600)
+        self.assertEqual(list(buckets['scans']),
+                         [self.expected(hour * 3600, (hour + 1) * 3600)['scans']
+                          for hour in range(current - 2, current + 1)])
+        with self.assertRaises(ValueError):
+            series.buckets(60, 5000)
+
+    def test_memory_is_fixed(self):
+        series = RollingTimeSeries(levels=((1, 10), (10, 6)))
+        for second in range(1000):
+            series.record(second)
+        self.assertEqual(series.last(5), {'count': 5})
+        self.assertEqual(series.last(40), {'count': 40})
+        self.assertEqual(len(series.level(1).starts), 10)
+        self.assertEqual(series.totals, [1000])
+        with self.assertRaises(ValueError):
+            series.between(100, 200)
+        with self.assertRaises(ValueError):
+            series.last(1000)
+
+    def test_reads_do_not_move_time(self):
+        series = RollingTimeSeries(levels=((1, 10), (10, 6)))
+        for second in range(30):
+            series.record(second)
+        self.assertEqual(series.last(5, now=33), {'count': 1})
+        self.assertEqual(list(series.buckets(10, 2, now=39)['count']), [10, 0])
+        self.assertEqual(series.latest, 29)
+        self.assertEqual(series.last(5), {'count': 5})
+        
+        for second in range(30, 35):
+            series.record(second)
+        self.assertEqual(series.last(5), {'count': 5})
+        self.assertEqual(series.last(10), {'count': 10})
+    
+    def test_pickled_series_keeps_recording(self):
+        series = RollingTimeSeries(levels=((1, 10), (10, 6)))
+        for second in range(30):
+            series.record(second)
+        copy = pickle.loads(pickle.dumps(series))
+        for second in range(30, 45):
+            copy.record(second)
+        self.assertEqual(copy.last(5), {'count': 5})
+        self.assertEqual(copy.last(40), {'count': 35})
+        self.assertEqual(series.last(5, now=44), {'count': 0})
+
+if __name__ == '__main__':
+    unittest.main()
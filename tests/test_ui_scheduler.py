@@ -0,0 +1,99 @@
+import threading
+import time
+import unittest
+from ui_scheduler import FrameScheduler, diff_lines, run_in_background
+
+class FakeRoot:
+    """Stands in for a Tk root: records after() calls instead of running a loop."""
+    def __init__(self):
+        self.scheduled = []
+        self.cancelled = []
+    
+    def after(self, delay, callback, *args):
+        self.scheduled.append((delay, callback))
+        return len(self.scheduled)
+    
+    def after_cancel(self, after_id):
+        self.cancelled.append(after_id)
+
+class TestFrameScheduler(unittest.TestCase):
+    def setUp(self):
+        self.root = FakeRoot()
+        self.scheduler = FrameScheduler(self.root, fps=60)
+    
+    def test_tick_runs_posted_callbacks_in_order(self):
+        seen = []
+        for i in range(5):
+            self.scheduler.post(seen.append, i)
+        self.scheduler.tick()
+        
+        self.assertEqual(seen, [0, 1, 2, 3, 4])
+        self.assertEqual(self.scheduler.pending, 0)
+        self.assertEqual(self.scheduler.processed, 5)
+    
+    def test_frame_budget_defers_remaining_events(self):
+        scheduler = FrameScheduler(self.root, budget=0.005)
+        for _ in range(20):
+            scheduler.post(time.sleep, 0.002)
+        scheduler.tick()
+        
+        self.assertGreater(scheduler.pending, 0)
+        self.assertLess(scheduler.processed, 20)
+        while scheduler.pending:
+            scheduler.tick()
+        self.assertEqual(scheduler.processed, 20)
+    
+    def test_start_and_stop_schedule_frames(self):
+        self.scheduler.start()
+        self.scheduler.start()
+        self.assertEqual(len(self.root.scheduled), 1)
+        self.assertEqual(self.root.scheduled[0][0], 16)
+        
+        self.scheduler.tick()
+        self.assertEqual(len(self.root.scheduled), 2)
+        self.scheduler.stop()
+        self.assertEqual(self.root.cancelled, [2])
+        self.scheduler.tick()
+        self.assertEqual(len(self.root.scheduled), 2)
+    
+    def test_post_from_worker_threads(self):
+        def produce(offset):
+            for i in range(1000):
+                self.scheduler.post(seen.append, offset + i)
+        
+        seen = []
+        threads = [run_in_background(produce, n * 1000) for n in range(4)]
+        for thread in threads:
+            thread.join()
+        self.scheduler.budget = 1.0
+        self.scheduler.tick()
+        
+        self.assertEqual(sorted(seen), list(range(4000)))
+        self.assertTrue(all(not thread.is_alive() for thread in threads))
+        self.assertIsInstance(threads[0], threading.Thread)
+
+class TestRendering(unittest.TestCase):
+    def setUp(self):
+        self.scheduler = FrameScheduler(FakeRoot())
+        self.calls = []
+        self.scheduler.add_renderer('basket', lambda: self.calls.append('basket'))
+        self.scheduler.add_renderer('status', lambda: self.calls.append('status'))
+    
+    def test_invalidations_coalesce_into_one_render_per_frame(self):
+        for _ in range(1000):
+            self.scheduler.post(self.scheduler.invalidate, 'status', 'basket')
+        self.scheduler.budget = 1.0
+        self.scheduler.tick()
+        
+        self.assertEqual(self.calls, ['basket', 'status'])
+        self.scheduler.tick()
+        self.assertEqual(self.calls, ['basket', 'status'])
+        self.assertEqual(self.scheduler.renders, 2)
+    
+    def test_diff_lines(self):
+        self.assertEqual(diff_lines([], ["a"]), [('insert', 0, "a")])
+        self.assertEqual(diff_lines(["a", "b"], ["a", "b"]), [])
+        self.assertEqual(diff_lines(["a", "", "T1"], ["a", "b", "", "T2"]),
+                         [('replace', 1, "b"), ('replace', 2, ""), ('insert', 3, "T2")])
+        self.assertEqual(diff_lines(["a", "b", "c"], ["x"]),
+                         [('replace', 0, "x"), ('delete', 2, None), ('delete', 1, None)])
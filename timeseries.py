@@ -0,0 +1,350 @@
+import math
+import numpy as np
+
+# (seconds per bucket, buckets kept): an hour of seconds, a day of minutes
+# and five weeks of hours
+DEFAULT_LEVELS = ((1, 3600), (60, 1440), (3600, 840))
+
+
+class RollingWindow:
+    """
+    One resolution of a RollingTimeSeries: a ring of ``length`` buckets.
+
+    Rather than per-bucket counts, each slot holds the series' running
+    totals at the moment its bucket started. The count of any run of
+    consecutive buckets is then the difference of two slots, so sums over
+    the window cost O(1) however many buckets they span. Buckets nothing
+    happened in are filled in when time moves past them, which is O(1)
+    amortized per elapsed bucket. Moving on to the next bucket, by far the
+    most common step, writes the slot's few cells directly instead of
+    going through NumPy indexing.
+
+    Attributes:
+        resolution (float): Seconds per bucket
+        length (int): Buckets kept
+        starts (ndarray): Running totals at the start of each bucket, per channel
+        origin (int): Earliest bucket ever recorded (None until then)
+        current (int): Newest bucket (None until the first record)
+    """
+
+    __slots__ = ('resolution', 'length', 'starts', 'origin', 'current', '_cells')
+
+    def __init__(self, resolution, length, channels):
+        self.resolution = resolution
+        self.length = length
+        self.starts = np.zeros((length, channels), dtype=np.int64)
+        self.origin = None
+        self.current = None
+        self._cells = self.cells(self.starts)
+
+    @staticmethod
+    def cells(starts):
+        """Flat int64 view of ``starts`` for writing single cells."""
+        return memoryview(starts).cast('B').cast('q')
+
+    def __getstate__(self):
+        return (self.resolution, self.length, self.starts, self.origin, self.current)
+
+    def __setstate__(self, state):
+        self.resolution, self.length, self.starts, self.origin, self.current = state
+        self._cells = self.cells(self.starts)
+
+    @property
+    def oldest(self):
+        """Oldest bucket still held (None until the first record)."""
+        if self.current is None:
+            return None
+        return max(self.origin, self.current - self.length + 1)
+
+    def advance(self, bucket, totals):
+        """Start bucket ``bucket``, filling any skipped buckets with ``totals``."""
+        current = self.current
+        if current is None:
+            self.origin = self.current = bucket
+            self.starts[bucket % self.length] = totals
+            return
+        if bucket <= current:
+            return
+        length = self.length
+        if bucket == current + 1:
+            cells = self._cells
+            cell = (bucket % length) * len(totals)
+            for total in totals:
+                cells[cell] = total
+                cell += 1
+            self.current = bucket
+            return
+        # Fill the skipped slots and the new one with at most two slice
+        # writes; the ring only wraps once, and no index array is built
+        starts = self.starts
+        first = max(current + 1, bucket - length + 1)
+        start, stop = first % length, bucket % length + 1
+        if start < stop:
+            starts[start:stop] = totals
+        else:
+            starts[start:] = totals
+            starts[:stop] = totals
+        self.current = bucket
+
+    def add_late(self, bucket, counts):
+        """
+        Count a record that falls into a bucket before the newest one.
+
+        The running totals of every later bucket go up by ``counts``, so
+        this costs O(buckets since ``bucket``). A record older than the
+        window only raises the totals of the buckets still held.
+        """
+        if bucket < self.origin:
+            # Buckets between the record and the old origin now come into the window
+            first = max(bucket, self.current - self.length + 1)
+            if first < self.origin:
+                self.starts[np.arange(first, self.origin) % self.length] = 0
+            self.origin = bucket
+        first = max(bucket + 1, self.oldest)
+        if first <= self.current:
+            self.starts[np.arange(first, self.current + 1) % self.length] += counts
+
+    def holds(self, boundary):
+        """Whether the running totals at the start of bucket ``boundary`` are known."""
+        return boundary <= self.origin or boundary >= self.oldest
+
+    def cumulative(self, boundaries, totals):
+        """
+        Get the running totals at the start of each bucket in ``boundaries``.
+
+        Boundaries after the newest bucket get the current totals and those
+        at or before the first bucket ever recorded get zeros.
+
+        Raises:
+            ValueError: If a boundary has already rolled out of the window
+        """
+        boundaries = np.asarray(boundaries, dtype=np.int64)
+        result = np.zeros((len(boundaries), self.starts.shape[1]), dtype=np.int64)
+        if self.current is None:
+            return result
+        if (boundaries[boundaries > self.origin] < self.oldest).any():
+            raise ValueError("Range is older than the window keeps")
+        held = (boundaries > self.origin) & (boundaries <= self.current)
+        result[held] = self.starts[boundaries[held] % self.length]
+        result[boundaries > self.current] = totals
+        return result
+
+
+class RollingTimeSeries:
+    """
+    Fixed-memory event counts over time at several resolutions.
+
+    Every record adds to one or more named channels (for example scans and
+    alerts) at a time in seconds. Each resolution keeps a rolling window
+    of buckets; finer levels cover a short recent span and coarser levels
+    a long one, so older data is only kept downsampled. Each resolution
+    must be a multiple of the next finer one. Recording is O(1):
+    it only touches a level when a new bucket starts there.
+
+    Queries such as "alerts in the last 5 minutes" are answered in O(1)
+    from the finest level that still covers the span, and range queries
+    return the per-bucket counts of a level for dashboards. Time is the
+    time of the newest record unless a query says otherwise, so virtual
+    simulation time works like the wall clock. A record older than the
+    newest one still lands in its own bucket, at a cost that grows with
+    how late it is.
+
+    Attributes:
+        channels (tuple): Channel names
+        levels (list): RollingWindow per resolution, finest first
+        totals (list): Counts per channel over the series' lifetime
+        latest (float): Time of the newest record in seconds (None until then)
+    """
+
+    def __init__(self, channels=('count',), levels=DEFAULT_LEVELS):
+        self.channels = tuple(channels)
+        self.levels = [RollingWindow(resolution, length, len(self.channels))
+                       for resolution, length in sorted(levels)]
+        self.totals = [0] * len(self.channels)
+        self.latest = None
+        # Time the second level's next bucket starts; until then only the
+        # finest level can move
+        self._coarse_boundary = -math.inf
+
+    def advance(self, seconds):
+        """Move time forward to ``seconds`` without recording anything."""
+        if self.latest is not None and seconds <= self.latest:
+            return
+        self.latest = seconds
+        levels = self.levels
+        finest = levels[0]
+        bucket = int(seconds // finest.resolution)
+        if bucket == finest.current:
+            # Resolutions nest, so no coarser bucket can have changed either
+            return
+        totals = self.totals
+        finest.advance(bucket, totals)
+        if seconds < self._coarse_boundary:
+            return
+        for level in levels[1:]:
+            bucket = int(seconds // level.resolution)
+            if bucket == level.current:
+                break
+            level.advance(bucket, totals)
+        if len(levels) > 1:
+            self._coarse_boundary = (levels[1].current + 1) * levels[1].resolution
+        else:
+            self._coarse_boundary = math.inf
+
+    def record(self, seconds, *counts):
+        """
+        Record counts at a time.
+
+        Args:
+            seconds (float): Time of the event in seconds
+            *counts (int): Count per channel, in channel order (default 1 for the first)
+        """
+        if not counts:
+            counts = (1,)
+        if self.latest is not None and seconds < self.latest:
+            late = np.zeros(len(self.channels), dtype=np.int64)
+            late[:len(counts)] = counts
+            for level in self.levels:
+                bucket = int(seconds // level.resolution)
+                if bucket < level.current:
+                    level.add_late(bucket, late)
+        else:
+            self.advance(seconds)
+        totals = self.totals
+        for channel, count in enumerate(counts):
+            if count:
+                totals[channel] += count
+
+    def level(self, resolution):
+        """Get the window with the given resolution in seconds."""
+        for level in self.levels:
+            if level.resolution == resolution:
+                return level
+        raise ValueError(f"No level with a resolution of {resolution} seconds")
+
+    def as_dict(self, counts):
+        """Map per-channel counts to channel names."""
+        return {name: int(count) for name, count in zip(self.channels, counts)}
+
+    def span(self, seconds):
+        """
+        Get the finest level that holds a span and the buckets it covers there.
+
+        Returns:
+            tuple: (RollingWindow, number of buckets)
+
+        Raises:
+            ValueError: If the span is longer than the coarsest window
+        """
+        for level in self.levels:
+            buckets = max(1, math.ceil(seconds / level.resolution))
+            if buckets <= level.length:
+                return level, buckets
+        raise ValueError("Span is longer than the coarsest window")
+
+    def newest_bucket(self, level, now):
+        """
+        Get the bucket a read ending at ``now`` ends with on ``level``.
+
+        Reads never move time forward: buckets after the newest record are
+        empty, so a read ending there counts them as such and leaves the
+        series as it was.
+        """
+        if now is None or level.current is None:
+            return level.current
+        return max(level.current, int(now // level.resolution))
+
+    def last(self, seconds, now=None):
+        """
+        Get the counts of the last ``seconds`` seconds, in O(1).
+
+        The span is rounded up to whole buckets of the finest level that
+        holds it and includes the bucket of ``now``. Reading does not
+        advance the series.
+
+        Args:
+            seconds (float): Length of the span
+            now (float): End of the span (defaults to the newest record)
+
+        Returns:
+            dict: Count per channel
+        """
+        if self.latest is None:
+            return self.as_dict(self.totals)
+        level, buckets = self.span(seconds)
+        first = self.newest_bucket(level, now) - buckets + 1
+        start, = level.cumulative([first], self.totals)
+        return self.as_dict(np.array(self.totals) - start)
+
+    def between(self, start, end):
+        """
+        Get the counts of records in ``[start, end)``.
+
+        Both ends are rounded down to bucket boundaries of the finest level
+        that still holds them.
+
+        Returns:
+            dict: Count per channel
+        """
+        for level in self.levels:
+            boundaries = [int(start // level.resolution), int(end // level.resolution)]
+            if level.current is None or all(level.holds(boundary) for boundary in boundaries):
+                break
+        else:
+            raise ValueError("Range is older than the window keeps")
+        cumulative = level.cumulative(boundaries, self.totals)
+        return self.as_dict(np.maximum(cumulative[1] - cumulative[0], 0))
+
+    def buckets(self, resolution, count, now=None):
+        """
+        Get the per-bucket counts of the last ``count`` buckets of a level.
+
+        Args:
+            resolution (float): Seconds per bucket of the level to read
+            count (int): Buckets to return, ending with the bucket of ``now``
+            now (float): Newest bucket's time (defaults to the newest
+                record); reading does not advance the series
+
+        Returns:
+            dict: 'start', the time of the first bucket in seconds, plus an
+            array of ``count`` counts per channel, oldest first
+        """
+        level = self.level(resolution)
+        if count > level.length:
+            raise ValueError("Asked for more buckets than the level keeps")
+        if level.current is None:
+            counts = np.zeros((count, len(self.channels)), dtype=np.int64)
+            first = 0 if now is None else int(now // resolution) - count + 1
+        else:
+            newest = self.newest_bucket(level, now)
+            first = newest - count + 1
+            boundaries = np.arange(first, newest + 2)
+            counts = np.diff(level.cumulative(boundaries, self.totals), axis=0)
+        result = {'start': first * resolution}
+        for channel, name in enumerate(self.channels):
+            result[name] = counts[:, channel]
+        return result
+
+    def hour_of_day(self, channel=None):
+        """
+        Get the counts per hour of day over the hourly window.
+
+        Times are taken as local seconds since midnight of some day, so
+        bucket ``n`` of the hourly level is hour ``n % 24``. The window's
+        bounds are read once, so the bucket range and the hours always
+        agree; callers sharing the series with a writer thread must still
+        hold the writer's lock.
+
+        Returns:
+            ndarray: 24 counts of the channel (the first by default)
+        """
+        level = self.level(3600)
+        hourly = np.zeros(24, dtype=np.int64)
+        current, oldest = level.current, level.oldest
+        if current is None:
+            return hourly
+        index = self.channels.index(channel or self.channels[0])
+        buckets = np.arange(oldest, current + 2)
+        counts = np.diff(level.cumulative(buckets, self.totals)[:, index])
+        np.add.at(hourly, buckets[:-1] % 24, counts)
+        return hourly
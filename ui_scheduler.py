@@ -0,0 +1,131 @@
+import queue
+import threading
+import time
+
+
+class FrameScheduler:
+    """
+    Runs UI updates posted from any thread on the Tk main loop.
+
+    Worker threads never touch widgets; they post callbacks to a
+    thread-safe queue instead. The Tk loop drains the queue once per frame
+    through ``root.after``, spending at most ``budget`` seconds per frame,
+    so the window keeps its frame rate however fast events arrive. Events
+    that do not fit into a frame wait for the next one.
+
+    Widgets are redrawn by named renderers. Model changes only mark a
+    renderer dirty with invalidate(); at the end of a frame every dirty
+    renderer runs once, so any number of changes in a frame cost one
+    redraw.
+
+    Attributes:
+        root: Tk widget whose ``after`` drives the frames
+        frame_ms (int): Milliseconds between frames
+        budget (float): Seconds per frame spent running posted callbacks
+        frames (int): Frames run so far
+        processed (int): Callbacks run so far
+        renders (int): Renderer runs so far
+    """
+
+    def __init__(self, root, fps=60, budget=0.008):
+        self.root = root
+        self.frame_ms = max(1, int(1000 / fps))
+        self.budget = budget
+        self.frames = 0
+        self.processed = 0
+        self.renders = 0
+        self.renderers = {}
+        self.dirty = set()
+        self.events = queue.SimpleQueue()
+        self.running = False
+        self._after_id = None
+
+    @property
+    def pending(self):
+        """Number of posted callbacks not run yet."""
+        return self.events.qsize()
+
+    def post(self, callback, *args):
+        """Queue ``callback(*args)`` to run on the UI thread (safe from any thread)."""
+        self.events.put((callback, args))
+
+    def add_renderer(self, name, render):
+        """Register ``render()`` to redraw part of the UI when ``name`` is invalidated."""
+        self.renderers[name] = render
+
+    def invalidate(self, *names):
+        """Mark renderers dirty so they run at the end of the frame (UI thread only)."""
+        self.dirty.update(names)
+
+    def render(self):
+        """Run the dirty renderers, in registration order."""
+        if not self.dirty:
+            return
+        dirty = self.dirty
+        self.dirty = set()
+        for name, render in self.renderers.items():
+            if name in dirty:
+                render()
+                self.renders += 1
+
+    def start(self):
+        """Start running frames."""
+        if not self.running:
+            self.running = True
+            self._after_id = self.root.after(self.frame_ms, self.tick)
+
+    def stop(self):
+        """Stop running frames; posted callbacks stay queued."""
+        self.running = False
+        if self._after_id is not None:
+            self.root.after_cancel(self._after_id)
+            self._after_id = None
+
+    def tick(self):
+        """Run one frame: drain posted callbacks until the budget is spent, then render."""
+        deadline = time.perf_counter() + self.budget
+        events = self.events
+        while True:
+            try:
+                callback, args = events.get_nowait()
+            except queue.Empty:
+                break
+            callback(*args)
+            self.processed += 1
+            if time.perf_counter() >= deadline:
+                break
+
+        self.render()
+        self.frames += 1
+        if self.running:
+            self._after_id = self.root.after(self.frame_ms, self.tick)
+
+
+def diff_lines(old, new):
+    """
+    Get the edits that turn the lines ``old`` into ``new``.
+
+    Lines are compared position by position, so appending a line or
+    changing one costs a single edit however long the text is.
+
+    Returns:
+        list: ('replace', index, line), ('insert', index, line) and
+        ('delete', index, None) edits, in the order they must be applied
+    """
+    edits = []
+    common = min(len(old), len(new))
+    for index in range(common):
+        if old[index] != new[index]:
+            edits.append(('replace', index, new[index]))
+    for index in range(common, len(new)):
+        edits.append(('insert', index, new[index]))
+    for index in range(len(old) - 1, common - 1, -1):
+        edits.append(('delete', index, None))
+    return edits
+
+
+def run_in_background(target, *args, name=None):
+    """Run ``target(*args)`` on a daemon worker thread and return the thread."""
+    thread = threading.Thread(target=target, args=args, name=name, daemon=True)
+    thread.start()
+    return thread